@@ -0,0 +1,4 @@
+"""
+API Module
+Paquete de la API REST (las rutas viven en api.routes)
+"""
@@ -4,48 +4,68 @@ Login y gestión de tokens JWT
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime, timedelta
-from jose import jwt
-from passlib.context import CryptContext
-import sys
-import os
+import jwt
+from cachetools import TTLCache
+import hashlib
+import hmac
+import time
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import settings
 
 router = APIRouter()
 
 # Configuración de seguridad
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Cache de payloads JWT ya verificados (clave: sha256 truncado del token)
+# TTL corto para que la expiración/revocación siga acotada
+_jwt_cache = TTLCache(maxsize=10_000, ttl=30)
+
+# Firmador JWT y clave HMAC construidos una sola vez al importar
+_SIGNER = jwt.PyJWT()
+_KEY = settings.SECRET_KEY.encode()
+
+# Credenciales del admin (MOCK) codificadas una sola vez para comparar en tiempo constante
+_ADMIN_USERNAME = settings.ADMIN_USERNAME.encode()
+_ADMIN_PASSWORD = settings.ADMIN_PASSWORD.encode()
+
 # Modelos
 class Token(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     access_token: str
     token_type: str
 
 class UserInfo(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     username: str
     email: str
 
 # Funciones auxiliares
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verificar password"""
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str) -> str:
-    """Hashear password"""
-    return pwd_context.hash(password)
-
 def create_access_token(data: dict) -> str:
     """Crear token JWT"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = _SIGNER.encode(to_encode, _KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def decode_access_token(token: str) -> dict:
+    """Decodificar token JWT reutilizando la verificación cacheada"""
+    key = hashlib.sha256(token.encode()).digest()[:16]
+    payload = _jwt_cache.get(key)
+    
+    # Un hit nunca debe sobrevivir a la expiración del propio token
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    
+    payload = _SIGNER.decode(token, _KEY, algorithms=[settings.ALGORITHM])
+    _jwt_cache[key] = payload
+    return payload
+
 # Endpoints
 @router.post("/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
@@ -54,7 +74,9 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     Devuelve un token JWT para autenticación
     """
     # Verificar credenciales (MOCK - luego conectar con BD)
-    if form_data.username != settings.ADMIN_USERNAME or form_data.password != settings.ADMIN_PASSWORD:
+    usuario_ok = hmac.compare_digest(form_data.username.encode(), _ADMIN_USERNAME)
+    password_ok = hmac.compare_digest(form_data.password.encode(), _ADMIN_PASSWORD)
+    if not (usuario_ok and password_ok):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario o contraseña incorrectos",
@@ -77,22 +99,23 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     Obtener información del usuario actual
     Requiere token JWT válido
     """
+    # Solo un token inválido o expirado es un 401: cualquier otro error lo responde el manejador global
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        email: str = payload.get("email")
-        
-        if username is None:
-            raise HTTPException(status_code=401, detail="Token inválido")
-        
-        return UserInfo(username=username, email=email)
-    
-    except Exception as e:
+        payload = decode_access_token(token)
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="No se pudo validar el token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    username: str = payload.get("sub")
+    email: str = payload.get("email")
+    
+    if username is None:
+        raise HTTPException(status_code=401, detail="Token inválido")
+    
+    return UserInfo(username=username, email=email)
 
 @router.get("/test")
 async def test_auth():
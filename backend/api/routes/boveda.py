@@ -2,19 +2,111 @@
 Rutas de Bóveda - Gestión de capital y criptomonedas
 """
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import List, Optional
 from datetime import datetime
-import sys
-import os
+import sqlite3
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.db_manager import db
+from core.cache import cache
 
 router = APIRouter()
 
+# Sentencias SQL a nivel de módulo: el mismo texto en cada llamada permite
+# reutilizar la sentencia preparada del cache de la conexión
+
+_SQL_INVENTARIO = """
+    SELECT c.id, c.simbolo, c.nombre, b.cantidad,
+           (b.cantidad * b.precio_promedio) as valor_usd,
+           COALESCE(ROUND(100.0 * (b.cantidad * b.precio_promedio)
+                 / NULLIF(SUM(b.cantidad * b.precio_promedio) OVER (), 0), 2), 0) as porcentaje_cartera
+    FROM boveda_ciclo b
+    JOIN criptomonedas c ON b.cripto_id = c.id
+    JOIN ciclos cy ON b.ciclo_id = cy.id
+    WHERE cy.estado = 'activo'
+    ORDER BY valor_usd DESC
+"""
+
+_SQL_RESUMEN = """
+    SELECT COUNT(*) as num_criptos,
+           SUM(b.cantidad * b.precio_promedio) as capital_total
+    FROM boveda_ciclo b
+    JOIN ciclos cy ON b.ciclo_id = cy.id
+    WHERE cy.estado = 'activo'
+"""
+
+_SQL_CREAR_CICLO = """
+    INSERT INTO ciclos (fecha_inicio, inversion_inicial, estado, dias_planificados, fecha_fin_estimada)
+    VALUES (datetime('now'), 0, 'activo', 30, date('now', '+30 days'))
+"""
+
+# Detalle de una cripto: el total de la cartera se calcula en el CTE de la misma sentencia
+_SQL_INFO_CRIPTO = """
+    WITH totales AS (
+        SELECT SUM(b.cantidad * b.precio_promedio) AS capital
+        FROM boveda_ciclo b
+        JOIN ciclos cy ON b.ciclo_id = cy.id
+        WHERE cy.estado = 'activo'
+    )
+    SELECT c.id, c.simbolo, c.nombre, b.cantidad, b.precio_promedio,
+           (b.cantidad * b.precio_promedio) AS valor_usd,
+           COALESCE(ROUND(100.0 * (b.cantidad * b.precio_promedio)
+                 / NULLIF(totales.capital, 0), 2), 0) AS porcentaje_cartera
+    FROM boveda_ciclo b
+    JOIN criptomonedas c ON b.cripto_id = c.id
+    JOIN ciclos cy ON b.ciclo_id = cy.id, totales
+    WHERE cy.estado = 'activo' AND c.simbolo = ?
+"""
+
+# Cripto y ciclo activo en un solo viaje (sin fila = cripto inexistente)
+_SQL_CRIPTO_Y_CICLO_ACTIVO = """
+    SELECT c.id AS cripto_id,
+           (SELECT id FROM ciclos WHERE estado = 'activo' LIMIT 1) AS ciclo_id
+    FROM criptomonedas c
+    WHERE c.simbolo = ?
+"""
+
+_SQL_UPSERT_BOVEDA = """
+    INSERT INTO boveda_ciclo (ciclo_id, cripto_id, cantidad, precio_promedio)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(ciclo_id, cripto_id) DO UPDATE SET
+        precio_promedio = ((cantidad * precio_promedio) + (excluded.cantidad * excluded.precio_promedio))
+                          / (cantidad + excluded.cantidad),
+        cantidad = cantidad + excluded.cantidad
+    RETURNING cantidad
+"""
+
+_SQL_ACTUALIZAR_INVERSION = """
+    UPDATE ciclos SET inversion_inicial = (
+        SELECT COALESCE(SUM(cantidad * precio_promedio), 0)
+        FROM boveda_ciclo WHERE ciclo_id = ?
+    )
+    WHERE id = ?
+"""
+
+# Ciclo activo y posición en un solo viaje (sin fila = sin ciclo, b.id NULL = sin posición)
+_SQL_POSICION_EN_CICLO_ACTIVO = """
+    SELECT cy.id AS ciclo_id, b.id, b.cantidad, b.precio_promedio
+    FROM ciclos cy
+    LEFT JOIN criptomonedas c ON c.simbolo = ?
+    LEFT JOIN boveda_ciclo b ON b.ciclo_id = cy.id AND b.cripto_id = c.id
+    WHERE cy.estado = 'activo'
+    LIMIT 1
+"""
+
+_SQL_ELIMINAR_POSICION = "DELETE FROM boveda_ciclo WHERE id = ?"
+
+_SQL_ACTUALIZAR_CANTIDAD = "UPDATE boveda_ciclo SET cantidad = ? WHERE id = ?"
+
+# Los endpoints son síncronos a propósito: FastAPI los ejecuta en su threadpool,
+# así las consultas a SQLite no bloquean el event loop.
+# Solo los errores de BD se traducen a 500 aquí; las HTTPException pasan tal cual
+# y cualquier otro error lo atiende el manejador global de main.py
+
 # --- CAMBIO REALIZADO AQUÍ ---
 class Criptomoneda(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: int
     simbolo: str
     nombre: str
@@ -22,75 +114,76 @@ class Criptomoneda(BaseModel):
     valor_usd: float
     porcentaje_cartera: float
 
+_INVENTARIO_ADAPTER = TypeAdapter(List[Criptomoneda])
+
+class InfoCripto(Criptomoneda):
+    precio_promedio: float
+
 class ResumenBoveda(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     capital_total_usd: float
     numero_criptos: int
     ultima_actualizacion: datetime
 
 class AgregarCapitalRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     simbolo: str
     monto_usd: float = Field(..., gt=0, description="Monto en USD invertido")
     precio_unitario: float = Field(..., gt=0, description="Precio por unidad de cripto")
 
 class RetirarCapitalRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     simbolo: str
     cantidad: float = Field(..., gt=0)
     razon: Optional[str] = None
 
 @router.get("/inventario", response_model=List[Criptomoneda])
-async def get_inventario():
+@cache.cacheado("boveda")
+def get_inventario():
     try:
         with db.get_cursor(commit=False) as cursor:
             # --- CAMBIO REALIZADO AQUÍ (EN EL SELECT) ---
-            cursor.execute("""
-                SELECT c.id, c.simbolo, c.nombre, b.cantidad, b.precio_promedio,
-                       (b.cantidad * b.precio_promedio) as valor_total
-                FROM boveda_ciclo b
-                JOIN criptomonedas c ON b.cripto_id = c.id
-                JOIN ciclos cy ON b.ciclo_id = cy.id
-                WHERE cy.estado = 'activo'
-                ORDER BY valor_total DESC
-            """)
-            rows = cursor.fetchall()
-            if not rows:
-                return []
-            
-            capital_total = sum(row['valor_total'] for row in rows)
+            cursor.execute(_SQL_INVENTARIO)
             
-            # --- CAMBIO REALIZADO AQUÍ (EN EL RETURN) ---
-            return [Criptomoneda(
-                id=row['id'], 
-                simbolo=row['simbolo'], 
-                nombre=row['nombre'],
-                cantidad=row['cantidad'], 
-                valor_usd=row['valor_total'],
-                porcentaje_cartera=round((row['valor_total'] / capital_total * 100), 2) if capital_total > 0 else 0
-            ) for row in rows]
-    except Exception as e:
+            # Las columnas ya tienen los nombres del modelo y el porcentaje de cartera
+            # viene calculado por SQLite (SUM ... OVER): se valida toda la lista de una vez
+            return _INVENTARIO_ADAPTER.validate_python([dict(row) for row in cursor.fetchall()])
+    except sqlite3.DatabaseError as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 @router.get("/resumen", response_model=ResumenBoveda)
-async def get_resumen_boveda():
+@cache.cacheado("boveda")
+def get_resumen_boveda():
     try:
         with db.get_cursor(commit=False) as cursor:
-            cursor.execute("""
-                SELECT COUNT(*) as num_criptos,
-                       SUM(b.cantidad * b.precio_promedio) as capital_total
-                FROM boveda_ciclo b
-                JOIN ciclos cy ON b.ciclo_id = cy.id
-                WHERE cy.estado = 'activo'
-            """)
+            cursor.execute(_SQL_RESUMEN)
             row = cursor.fetchone()
             return ResumenBoveda(
                 capital_total_usd=row['capital_total'] or 0.0,
                 numero_criptos=row['num_criptos'] or 0,
                 ultima_actualizacion=datetime.now()
             )
-    except Exception as e:
+    except sqlite3.DatabaseError as e:
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+@router.get("/cripto/{simbolo}", response_model=InfoCripto)
+@cache.cacheado("boveda")
+def get_info_cripto(simbolo: str):
+    try:
+        with db.get_cursor(commit=False) as cursor:
+            cursor.execute(_SQL_INFO_CRIPTO, (simbolo.upper(),))
+            row = cursor.fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail=f"Cripto {simbolo} no encontrada en bóveda")
+            return InfoCripto(**row)
+    except sqlite3.DatabaseError as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 @router.post("/agregar-capital")
-async def agregar_capital(datos: AgregarCapitalRequest):
+def agregar_capital(datos: AgregarCapitalRequest):
     """
     Agrega capital a la bóveda.
     
@@ -101,80 +194,35 @@ async def agregar_capital(datos: AgregarCapitalRequest):
     """
     try:
         with db.get_cursor(commit=True) as cursor:
-            # Buscar ciclo activo (o crear uno)
-            cursor.execute("SELECT id FROM ciclos WHERE estado = 'activo' LIMIT 1")
-            ciclo = cursor.fetchone()
-            
-            if not ciclo:
-                # Crear ciclo automáticamente
-                cursor.execute("""
-                    INSERT INTO ciclos (fecha_inicio, inversion_inicial, estado, dias_planificados, fecha_fin_estimada)
-                    VALUES (datetime('now'), 0, 'activo', 30, date('now', '+30 days'))
-                """)
-                ciclo_id = cursor.lastrowid
-            else:
-                ciclo_id = ciclo['id']
-
-            # Verificar cripto
-            cursor.execute("SELECT id, nombre FROM criptomonedas WHERE simbolo = ?", (datos.simbolo.upper(),))
+            # Verificar cripto y buscar ciclo activo en la misma consulta
+            cursor.execute(_SQL_CRIPTO_Y_CICLO_ACTIVO, (datos.simbolo.upper(),))
             cripto = cursor.fetchone()
             if not cripto:
                 raise HTTPException(status_code=404, detail=f"Criptomoneda {datos.simbolo} no encontrada")
 
+            ciclo_id = cripto['ciclo_id']
+            if ciclo_id is None:
+                # Crear ciclo automáticamente
+                cursor.execute(_SQL_CREAR_CICLO)
+                ciclo_id = cursor.lastrowid
+
             # CALCULAR CANTIDAD (fórmula correcta)
             cantidad_cripto = datos.monto_usd / datos.precio_unitario
 
-            # Verificar si ya existe en bóveda
-            cursor.execute("""
-                SELECT id, cantidad, precio_promedio FROM boveda_ciclo
-                WHERE ciclo_id = ? AND cripto_id = ?
-            """, (ciclo_id, cripto['id']))
-            boveda = cursor.fetchone()
+            # Insertar o acumular con promedio ponderado en una sola sentencia
+            # (boveda_ciclo tiene UNIQUE(ciclo_id, cripto_id))
+            cursor.execute(_SQL_UPSERT_BOVEDA, (ciclo_id, cripto['cripto_id'], cantidad_cripto, datos.precio_unitario))
+            cantidad_total = cursor.fetchone()['cantidad']
 
-            if boveda:
-                # Ya existe: calcular promedio ponderado
-                cantidad_anterior = boveda['cantidad']
-                precio_anterior = boveda['precio_promedio']
-                
-                # Valor anterior
-                valor_anterior = cantidad_anterior * precio_anterior
-                
-                # Valor nuevo
-                valor_nuevo = cantidad_cripto * datos.precio_unitario
-                
-                # Cantidad total
-                cantidad_total = cantidad_anterior + cantidad_cripto
-                
-                # Precio promedio ponderado
-                precio_promedio = (valor_anterior + valor_nuevo) / cantidad_total
-                
-                cursor.execute("""
-                    UPDATE boveda_ciclo SET cantidad = ?, precio_promedio = ?
-                    WHERE id = ?
-                """, (cantidad_total, precio_promedio, boveda['id']))
-                
+            if cantidad_total - cantidad_cripto > 1e-8:
                 mensaje = f"Actualizado: ahora tienes {cantidad_total:.8f} {datos.simbolo}"
             else:
-                # No existe: insertar nuevo
-                cursor.execute("""
-                    INSERT INTO boveda_ciclo (ciclo_id, cripto_id, cantidad, precio_promedio)
-                    VALUES (?, ?, ?, ?)
-                """, (ciclo_id, cripto['id'], cantidad_cripto, datos.precio_unitario))
-                
                 mensaje = f"Agregado: {cantidad_cripto:.8f} {datos.simbolo}"
 
             # Actualizar inversión del ciclo
-            cursor.execute("""
-                SELECT SUM(cantidad * precio_promedio) as total
-                FROM boveda_ciclo WHERE ciclo_id = ?
-            """, (ciclo_id,))
-            total = cursor.fetchone()['total'] or 0
-            
-            cursor.execute("""
-                UPDATE ciclos SET inversion_inicial = ? WHERE id = ?
-            """, (total, ciclo_id))
+            cursor.execute(_SQL_ACTUALIZAR_INVERSION, (ciclo_id, ciclo_id))
 
-            return {
+            resultado = {
                 "success": True,
                 "message": mensaje,
                 "simbolo": datos.simbolo,
@@ -183,29 +231,23 @@ async def agregar_capital(datos: AgregarCapitalRequest):
                 "cantidad_obtenida": round(cantidad_cripto, 8),
                 "valor_total_usd": round(cantidad_cripto * datos.precio_unitario, 2)
             }
-    except HTTPException:
-        raise
-    except Exception as e:
+
+        # Invalidar después del commit (el capital también se ve en ciclos y dashboard)
+        cache.invalidar()
+        return resultado
+    except sqlite3.DatabaseError as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 @router.post("/retirar-capital")
-async def retirar_capital(datos: RetirarCapitalRequest):
+def retirar_capital(datos: RetirarCapitalRequest):
     try:
         with db.get_cursor(commit=True) as cursor:
-            cursor.execute("SELECT id FROM ciclos WHERE estado = 'activo' LIMIT 1")
-            ciclo = cursor.fetchone()
-            if not ciclo:
-                raise HTTPException(status_code=400, detail="No hay ciclo activo")
-
-            cursor.execute("""
-                SELECT b.id, b.cantidad, b.precio_promedio
-                FROM boveda_ciclo b
-                JOIN criptomonedas c ON b.cripto_id = c.id
-                WHERE b.ciclo_id = ? AND c.simbolo = ?
-            """, (ciclo['id'], datos.simbolo.upper()))
+            cursor.execute(_SQL_POSICION_EN_CICLO_ACTIVO, (datos.simbolo.upper(),))
             boveda = cursor.fetchone()
-
             if not boveda:
+                raise HTTPException(status_code=400, detail="No hay ciclo activo")
+
+            if boveda['id'] is None:
                 raise HTTPException(status_code=404, detail="Cripto no encontrada en bóveda")
             if boveda['cantidad'] < datos.cantidad:
                 raise HTTPException(status_code=400, detail=f"Insuficiente. Disponible: {boveda['cantidad']:.8f}")
@@ -213,14 +255,14 @@ async def retirar_capital(datos: RetirarCapitalRequest):
             cantidad_nueva = boveda['cantidad'] - datos.cantidad
 
             if cantidad_nueva <= 1e-8: # Usar una pequeña tolerancia para evitar problemas con floats
-                cursor.execute("DELETE FROM boveda_ciclo WHERE id = ?", (boveda['id'],))
+                cursor.execute(_SQL_ELIMINAR_POSICION, (boveda['id'],))
                 mensaje = f"Retirado todo el {datos.simbolo}"
             else:
-                cursor.execute("UPDATE boveda_ciclo SET cantidad = ? WHERE id = ?",
+                cursor.execute(_SQL_ACTUALIZAR_CANTIDAD,
                                (cantidad_nueva, boveda['id']))
                 mensaje = f"Retirado: {datos.cantidad:.8f}. Quedan: {cantidad_nueva:.8f}"
 
-            return {
+            resultado = {
                 "success": True,
                 "message": mensaje,
                 "simbolo": datos.simbolo,
@@ -228,7 +270,8 @@ async def retirar_capital(datos: RetirarCapitalRequest):
                 "valor_retirado": round(datos.cantidad * boveda['precio_promedio'], 2),
                 "cantidad_restante": max(0, cantidad_nueva)
             }
-    except HTTPException:
-        raise
-    except Exception as e:
+
+        cache.invalidar()
+        return resultado
+    except sqlite3.DatabaseError as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
\ No newline at end of file
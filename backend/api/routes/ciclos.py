@@ -6,14 +6,126 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime, date
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.db_manager import db
+from core.cache import cache
 
 router = APIRouter()
 
+# Sentencias SQL a nivel de módulo: el mismo texto en cada llamada permite
+# reutilizar la sentencia preparada del cache de la conexión.
+# ciclos.ventas_totales lo mantienen los triggers de ventas (ver MIGRACIONES en core.db_manager)
+
+# Número ordinal de cada ciclo calculado una vez por consulta con una función ventana
+_CTE_NUMERADOS = """
+    WITH numerados AS (
+        SELECT id, ROW_NUMBER() OVER (ORDER BY id) as numero FROM ciclos
+    )
+"""
+
+_SQL_CICLO_ACTIVO = _CTE_NUMERADOS + """
+    SELECT c.id, c.fecha_inicio as "fecha_inicio [fecha]", c.inversion_inicial, c.dias_operados,
+           c.ganancia_total, c.roi_total, c.estado,
+           c.ventas_totales, n.numero
+    FROM ciclos c
+    JOIN numerados n ON n.id = c.id
+    WHERE c.estado = 'activo'
+    LIMIT 1
+"""
+
+_SQL_HISTORIAL = _CTE_NUMERADOS + """
+    SELECT c.id, c.fecha_inicio as "fecha_inicio [fecha]", c.fecha_cierre as "fecha_cierre [fecha]", c.dias_operados,
+           c.inversion_inicial, c.capital_final, c.ganancia_total, c.roi_total, c.estado,
+           c.ventas_totales, n.numero
+    FROM ciclos c
+    JOIN numerados n ON n.id = c.id
+    WHERE c.estado = 'cerrado'
+    ORDER BY c.fecha_inicio DESC
+    LIMIT ?
+"""
+
+_SQL_CICLO_POR_ID = _CTE_NUMERADOS + """
+    SELECT c.id, c.fecha_inicio as "fecha_inicio [fecha]", c.fecha_cierre as "fecha_cierre [fecha]", c.dias_operados,
+           c.inversion_inicial, c.capital_final, c.ganancia_total, c.roi_total, c.estado,
+           c.ventas_totales, n.numero
+    FROM ciclos c
+    JOIN numerados n ON n.id = c.id
+    WHERE c.id = ?
+"""
+
+_SQL_ESTADISTICAS = """
+    WITH cerrados AS (
+        SELECT fecha, ganancia_neta FROM dias
+        WHERE ciclo_id = :ciclo_id AND estado = 'cerrado'
+    ),
+    mejor AS (
+        SELECT fecha, ganancia_neta FROM cerrados
+        WHERE ganancia_neta IS NOT NULL
+        ORDER BY ganancia_neta DESC LIMIT 1
+    ),
+    peor AS (
+        SELECT fecha, ganancia_neta FROM cerrados
+        WHERE ganancia_neta IS NOT NULL
+        ORDER BY ganancia_neta ASC LIMIT 1
+    )
+    SELECT
+        c.ventas_totales as total_ventas,
+        (SELECT COUNT(*) FROM cerrados) as dias_operados,
+        (SELECT AVG(ganancia_neta) FROM cerrados) as promedio,
+        mejor.fecha as "mejor_fecha [fecha]", mejor.ganancia_neta as mejor_ganancia,
+        peor.fecha as "peor_fecha [fecha]", peor.ganancia_neta as peor_ganancia
+    FROM ciclos c
+    LEFT JOIN mejor ON 1
+    LEFT JOIN peor ON 1
+    WHERE c.id = :ciclo_id
+"""
+
+# Única consulta del ciclo activo para las escrituras: cada endpoint la ejecuta una vez
+# dentro de su transacción y toma de la fila lo que necesita
+_SQL_CICLO_ACTIVO_DATOS = """
+    SELECT id, inversion_inicial, ganancia_total FROM ciclos
+    WHERE estado = 'activo' LIMIT 1
+"""
+
+# Dos búsquedas por índice: último ciclo cerrado (idx_ciclos_estado) y su bóveda (idx_boveda_ciclo)
+_SQL_CAPITAL_BOVEDA_ANTERIOR = """
+    SELECT COALESCE(SUM(cantidad * precio_promedio), 0) as capital_boveda
+    FROM boveda_ciclo
+    WHERE ciclo_id = (
+        SELECT id FROM ciclos WHERE estado = 'cerrado' ORDER BY id DESC LIMIT 1
+    )
+"""
+
+_SQL_CREAR_CICLO = """
+    INSERT INTO ciclos (fecha_inicio, inversion_inicial, estado, dias_planificados, fecha_fin_estimada)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_NUMERO_CICLO = "SELECT COUNT(*) FROM ciclos WHERE id <= ?"
+
+_SQL_CERRAR_CICLO = """
+    UPDATE ciclos SET
+        estado = 'cerrado',
+        fecha_cierre = ?,
+        capital_final = ?,
+        roi_total = ?
+    WHERE id = ?
+"""
+
+_SQL_POSICION_BOVEDA = """
+    SELECT b.cantidad, b.precio_promedio, c.nombre, c.simbolo
+    FROM boveda_ciclo b
+    JOIN criptomonedas c ON b.cripto_id = c.id
+    WHERE b.ciclo_id = ? AND b.cripto_id = ?
+"""
+
+_SQL_ACTUALIZAR_INVERSION = "UPDATE ciclos SET inversion_inicial = ? WHERE id = ?"
+
+def _leer_ciclo_activo(cursor):
+    """Ciclo activo (id, inversion_inicial, ganancia_total) o None si no hay"""
+    cursor.execute(_SQL_CICLO_ACTIVO_DATOS)
+    return cursor.fetchone()
+
 # Modelos
 class Ciclo(BaseModel):
     id: int
@@ -45,287 +157,176 @@ class EstadisticasCiclo(BaseModel):
     dias_sin_operaciones: int
     total_ventas: int
 
+# Las columnas con alias "[fecha]" llegan ya convertidas a date (ver core.db_manager).
+# Los modelos de respuesta se arman con model_construct: los datos vienen de la BD
+# y FastAPI los valida igualmente contra response_model al serializar
+
 # Endpoints
+# Los que tocan la BD son síncronos a propósito: FastAPI los ejecuta en su threadpool,
+# así las consultas a SQLite no bloquean el event loop
 @router.get("/activo", response_model=Ciclo)
-async def get_ciclo_activo():
+@cache.cacheado("ciclos")
+def get_ciclo_activo():
     """Obtener información del ciclo activo actual"""
-    try:
-        with db.get_cursor(commit=False) as cursor:
-            cursor.execute("""
-                SELECT id, fecha_inicio, inversion_inicial, dias_operados, 
-                       ganancia_total, roi_total, estado
-                FROM ciclos WHERE estado = 'activo' LIMIT 1
-            """)
-            ciclo = cursor.fetchone()
-            
-            if not ciclo:
-                raise HTTPException(status_code=404, detail="No hay ciclo activo")
-            
-            cursor.execute("""
-                SELECT COUNT(*) as total FROM ventas v
-                JOIN dias d ON v.dia_id = d.id WHERE d.ciclo_id = ?
-            """, (ciclo['id'],))
-            ventas = cursor.fetchone()['total']
-            
-            cursor.execute("SELECT COUNT(*) FROM ciclos WHERE id <= ?", (ciclo['id'],))
-            numero_ciclo = cursor.fetchone()[0]
-            
-            return Ciclo(
-                id=ciclo['id'],
-                numero=numero_ciclo,
-                fecha_inicio=datetime.fromisoformat(str(ciclo['fecha_inicio'])).date(),
-                fecha_fin=None,
-                capital_inicial=ciclo['inversion_inicial'] or 0.0,
-                capital_final=None,
-                ganancia_total=ciclo['ganancia_total'] or 0.0,
-                rendimiento_porcentual=ciclo['roi_total'],
-                dias_operados=ciclo['dias_operados'] or 0,
-                ventas_totales=ventas,
-                estado=ciclo['estado']
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=False) as cursor:
+        # Ciclo, total de ventas y número ordinal en una sola consulta
+        cursor.execute(_SQL_CICLO_ACTIVO)
+        ciclo = cursor.fetchone()
+        
+        if not ciclo:
+            raise HTTPException(status_code=404, detail="No hay ciclo activo")
+        
+        return Ciclo.model_construct(
+            id=ciclo['id'],
+            numero=ciclo['numero'],
+            fecha_inicio=ciclo['fecha_inicio'],
+            fecha_fin=None,
+            capital_inicial=ciclo['inversion_inicial'] or 0.0,
+            capital_final=None,
+            ganancia_total=ciclo['ganancia_total'] or 0.0,
+            rendimiento_porcentual=ciclo['roi_total'],
+            dias_operados=ciclo['dias_operados'] or 0,
+            ventas_totales=ciclo['ventas_totales'],
+            estado=ciclo['estado']
+        )
 
 @router.get("/historial", response_model=List[Ciclo])
-async def get_historial_ciclos(limite: int = 10):
+@cache.cacheado("ciclos")
+def get_historial_ciclos(limite: int = 10):
     """Obtener historial de ciclos finalizados"""
-    try:
-        with db.get_cursor(commit=False) as cursor:
-            cursor.execute("""
-                SELECT id, fecha_inicio, fecha_cierre, dias_operados,
-                       inversion_inicial, capital_final, ganancia_total, roi_total, estado
-                FROM ciclos
-                WHERE estado = 'cerrado'
-                ORDER BY fecha_inicio DESC
-                LIMIT ?
-            """, (limite,))
-            
-            ciclos = []
-            for row in cursor.fetchall():
-                cursor.execute("""
-                    SELECT COUNT(*) as total FROM ventas v
-                    JOIN dias d ON v.dia_id = d.id WHERE d.ciclo_id = ?
-                """, (row['id'],))
-                ventas = cursor.fetchone()['total']
-                
-                cursor.execute("SELECT COUNT(*) FROM ciclos WHERE id <= ?", (row['id'],))
-                numero = cursor.fetchone()[0]
-                
-                ciclos.append(Ciclo(
-                    id=row['id'],
-                    numero=numero,
-                    fecha_inicio=datetime.fromisoformat(str(row['fecha_inicio'])).date(),
-                    fecha_fin=datetime.fromisoformat(str(row['fecha_cierre'])).date() if row['fecha_cierre'] else None,
-                    capital_inicial=row['inversion_inicial'] or 0.0,
-                    capital_final=row['capital_final'],
-                    ganancia_total=row['ganancia_total'],
-                    rendimiento_porcentual=row['roi_total'],
-                    dias_operados=row['dias_operados'] or 0,
-                    ventas_totales=ventas,
-                    estado=row['estado']
-                ))
-            
-            return ciclos
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=False) as cursor:
+        # Una sola consulta: ventas_totales es una columna y el número sale de ROW_NUMBER()
+        cursor.execute(_SQL_HISTORIAL, (limite,))
+        
+        # Se recorre el cursor directamente, sin fetchall()
+        return [Ciclo.model_construct(
+            id=row['id'],
+            numero=row['numero'],
+            fecha_inicio=row['fecha_inicio'],
+            fecha_fin=row['fecha_cierre'],
+            capital_inicial=row['inversion_inicial'] or 0.0,
+            capital_final=row['capital_final'],
+            ganancia_total=row['ganancia_total'],
+            rendimiento_porcentual=row['roi_total'],
+            dias_operados=row['dias_operados'] or 0,
+            ventas_totales=row['ventas_totales'],
+            estado=row['estado']
+        ) for row in cursor]
 
 @router.get("/{ciclo_id}", response_model=Ciclo)
-async def get_ciclo_por_id(ciclo_id: int):
+def get_ciclo_por_id(ciclo_id: int):
     """Obtener información de un ciclo específico por ID"""
-    try:
-        with db.get_cursor(commit=False) as cursor:
-            cursor.execute("""
-                SELECT id, fecha_inicio, fecha_cierre, dias_operados,
-                       inversion_inicial, capital_final, ganancia_total, roi_total, estado
-                FROM ciclos WHERE id = ?
-            """, (ciclo_id,))
-            
-            row = cursor.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="Ciclo no encontrado")
-            
-            cursor.execute("""
-                SELECT COUNT(*) as total FROM ventas v
-                JOIN dias d ON v.dia_id = d.id WHERE d.ciclo_id = ?
-            """, (row['id'],))
-            ventas = cursor.fetchone()['total']
-            
-            cursor.execute("SELECT COUNT(*) FROM ciclos WHERE id <= ?", (row['id'],))
-            numero = cursor.fetchone()[0]
-            
-            return Ciclo(
-                id=row['id'],
-                numero=numero,
-                fecha_inicio=datetime.fromisoformat(str(row['fecha_inicio'])).date(),
-                fecha_fin=datetime.fromisoformat(str(row['fecha_cierre'])).date() if row['fecha_cierre'] else None,
-                capital_inicial=row['inversion_inicial'] or 0.0,
-                capital_final=row['capital_final'],
-                ganancia_total=row['ganancia_total'],
-                rendimiento_porcentual=row['roi_total'],
-                dias_operados=row['dias_operados'] or 0,
-                ventas_totales=ventas,
-                estado=row['estado']
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=False) as cursor:
+        cursor.execute(_SQL_CICLO_POR_ID, (ciclo_id,))
+        
+        row = cursor.fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="Ciclo no encontrado")
+        
+        return Ciclo.model_construct(
+            id=row['id'],
+            numero=row['numero'],
+            fecha_inicio=row['fecha_inicio'],
+            fecha_fin=row['fecha_cierre'],
+            capital_inicial=row['inversion_inicial'] or 0.0,
+            capital_final=row['capital_final'],
+            ganancia_total=row['ganancia_total'],
+            rendimiento_porcentual=row['roi_total'],
+            dias_operados=row['dias_operados'] or 0,
+            ventas_totales=row['ventas_totales'],
+            estado=row['estado']
+        )
 
 @router.get("/{ciclo_id}/estadisticas", response_model=EstadisticasCiclo)
-async def get_estadisticas_ciclo(ciclo_id: int):
+def get_estadisticas_ciclo(ciclo_id: int):
     """Obtener estadísticas detalladas de un ciclo"""
-    try:
-        with db.get_cursor(commit=False) as cursor:
-            # Verificar que el ciclo existe
-            cursor.execute("SELECT id FROM ciclos WHERE id = ?", (ciclo_id,))
-            if not cursor.fetchone():
-                raise HTTPException(status_code=404, detail="Ciclo no encontrado")
-            
-            # Total de ventas
-            cursor.execute("""
-                SELECT COUNT(*) as total FROM ventas v
-                JOIN dias d ON v.dia_id = d.id WHERE d.ciclo_id = ?
-            """, (ciclo_id,))
-            total_ventas = cursor.fetchone()['total']
-            
-            # Días con operaciones
-            cursor.execute("""
-                SELECT COUNT(DISTINCT d.id) as total FROM dias d
-                WHERE d.ciclo_id = ? AND d.estado = 'cerrado'
-            """, (ciclo_id,))
-            dias_operados = cursor.fetchone()['total']
-            
-            # Promedio de ganancia diaria
-            cursor.execute("""
-                SELECT AVG(ganancia_neta) as promedio FROM dias
-                WHERE ciclo_id = ? AND estado = 'cerrado' AND ganancia_neta IS NOT NULL
-            """, (ciclo_id,))
-            promedio = cursor.fetchone()['promedio'] or 0.0
-            
-            # Mejor día
-            cursor.execute("""
-                SELECT fecha, ganancia_neta FROM dias
-                WHERE ciclo_id = ? AND estado = 'cerrado' AND ganancia_neta IS NOT NULL
-                ORDER BY ganancia_neta DESC LIMIT 1
-            """, (ciclo_id,))
-            mejor = cursor.fetchone()
-            
-            # Peor día
-            cursor.execute("""
-                SELECT fecha, ganancia_neta FROM dias
-                WHERE ciclo_id = ? AND estado = 'cerrado' AND ganancia_neta IS NOT NULL
-                ORDER BY ganancia_neta ASC LIMIT 1
-            """, (ciclo_id,))
-            peor = cursor.fetchone()
-            
-            return EstadisticasCiclo(
-                promedio_ganancia_diaria=round(promedio, 2),
-                mejor_dia=datetime.fromisoformat(str(mejor['fecha'])).date() if mejor else None,
-                mejor_dia_ganancia=mejor['ganancia_neta'] if mejor else None,
-                peor_dia=datetime.fromisoformat(str(peor['fecha'])).date() if peor else None,
-                peor_dia_ganancia=peor['ganancia_neta'] if peor else None,
-                dias_con_operaciones=dias_operados,
-                dias_sin_operaciones=0,
-                total_ventas=total_ventas
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=False) as cursor:
+        # Todas las estadísticas en una sola consulta (sin fila = el ciclo no existe)
+        cursor.execute(_SQL_ESTADISTICAS, {"ciclo_id": ciclo_id})
+        stats = cursor.fetchone()
+        if not stats:
+            raise HTTPException(status_code=404, detail="Ciclo no encontrado")
+        
+        promedio = stats['promedio'] or 0.0
+        
+        return EstadisticasCiclo.model_construct(
+            promedio_ganancia_diaria=round(promedio, 2),
+            mejor_dia=stats['mejor_fecha'],
+            mejor_dia_ganancia=stats['mejor_ganancia'],
+            peor_dia=stats['peor_fecha'],
+            peor_dia_ganancia=stats['peor_ganancia'],
+            dias_con_operaciones=stats['dias_operados'],
+            dias_sin_operaciones=0,
+            total_ventas=stats['total_ventas']
+        )
 
 @router.post("/iniciar")
-async def iniciar_nuevo_ciclo(datos: IniciarCicloRequest):
+def iniciar_nuevo_ciclo(datos: IniciarCicloRequest):
     """Iniciar un nuevo ciclo de operaciones"""
-    try:
-        with db.get_cursor(commit=True) as cursor:
-            # Verificar que no hay ciclo activo
-            cursor.execute("SELECT id FROM ciclos WHERE estado = 'activo'")
-            if cursor.fetchone():
-                raise HTTPException(status_code=400, detail="Ya existe un ciclo activo")
-            
-            # Calcular capital inicial desde bóveda si no se proporciona
-            if datos.capital_inicial is None or datos.capital_inicial == 0:
-                # Buscar el último ciclo cerrado para obtener su bóveda
-                cursor.execute("""
-                    SELECT SUM(cantidad * precio_promedio) as capital_boveda
-                    FROM boveda_ciclo b
-                    JOIN ciclos c ON b.ciclo_id = c.id
-                    WHERE c.estado = 'cerrado'
-                    ORDER BY c.id DESC LIMIT 1
-                """)
-                boveda_anterior = cursor.fetchone()
-                capital_inicial = boveda_anterior['capital_boveda'] if boveda_anterior and boveda_anterior['capital_boveda'] else 0
-            else:
-                capital_inicial = datos.capital_inicial
-            
-            # Crear nuevo ciclo
-            fecha = datetime.now()
-            cursor.execute("""
-                INSERT INTO ciclos (fecha_inicio, inversion_inicial, estado, dias_planificados, fecha_fin_estimada)
-                VALUES (?, ?, ?, ?, ?)
-            """, (fecha, capital_inicial, 'activo', 30, fecha.date()))
-            
-            ciclo_id = cursor.lastrowid
-            
-            cursor.execute("SELECT COUNT(*) FROM ciclos WHERE id <= ?", (ciclo_id,))
-            numero = cursor.fetchone()[0]
-            
-            return {
-                "success": True,
-                "message": "Ciclo iniciado correctamente",
-                "ciclo_id": ciclo_id,
-                "numero": numero,
-                "capital_inicial": capital_inicial,
-                "fecha_inicio": str(fecha.date())
-            }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=True) as cursor:
+        # Verificar que no hay ciclo activo
+        if _leer_ciclo_activo(cursor):
+            raise HTTPException(status_code=400, detail="Ya existe un ciclo activo")
+        
+        # Calcular capital inicial desde bóveda si no se proporciona
+        if datos.capital_inicial is None or datos.capital_inicial == 0:
+            # Buscar el último ciclo cerrado para obtener su bóveda
+            cursor.execute(_SQL_CAPITAL_BOVEDA_ANTERIOR)
+            capital_inicial = cursor.fetchone()['capital_boveda']
+        else:
+            capital_inicial = datos.capital_inicial
+        
+        # Crear nuevo ciclo
+        fecha = datetime.now()
+        cursor.execute(_SQL_CREAR_CICLO, (fecha, capital_inicial, 'activo', 30, fecha.date()))
+        
+        ciclo_id = cursor.lastrowid
+        
+        cursor.execute(_SQL_NUMERO_CICLO, (ciclo_id,))
+        numero = cursor.fetchone()[0]
+        
+        resultado = {
+            "success": True,
+            "message": "Ciclo iniciado correctamente",
+            "ciclo_id": ciclo_id,
+            "numero": numero,
+            "capital_inicial": capital_inicial,
+            "fecha_inicio": fecha.date()
+        }
+
+    # El ciclo activo cambia lo que muestran bóveda, ciclos y dashboard
+    cache.invalidar()
+    return resultado
 
 @router.post("/finalizar")
-async def finalizar_ciclo_actual(datos: FinalizarCicloRequest):
+def finalizar_ciclo_actual(datos: FinalizarCicloRequest):
     """Finalizar el ciclo activo actual"""
-    try:
-        with db.get_cursor(commit=True) as cursor:
-            # Buscar ciclo activo
-            cursor.execute("""
-                SELECT id, inversion_inicial, ganancia_total FROM ciclos 
-                WHERE estado = 'activo' LIMIT 1
-            """)
-            ciclo = cursor.fetchone()
-            
-            if not ciclo:
-                raise HTTPException(status_code=400, detail="No hay ciclo activo")
-            
-            # Calcular capital final y ROI
-            capital_final = ciclo['inversion_inicial'] + (ciclo['ganancia_total'] or 0)
-            roi = ((ciclo['ganancia_total'] or 0) / ciclo['inversion_inicial'] * 100) if ciclo['inversion_inicial'] > 0 else 0
-            
-            # Cerrar ciclo
-            cursor.execute("""
-                UPDATE ciclos SET
-                    estado = 'cerrado',
-                    fecha_cierre = ?,
-                    capital_final = ?,
-                    roi_total = ?
-                WHERE id = ?
-            """, (datetime.now(), capital_final, roi, ciclo['id']))
-            
-            return {
-                "success": True,
-                "message": "Ciclo finalizado correctamente",
-                "capital_final": round(capital_final, 2),
-                "ganancia_total": round(ciclo['ganancia_total'] or 0, 2),
-                "rendimiento_porcentual": round(roi, 2),
-                "notas": datos.notas
-            }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=True) as cursor:
+        # Buscar ciclo activo
+        ciclo = _leer_ciclo_activo(cursor)
+        
+        if not ciclo:
+            raise HTTPException(status_code=400, detail="No hay ciclo activo")
+        
+        # Calcular capital final y ROI
+        capital_final = ciclo['inversion_inicial'] + (ciclo['ganancia_total'] or 0)
+        roi = ((ciclo['ganancia_total'] or 0) / ciclo['inversion_inicial'] * 100) if ciclo['inversion_inicial'] > 0 else 0
+        
+        # Cerrar ciclo
+        cursor.execute(_SQL_CERRAR_CICLO, (datetime.now(), capital_final, roi, ciclo['id']))
+        
+        resultado = {
+            "success": True,
+            "message": "Ciclo finalizado correctamente",
+            "capital_final": round(capital_final, 2),
+            "ganancia_total": round(ciclo['ganancia_total'] or 0, 2),
+            "rendimiento_porcentual": round(roi, 2),
+            "notas": datos.notas
+        }
+
+    # El ciclo activo cambia lo que muestran bóveda, ciclos y dashboard
+    cache.invalidar()
+    return resultado
 
 @router.get("/test")
 async def test_ciclos():
@@ -337,58 +338,48 @@ class TransferirCapitalRequest(BaseModel):
     transferir_todo: bool = Field(False, description="Transferir toda la cantidad disponible")
 
 @router.post("/transferir-capital")
-async def transferir_capital_a_ciclo(datos: TransferirCapitalRequest):
+def transferir_capital_a_ciclo(datos: TransferirCapitalRequest):
     """Transfiere capital de la bóveda al ciclo activo"""
-    try:
-        with db.get_cursor(commit=True) as cursor:
-            # Verificar ciclo activo
-            cursor.execute("SELECT id, inversion_inicial FROM ciclos WHERE estado = 'activo' LIMIT 1")
-            ciclo = cursor.fetchone()
-            if not ciclo:
-                raise HTTPException(status_code=400, detail="No hay ciclo activo")
-            
-            ciclo_id = ciclo['id']
-            
-            # Verificar que la cripto existe en bóveda
-            cursor.execute("""
-                SELECT b.cantidad, b.precio_promedio, c.nombre, c.simbolo
-                FROM boveda_ciclo b
-                JOIN criptomonedas c ON b.cripto_id = c.id
-                WHERE b.ciclo_id = ? AND b.cripto_id = ?
-            """, (ciclo_id, datos.cripto_id))
-            
-            boveda = cursor.fetchone()
-            if not boveda:
-                raise HTTPException(status_code=404, detail="Criptomoneda no encontrada en bóveda")
-            
-            # Determinar cantidad a transferir
-            cantidad_transferir = boveda['cantidad'] if datos.transferir_todo else datos.cantidad
-            
-            if cantidad_transferir > boveda['cantidad']:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Cantidad insuficiente. Disponible: {boveda['cantidad']}"
-                )
-            
-            # Calcular valor en USD
-            valor_usd = cantidad_transferir * boveda['precio_promedio']
-            
-            # Actualizar capital del ciclo
-            nuevo_capital = ciclo['inversion_inicial'] + valor_usd
-            cursor.execute("""
-                UPDATE ciclos SET inversion_inicial = ? WHERE id = ?
-            """, (nuevo_capital, ciclo_id))
-            
-            return {
-                "success": True,
-                "message": f"Transferido {cantidad_transferir} {boveda['simbolo']} al ciclo",
-                "cripto": boveda['simbolo'],
-                "cantidad_transferida": cantidad_transferir,
-                "valor_usd": round(valor_usd, 2),
-                "nuevo_capital_ciclo": round(nuevo_capital, 2)
-            }
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=True) as cursor:
+        # Verificar ciclo activo
+        ciclo = _leer_ciclo_activo(cursor)
+        if not ciclo:
+            raise HTTPException(status_code=400, detail="No hay ciclo activo")
+        
+        ciclo_id = ciclo['id']
+        
+        # Verificar que la cripto existe en bóveda
+        cursor.execute(_SQL_POSICION_BOVEDA, (ciclo_id, datos.cripto_id))
+        
+        boveda = cursor.fetchone()
+        if not boveda:
+            raise HTTPException(status_code=404, detail="Criptomoneda no encontrada en bóveda")
+        
+        # Determinar cantidad a transferir
+        cantidad_transferir = boveda['cantidad'] if datos.transferir_todo else datos.cantidad
+        
+        if cantidad_transferir > boveda['cantidad']:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Cantidad insuficiente. Disponible: {boveda['cantidad']}"
+            )
+        
+        # Calcular valor en USD
+        valor_usd = cantidad_transferir * boveda['precio_promedio']
+        
+        # Actualizar capital del ciclo
+        nuevo_capital = ciclo['inversion_inicial'] + valor_usd
+        cursor.execute(_SQL_ACTUALIZAR_INVERSION, (nuevo_capital, ciclo_id))
+        
+        resultado = {
+            "success": True,
+            "message": f"Transferido {cantidad_transferir} {boveda['simbolo']} al ciclo",
+            "cripto": boveda['simbolo'],
+            "cantidad_transferida": cantidad_transferir,
+            "valor_usd": round(valor_usd, 2),
+            "nuevo_capital_ciclo": round(nuevo_capital, 2)
+        }
+
+    # El ciclo activo cambia lo que muestran bóveda, ciclos y dashboard
+    cache.invalidar()
+    return resultado
@@ -2,18 +2,106 @@
 Rutas de Configuración
 Gestión de configuración del sistema
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
 from pydantic import BaseModel, Field
 from typing import Optional
+from dataclasses import dataclass, replace
 from datetime import datetime
-import sys
-import os
+import threading
+import time
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import settings
+from core.cache import CACHE_TTL
+from core.db_manager import db
 
 router = APIRouter()
 
+# Configuración operativa: snapshot inmutable que se reemplaza entero en cada cambio
+# y se persiste en la tabla config (la misma que usan los módulos CLI)
+@dataclass(slots=True, frozen=True)
+class RuntimeConfig:
+    comision_defecto: float
+    ganancia_objetivo: float
+    min_ventas_dia: int
+    max_ventas_dia: int
+
+_CONFIG_POR_DEFECTO = RuntimeConfig(
+    comision_defecto=0.35,
+    ganancia_objetivo=2.0,
+    min_ventas_dia=5,
+    max_ventas_dia=8
+)
+
+_SQL_LEER_CONFIG = """
+    SELECT comision_default, ganancia_neta_default, limite_ventas_min, limite_ventas_max
+    FROM config WHERE id = 1
+"""
+
+_SQL_GUARDAR_CONFIG = """
+    INSERT INTO config (id, comision_default, ganancia_neta_default,
+                        limite_ventas_min, limite_ventas_max, actualizado)
+    VALUES (1, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(id) DO UPDATE SET
+        comision_default = excluded.comision_default,
+        ganancia_neta_default = excluded.ganancia_neta_default,
+        limite_ventas_min = excluded.limite_ventas_min,
+        limite_ventas_max = excluded.limite_ventas_max,
+        actualizado = excluded.actualizado
+"""
+
+_config_actual: Optional[RuntimeConfig] = None
+# El CLI escribe la misma tabla desde otro proceso: el snapshot se relee pasado CACHE_TTL
+_config_expira: float = 0.0
+
+# Serializa leer-modificar-guardar para que dos PUT simultáneos no se pisen campos
+_lock_config = threading.Lock()
+
+def obtener_config_runtime(releer: bool = False) -> RuntimeConfig:
+    """
+    Devuelve el snapshot vigente (se relee de la BD si pasó CACHE_TTL desde la última lectura)
+    
+    Args:
+        releer: Si True, lee la BD aunque el snapshot no haya expirado
+    """
+    global _config_actual, _config_expira
+    config = _config_actual
+    if config is not None and not releer and time.monotonic() < _config_expira:
+        return config
+    
+    with db.get_cursor(commit=False) as cursor:
+        cursor.execute(_SQL_LEER_CONFIG)
+        row = cursor.fetchone()
+    
+    if row:
+        config = RuntimeConfig(
+            comision_defecto=row['comision_default'],
+            ganancia_objetivo=row['ganancia_neta_default'],
+            min_ventas_dia=row['limite_ventas_min'],
+            max_ventas_dia=row['limite_ventas_max']
+        )
+    else:
+        config = RuntimeConfig(
+            comision_defecto=settings.COMISION_DEFECTO,
+            ganancia_objetivo=settings.GANANCIA_OBJETIVO_DEFECTO,
+            min_ventas_dia=settings.MIN_VENTAS_DIA,
+            max_ventas_dia=settings.MAX_VENTAS_DIA
+        )
+    
+    _config_actual = config
+    _config_expira = time.monotonic() + CACHE_TTL
+    return config
+
+def _guardar_config_runtime(config: RuntimeConfig):
+    """Persiste el snapshot y, tras el commit, lo publica (llamar con _lock_config tomado)"""
+    global _config_actual, _config_expira
+    with db.get_cursor(commit=True) as cursor:
+        cursor.execute(_SQL_GUARDAR_CONFIG, (
+            config.comision_defecto, config.ganancia_objetivo,
+            config.min_ventas_dia, config.max_ventas_dia
+        ))
+    _config_actual = config
+    _config_expira = time.monotonic() + CACHE_TTL
+
 # Modelos
 class ConfigGeneral(BaseModel):
     comision_defecto: float = Field(..., ge=0, le=100)
@@ -36,50 +124,33 @@ class ActualizarConfigRequest(BaseModel):
 
 # Endpoints
 @router.get("/general", response_model=ConfigGeneral)
-async def get_config_general():
+def get_config_general():
     """Obtener configuración general"""
-    try:
-        return ConfigGeneral(
-            comision_defecto=settings.COMISION_DEFECTO,
-            ganancia_objetivo=settings.GANANCIA_OBJETIVO_DEFECTO,
-            min_ventas_dia=settings.MIN_VENTAS_DIA,
-            max_ventas_dia=settings.MAX_VENTAS_DIA
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    config = obtener_config_runtime()
+    return ConfigGeneral(
+        comision_defecto=config.comision_defecto,
+        ganancia_objetivo=config.ganancia_objetivo,
+        min_ventas_dia=config.min_ventas_dia,
+        max_ventas_dia=config.max_ventas_dia
+    )
 
 @router.put("/general")
-async def actualizar_config_general(datos: ActualizarConfigRequest):
-    """Actualizar configuración en memoria (temporal hasta reinicio)"""
-    try:
-        campos_actualizados = {}
-        
-        if datos.comision_defecto is not None:
-            settings.COMISION_DEFECTO = datos.comision_defecto
-            campos_actualizados['comision_defecto'] = datos.comision_defecto
-        
-        if datos.ganancia_objetivo is not None:
-            settings.GANANCIA_OBJETIVO_DEFECTO = datos.ganancia_objetivo
-            campos_actualizados['ganancia_objetivo'] = datos.ganancia_objetivo
-        
-        if datos.min_ventas_dia is not None:
-            settings.MIN_VENTAS_DIA = datos.min_ventas_dia
-            campos_actualizados['min_ventas_dia'] = datos.min_ventas_dia
-        
-        if datos.max_ventas_dia is not None:
-            settings.MAX_VENTAS_DIA = datos.max_ventas_dia
-            campos_actualizados['max_ventas_dia'] = datos.max_ventas_dia
-        
-        return {
-            "success": True,
-            "message": "Configuración actualizada correctamente",
-            "campos_actualizados": campos_actualizados,
-            "nota": "Los cambios están activos pero son temporales (hasta reiniciar servidor). Para hacerlos permanentes, edita backend/config.py",
-            "timestamp": datetime.now()
-        }
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+def actualizar_config_general(datos: ActualizarConfigRequest):
+    """Actualizar configuración (se guarda en la tabla config)"""
+    campos_actualizados = datos.model_dump(exclude_none=True)
+    
+    with _lock_config:
+        # Releer: el CLI puede haber cambiado otros campos desde la última lectura
+        config = replace(obtener_config_runtime(releer=True), **campos_actualizados)
+        _guardar_config_runtime(config)
+    
+    return {
+        "success": True,
+        "message": "Configuración actualizada correctamente",
+        "campos_actualizados": campos_actualizados,
+        "nota": "Los cambios se guardan en la base de datos y se mantienen al reiniciar",
+        "timestamp": datetime.now()
+    }
 
 @router.get("/sistema")
 async def get_config_sistema():
@@ -96,28 +167,23 @@ async def get_config_sistema():
     )
 
 @router.post("/reset-configuracion")
-async def reset_configuracion():
+def reset_configuracion():
     """Restaurar configuración a valores por defecto"""
-    try:
-        settings.COMISION_DEFECTO = 0.35
-        settings.GANANCIA_OBJETIVO_DEFECTO = 2.0
-        settings.MIN_VENTAS_DIA = 5
-        settings.MAX_VENTAS_DIA = 8
+    with _lock_config:
+        _guardar_config_runtime(_CONFIG_POR_DEFECTO)
+    
+    return {
+        "success": True,
+        "message": "Configuración restaurada a valores por defecto",
+        "timestamp": datetime.now()
+    }
         
-        return {
-            "success": True,
-            "message": "Configuración restaurada a valores por defecto",
-            "timestamp": datetime.now()
-        }
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 @router.get("/test")
 async def test_configuracion():
     """Endpoint de prueba"""
     return {
         "message": "Módulo de configuración funcionando",
-        "storage": "En memoria (temporal)",
+        "storage": "SQLite (tabla config)",
         "timestamp": datetime.now().isoformat()
     }
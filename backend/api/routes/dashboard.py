@@ -2,15 +2,13 @@
 Rutas del Dashboard
 Métricas, resúmenes y estadísticas generales
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, date
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.db_manager import db
+from core.cache import cache
 
 router = APIRouter()
 
@@ -37,130 +35,99 @@ class ResumenGeneral(BaseModel):
     rendimiento_porcentual: float
     ultima_actualizacion: datetime
 
+# Todas las cifras del resumen en un solo viaje a la BD (el CTE ubica el ciclo activo una vez)
+# "Hoy" es un rango sobre la fecha tal cual está guardada: a diferencia de DATE(v.fecha),
+# la comparación directa recorre solo las ventas de hoy en idx_ventas_fecha
+_SQL_RESUMEN = """
+    WITH activo AS (
+        SELECT id, ganancia_total, roi_total FROM ciclos WHERE estado = 'activo' LIMIT 1
+    )
+    SELECT
+        (SELECT COALESCE(SUM(b.cantidad * b.precio_promedio), 0)
+         FROM boveda_ciclo b JOIN activo a ON b.ciclo_id = a.id) as capital_total,
+        COALESCE((SELECT ganancia_total FROM activo), 0) as ganancia_total,
+        COALESCE((SELECT roi_total FROM activo), 0) as roi_total,
+        (SELECT COUNT(*) FROM ciclos WHERE estado = 'cerrado') as ciclos_completados,
+        (SELECT COUNT(*) FROM ventas v
+         JOIN dias d ON v.dia_id = d.id
+         JOIN activo a ON d.ciclo_id = a.id
+         WHERE v.fecha >= DATE('now') AND v.fecha < DATE('now', '+1 day')) as ventas_hoy
+"""
+
+def _leer_resumen(cursor) -> tuple:
+    """Capital, ganancia, ROI, ciclos cerrados y ventas de hoy del ciclo activo"""
+    cursor.execute(_SQL_RESUMEN)
+    row = cursor.fetchone()
+    return (row['capital_total'], row['ganancia_total'], row['roi_total'],
+            row['ciclos_completados'], row['ventas_hoy'])
+
+# Los modelos de respuesta se arman con model_construct: los datos vienen de la BD
+# y FastAPI los valida igualmente contra response_model al serializar
+
 # Endpoints
+# Los que tocan la BD son síncronos a propósito: FastAPI los ejecuta en su threadpool,
+# así las consultas a SQLite no bloquean el event loop
 @router.get("/resumen", response_model=ResumenGeneral)
-async def get_resumen_general():
+@cache.cacheado("dashboard")
+def get_resumen_general():
     """
     Obtener resumen general del sistema
     Incluye capital, ganancias, ciclos y métricas principales
     """
-    try:
-        with db.get_cursor(commit=False) as cursor:
-            # Capital total de bóveda
-            cursor.execute("""
-                SELECT SUM(b.cantidad * b.precio_promedio) as capital_total
-                FROM boveda_ciclo b
-                JOIN ciclos cy ON b.ciclo_id = cy.id
-                WHERE cy.estado = 'activo'
-            """)
-            capital = cursor.fetchone()['capital_total'] or 0.0
-            
-            # Ganancia total del ciclo activo
-            cursor.execute("""
-                SELECT ganancia_total, roi_total, id
-                FROM ciclos WHERE estado = 'activo' LIMIT 1
-            """)
-            ciclo = cursor.fetchone()
-            ganancia = ciclo['ganancia_total'] or 0.0 if ciclo else 0.0
-            roi = ciclo['roi_total'] or 0.0 if ciclo else 0.0
-            ciclo_id = ciclo['id'] if ciclo else None
-            
-            # Ciclos completados
-            cursor.execute("SELECT COUNT(*) as total FROM ciclos WHERE estado = 'cerrado'")
-            ciclos_completados = cursor.fetchone()['total']
-            
-            # Ventas de hoy
-            ventas_hoy = 0
-            if ciclo_id:
-                cursor.execute("""
-                    SELECT COUNT(*) as total FROM ventas v
-                    JOIN dias d ON v.dia_id = d.id
-                    WHERE d.ciclo_id = ? AND DATE(v.fecha) = DATE('now')
-                """, (ciclo_id,))
-                ventas_hoy = cursor.fetchone()['total']
-            
-            return ResumenGeneral(
-                capital_total=capital,
-                ganancia_total=ganancia,
-                ciclos_completados=ciclos_completados,
-                ventas_hoy=ventas_hoy,
-                rendimiento_porcentual=roi,
-                ultima_actualizacion=datetime.now()
-            )
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=False) as cursor:
+        capital, ganancia, roi, ciclos_completados, ventas_hoy = _leer_resumen(cursor)
+        
+        return ResumenGeneral.model_construct(
+            capital_total=capital,
+            ganancia_total=ganancia,
+            ciclos_completados=ciclos_completados,
+            ventas_hoy=ventas_hoy,
+            rendimiento_porcentual=roi,
+            ultima_actualizacion=datetime.now()
+        )
+        
 
 @router.get("/metricas", response_model=List[MetricaGeneral])
-async def get_metricas_principales():
+@cache.cacheado("dashboard")
+def get_metricas_principales():
     """
     Obtener métricas principales en formato de tarjetas
     Para mostrar en el dashboard principal
     """
-    try:
-        with db.get_cursor(commit=False) as cursor:
-            # Capital total
-            cursor.execute("""
-                SELECT SUM(b.cantidad * b.precio_promedio) as capital_total
-                FROM boveda_ciclo b
-                JOIN ciclos cy ON b.ciclo_id = cy.id
-                WHERE cy.estado = 'activo'
-            """)
-            capital = cursor.fetchone()['capital_total'] or 0.0
-            
-            # Ganancia y ventas del ciclo activo
-            cursor.execute("""
-                SELECT ganancia_total, roi_total, id
-                FROM ciclos WHERE estado = 'activo' LIMIT 1
-            """)
-            ciclo = cursor.fetchone()
-            ganancia = ciclo['ganancia_total'] or 0.0 if ciclo else 0.0
-            roi = ciclo['roi_total'] or 0.0 if ciclo else 0.0
-            ciclo_id = ciclo['id'] if ciclo else None
-            
-            # Ventas de hoy
-            ventas_hoy = 0
-            if ciclo_id:
-                cursor.execute("""
-                    SELECT COUNT(*) as total FROM ventas v
-                    JOIN dias d ON v.dia_id = d.id
-                    WHERE d.ciclo_id = ? AND DATE(v.fecha) = DATE('now')
-                """, (ciclo_id,))
-                ventas_hoy = cursor.fetchone()['total']
-            
-            return [
-                MetricaGeneral(
-                    titulo="Capital Total",
-                    valor=capital,
-                    formato="currency",
-                    cambio=None,
-                    trend="stable"
-                ),
-                MetricaGeneral(
-                    titulo="Ganancia Total",
-                    valor=ganancia,
-                    formato="currency",
-                    cambio=None,
-                    trend="up" if ganancia > 0 else "stable"
-                ),
-                MetricaGeneral(
-                    titulo="Rendimiento",
-                    valor=roi,
-                    formato="percentage",
-                    cambio=None,
-                    trend="up" if roi > 0 else "stable"
-                ),
-                MetricaGeneral(
-                    titulo="Ventas Hoy",
-                    valor=float(ventas_hoy),
-                    formato="number",
-                    cambio=None,
-                    trend="stable"
-                )
-            ]
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=False) as cursor:
+        capital, ganancia, roi, _, ventas_hoy = _leer_resumen(cursor)
+        
+        return [
+            MetricaGeneral.model_construct(
+                titulo="Capital Total",
+                valor=capital,
+                formato="currency",
+                cambio=None,
+                trend="stable"
+            ),
+            MetricaGeneral.model_construct(
+                titulo="Ganancia Total",
+                valor=ganancia,
+                formato="currency",
+                cambio=None,
+                trend="up" if ganancia > 0 else "stable"
+            ),
+            MetricaGeneral.model_construct(
+                titulo="Rendimiento",
+                valor=roi,
+                formato="percentage",
+                cambio=None,
+                trend="up" if roi > 0 else "stable"
+            ),
+            MetricaGeneral.model_construct(
+                titulo="Ventas Hoy",
+                valor=float(ventas_hoy),
+                formato="number",
+                cambio=None,
+                trend="stable"
+            )
+        ]
+        
 
 @router.get("/resumen-dia", response_model=ResumenDia)
 async def get_resumen_dia_actual():
@@ -168,7 +135,7 @@ async def get_resumen_dia_actual():
     Obtener resumen del día operativo actual
     """
     # Por ahora devolver valores vacíos - conectar después con módulo dias
-    return ResumenDia(
+    return ResumenDia.model_construct(
         fecha=date.today(),
         ventas_completadas=0,
         capital_usado=0.0,
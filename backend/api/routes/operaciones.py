@@ -1,19 +1,125 @@
 """
 Rutas de Operaciones Diarias
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional
 from datetime import datetime
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.db_manager import db
-from core.calculos import calc
+from core.cache import cache
+from api.routes.configuracion import obtener_config_runtime
 
 router = APIRouter()
 
+# Sentencias SQL a nivel de módulo: el mismo texto en cada llamada permite
+# reutilizar la sentencia preparada del cache de la conexión
+
+# v_dia_actual (ver MIGRACIONES en core.db_manager) compone el día abierto del ciclo
+# activo con su cripto; dia-actual y las ventas la leen igual. No necesita ORDER BY:
+# idx_dias_abierto_por_ciclo garantiza un solo día abierto por ciclo
+
+# Día actual y la ganancia de sus ventas en un solo viaje.
+# El CTE elige primero el día, así el LEFT JOIN solo agrega las ventas de ese día.
+# El número de ventas ya viene en dias.ventas_count (lo mantienen los triggers de ventas)
+_SQL_DIA_ACTUAL = """
+    WITH dia AS (
+        SELECT * FROM v_dia_actual LIMIT 1
+    )
+    SELECT dia.*,
+           COALESCE(SUM(v.ganancia_neta), 0) as ganancia
+    FROM dia
+    LEFT JOIN ventas v ON v.dia_id = dia.id
+    GROUP BY dia.id
+"""
+
+_SQL_INSERTAR_DIA = """
+    INSERT INTO dias (
+        ciclo_id, numero_dia, cripto_operada_id,
+        capital_inicial, tasa_compra, comision_pct, ganancia_objetivo_pct,
+        precio_publicado, estado, fecha
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'abierto', datetime('now'))
+    RETURNING id, cantidad_cripto, precio_equilibrio
+"""
+
+# Solo las columnas que registrar_venta usa del día actual
+_SQL_DIA_PARA_VENTA = """
+    SELECT id, cripto_operada_id, tasa_compra
+    FROM v_dia_actual
+    LIMIT 1
+"""
+
+# Totales corrientes del día, como los lleva el CLI (modules/operador.py) en cada venta.
+# Solo mientras el día siga abierto: al cerrarlo se recalculan completos desde ventas
+_SQL_SUMAR_VENTAS_A_DIA = """
+    UPDATE dias SET
+        efectivo_recibido = efectivo_recibido + ?,
+        comisiones_pagadas = comisiones_pagadas + ?,
+        ganancia_bruta = ganancia_bruta + ?,
+        ganancia_neta = ganancia_neta + ?
+    WHERE id = ? AND estado = 'abierto'
+"""
+
+# Cierra el día abierto más reciente con los totales de sus ventas, calculados en el
+# mismo UPDATE. RETURNING devuelve lo necesario para actualizar el ciclo y responder
+_SQL_CERRAR_DIA = """
+    WITH abierto AS (
+        SELECT id FROM dias WHERE estado = 'abierto' ORDER BY id DESC LIMIT 1
+    ),
+    totales AS (
+        SELECT COALESCE(SUM(v.efectivo_recibido), 0) as efectivo,
+               COALESCE(SUM(v.comision), 0) as comision,
+               COALESCE(SUM(v.ganancia_bruta), 0) as ganancia_bruta,
+               COALESCE(SUM(v.ganancia_neta), 0) as ganancia
+        FROM ventas v JOIN abierto a ON v.dia_id = a.id
+    )
+    UPDATE dias SET
+        capital_final = totales.efectivo,
+        efectivo_recibido = totales.efectivo,
+        comisiones_pagadas = totales.comision,
+        ganancia_bruta = totales.ganancia_bruta,
+        ganancia_neta = totales.ganancia,
+        estado = 'cerrado',
+        fecha_cierre = datetime('now')
+    FROM totales
+    WHERE dias.id = (SELECT id FROM abierto)
+    RETURNING ciclo_id, capital_inicial, capital_final, ganancia_neta
+"""
+
+_SQL_SUMAR_DIA_A_CICLO = """
+    UPDATE ciclos SET
+        dias_operados = dias_operados + 1,
+        ganancia_total = ganancia_total + ?
+    WHERE id = ?
+"""
+
+# Historial: solo las columnas que usa el modelo Venta, ya con sus nombres (sin JOIN a criptomonedas).
+# El orden por fecha lo resuelven idx_ventas_dia_fecha e idx_ventas_fecha sin ordenar en memoria
+_SQL_VENTAS_DE_DIA = """
+    SELECT id, cantidad, precio_unitario AS precio_venta, monto_venta AS monto_bruto, comision,
+           efectivo_recibido AS monto_neto, ganancia_neta AS ganancia, fecha
+    FROM ventas
+    WHERE dia_id = ?
+    ORDER BY fecha DESC
+    LIMIT ?
+"""
+
+_SQL_ULTIMAS_VENTAS = """
+    SELECT id, cantidad, precio_unitario AS precio_venta, monto_venta AS monto_bruto, comision,
+           efectivo_recibido AS monto_neto, ganancia_neta AS ganancia, fecha
+    FROM ventas
+    ORDER BY fecha DESC
+    LIMIT ?
+"""
+
+_SQL_INSERTAR_VENTA = """
+    INSERT INTO ventas (
+        dia_id, cripto_id, cantidad, precio_unitario,
+        costo_total, monto_venta, comision, efectivo_recibido,
+        ganancia_bruta, ganancia_neta, fecha
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+"""
+
 class IniciarDiaRequest(BaseModel):
     cripto_id: int
     capital_usd: float = Field(..., gt=0, description="Capital en USD a invertir")
@@ -52,297 +158,263 @@ class Venta(BaseModel):
     ganancia: float
     fecha: str
 
+_VENTAS_ADAPTER = TypeAdapter(List[Venta])
+
+# Endpoints
+# Síncronos: corren en el threadpool de FastAPI, así SQLite y la espera del lock de
+# escritura (compartido con las BackgroundTasks) no frenan el event loop.
+# Sin try/except por endpoint: las HTTPException salen tal cual y cualquier otro error
+# lo responde el manejador global de main.py (500 + traza en el log del servidor)
 @router.post("/iniciar-dia")
-async def iniciar_dia(datos: IniciarDiaRequest):
+def iniciar_dia(datos: IniciarDiaRequest):
     """Inicia un nuevo día de operación"""
-    try:
-        with db.get_cursor(commit=True) as cursor:
-            # Verificar ciclo activo
-            cursor.execute("SELECT id FROM ciclos WHERE estado = 'activo' LIMIT 1")
-            ciclo = cursor.fetchone()
-            if not ciclo:
-                raise HTTPException(status_code=400, detail="No hay ciclo activo")
-            
-            ciclo_id = ciclo['id']
-            
-            # Verificar que no hay día abierto
-            cursor.execute("""
-                SELECT id FROM dias WHERE ciclo_id = ? AND estado = 'abierto'
-            """, (ciclo_id,))
-            if cursor.fetchone():
-                raise HTTPException(status_code=400, detail="Ya hay un día abierto")
-            
-            # Verificar cripto
-            cursor.execute("SELECT id, nombre, simbolo FROM criptomonedas WHERE id = ?", (datos.cripto_id,))
-            cripto = cursor.fetchone()
-            if not cripto:
-                raise HTTPException(status_code=404, detail="Criptomoneda no encontrada")
-            
-            # CALCULAR CANTIDAD DE CRIPTO
-            cantidad_cripto = datos.capital_usd / datos.tasa_compra
-            
-            # CALCULAR PRECIO OBJETIVO (para ganancia del 2%)
-            # Meta en USD = capital * 1.02
-            meta_usd = datos.capital_usd * (1 + datos.ganancia_objetivo_pct / 100)
-            
-            # Monto bruto antes de comisión
-            monto_bruto = meta_usd / (1 - datos.comision_pct / 100)
-            
-            # Precio objetivo por cripto
-            precio_objetivo = monto_bruto / cantidad_cripto
-            
-            # CALCULAR PUNTO DE EQUILIBRIO
-            # Para recuperar exactamente el capital invertido
-            equilibrio_bruto = datos.capital_usd / (1 - datos.comision_pct / 100)
-            precio_equilibrio = equilibrio_bruto / cantidad_cripto
-            
-            # Calcular número de día
-            cursor.execute("""
-                SELECT COALESCE(MAX(numero_dia), 0) + 1 as siguiente
-                FROM dias WHERE ciclo_id = ?
-            """, (ciclo_id,))
-            numero_dia = cursor.fetchone()['siguiente']
-            
-            # Insertar día
-            cursor.execute("""
-                INSERT INTO dias (
-                    ciclo_id, numero_dia, cripto_operada_id,
-                    capital_inicial, cantidad_cripto, tasa_compra,
-                    precio_publicado, precio_equilibrio,
-                    estado, fecha
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'abierto', datetime('now'))
-            """, (
-                ciclo_id, numero_dia, datos.cripto_id,
-                datos.capital_usd, cantidad_cripto, datos.tasa_compra,
-                precio_objetivo, precio_equilibrio
-            ))
-            
-            dia_id = cursor.lastrowid
-            
-            return {
-                "success": True,
-                "message": f"Día #{numero_dia} iniciado",
-                "dia_id": dia_id,
-                "numero_dia": numero_dia,
-                "cripto": cripto['nombre'],
-                "capital_usd": datos.capital_usd,
-                "cantidad_cripto": cantidad_cripto,
-                "tasa_compra": datos.tasa_compra,
-                "precio_objetivo": round(precio_objetivo, 8),
-                "precio_equilibrio": round(precio_equilibrio, 8),
-                "ganancia_esperada": round(meta_usd - datos.capital_usd, 2)
-            }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=True) as cursor:
+        # Verificar ciclo activo
+        cursor.execute("SELECT id FROM ciclos WHERE estado = 'activo' LIMIT 1")
+        ciclo = cursor.fetchone()
+        if not ciclo:
+            raise HTTPException(status_code=400, detail="No hay ciclo activo")
+        
+        ciclo_id = ciclo['id']
+        
+        # Verificar que no hay día abierto
+        cursor.execute("""
+            SELECT id FROM dias WHERE ciclo_id = ? AND estado = 'abierto'
+        """, (ciclo_id,))
+        if cursor.fetchone():
+            raise HTTPException(status_code=400, detail="Ya hay un día abierto")
+        
+        # Verificar cripto
+        cursor.execute("SELECT id, nombre, simbolo FROM criptomonedas WHERE id = ?", (datos.cripto_id,))
+        cripto = cursor.fetchone()
+        if not cripto:
+            raise HTTPException(status_code=404, detail="Criptomoneda no encontrada")
+        
+        # CALCULAR PRECIO OBJETIVO (para ganancia del 2%)
+        # Meta en USD = capital * 1.02
+        meta_usd = datos.capital_usd * (1 + datos.ganancia_objetivo_pct / 100)
+        
+        # Monto bruto antes de comisión repartido entre la cripto comprada (capital / tasa)
+        precio_objetivo = datos.tasa_compra * (1 + datos.ganancia_objetivo_pct / 100) / (1 - datos.comision_pct / 100)
+        
+        # cantidad_cripto y precio_equilibrio son columnas generadas: las calcula SQLite
+        
+        # Calcular número de día
+        cursor.execute("""
+            SELECT COALESCE(MAX(numero_dia), 0) + 1 as siguiente
+            FROM dias WHERE ciclo_id = ?
+        """, (ciclo_id,))
+        numero_dia = cursor.fetchone()['siguiente']
+        
+        # Insertar día (RETURNING devuelve los derivados ya calculados)
+        cursor.execute(_SQL_INSERTAR_DIA, (
+            ciclo_id, numero_dia, datos.cripto_id,
+            datos.capital_usd, datos.tasa_compra,
+            datos.comision_pct, datos.ganancia_objetivo_pct,
+            precio_objetivo
+        ))
+        dia = cursor.fetchone()
+        
+        dia_id = dia['id']
+        # RETURNING entrega los REAL de valor entero como int: float() mantiene el tipo de la respuesta
+        cantidad_cripto = float(dia['cantidad_cripto'])
+        precio_equilibrio = float(dia['precio_equilibrio'])
+        
+        resultado = {
+            "success": True,
+            "message": f"Día #{numero_dia} iniciado",
+            "dia_id": dia_id,
+            "numero_dia": numero_dia,
+            "cripto": cripto['nombre'],
+            "capital_usd": datos.capital_usd,
+            "cantidad_cripto": cantidad_cripto,
+            "tasa_compra": datos.tasa_compra,
+            "precio_objetivo": round(precio_objetivo, 8),
+            "precio_equilibrio": round(precio_equilibrio, 8),
+            "ganancia_esperada": round(meta_usd - datos.capital_usd, 2)
+        }
+
+    # Días y ventas alimentan los resúmenes de ciclos y dashboard
+    cache.invalidar("ciclos", "dashboard")
+    return resultado
 
 @router.get("/dia-actual")
-async def get_dia_actual():
+def get_dia_actual():
     """Obtiene el día operativo actual"""
-    try:
-        with db.get_cursor(commit=False) as cursor:
-            cursor.execute("""
-                SELECT d.*, c.nombre as cripto_nombre, c.simbolo as cripto_simbolo
-                FROM dias d
-                JOIN criptomonedas c ON d.cripto_operada_id = c.id
-                WHERE d.estado = 'abierto'
-                ORDER BY d.id DESC LIMIT 1
-            """)
-            dia = cursor.fetchone()
-            
-            if not dia:
-                raise HTTPException(status_code=404, detail="No hay día activo")
-            
-            # Contar ventas
-            cursor.execute("SELECT COUNT(*) as total FROM ventas WHERE dia_id = ?", (dia['id'],))
-            ventas_count = cursor.fetchone()['total']
-            
-            # Calcular ganancia acumulada
-            cursor.execute("""
-                SELECT COALESCE(SUM(ganancia_neta), 0) as ganancia
-                FROM ventas WHERE dia_id = ?
-            """, (dia['id'],))
-            ganancia = cursor.fetchone()['ganancia']
-            
-            return DiaOperativo(
-                id=dia['id'],
-                numero_dia=dia['numero_dia'],
-                ciclo_id=dia['ciclo_id'],
-                cripto_id=dia['cripto_operada_id'],
-                cripto_nombre=dia['cripto_nombre'],
-                cripto_simbolo=dia['cripto_simbolo'],
-                capital_usd=dia['capital_inicial'],
-                cantidad_cripto=dia['cantidad_cripto'],
-                tasa_compra=dia['tasa_compra'],
-                precio_objetivo=dia['precio_publicado'],
-                precio_equilibrio=dia['precio_equilibrio'],
-                ganancia_neta=ganancia,
-                ventas_realizadas=ventas_count,
-                estado=dia['estado'],
-                fecha=dia['fecha']
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=False) as cursor:
+        # Día, cripto, número de ventas y ganancia acumulada en una sola consulta
+        cursor.execute(_SQL_DIA_ACTUAL)
+        dia = cursor.fetchone()
+        
+        if not dia:
+            raise HTTPException(status_code=404, detail="No hay día activo")
+        
+        return DiaOperativo(
+            id=dia['id'],
+            numero_dia=dia['numero_dia'],
+            ciclo_id=dia['ciclo_id'],
+            cripto_id=dia['cripto_operada_id'],
+            cripto_nombre=dia['cripto_nombre'],
+            cripto_simbolo=dia['cripto_simbolo'],
+            capital_usd=dia['capital_inicial'],
+            cantidad_cripto=dia['cantidad_cripto'],
+            tasa_compra=dia['tasa_compra'],
+            precio_objetivo=dia['precio_publicado'],
+            precio_equilibrio=dia['precio_equilibrio'],
+            ganancia_neta=dia['ganancia'],
+            ventas_realizadas=dia['ventas_count'],
+            estado=dia['estado'],
+            fecha=dia['fecha']
+        )
+
+def _fila_venta(dia, datos: RegistrarVentaRequest, comision_pct: float) -> tuple:
+    """Calcula una venta y devuelve los parámetros de _SQL_INSERTAR_VENTA"""
+    # CALCULAR VENTA
+    monto_bruto = datos.cantidad * datos.precio_venta
+    comision = monto_bruto * (comision_pct / 100)
+    monto_neto = monto_bruto - comision
+    
+    # Calcular costo de lo vendido
+    costo = datos.cantidad * dia['tasa_compra']
+    
+    # Ganancia
+    ganancia = monto_neto - costo
+    
+    return (
+        dia['id'], dia['cripto_operada_id'], datos.cantidad, datos.precio_venta,
+        costo, monto_bruto, comision, monto_neto,
+        monto_bruto - costo, ganancia
+    )
+
+def _sumar_ventas_a_dia(filas: List[tuple]):
+    """Suma al día las ventas ya insertadas (tarea en segundo plano, tras responder)"""
+    # Posiciones de la fila: 0 día, 6 comisión, 7 neto, 8 ganancia bruta, 9 ganancia neta
+    with db.get_cursor(commit=True) as cursor:
+        cursor.execute(_SQL_SUMAR_VENTAS_A_DIA, (
+            sum(f[7] for f in filas),
+            sum(f[6] for f in filas),
+            sum(f[8] for f in filas),
+            sum(f[9] for f in filas),
+            filas[0][0]
+        ))
 
 @router.post("/registrar-venta")
-async def registrar_venta(datos: RegistrarVentaRequest):
+def registrar_venta(datos: RegistrarVentaRequest, background: BackgroundTasks):
     """Registra una venta del día actual"""
-    try:
-        with db.get_cursor(commit=True) as cursor:
-            # Obtener día actual
-            cursor.execute("""
-                SELECT d.*, cy.id as ciclo_id
-                FROM dias d
-                JOIN ciclos cy ON d.ciclo_id = cy.id
-                WHERE d.estado = 'abierto' AND cy.estado = 'activo'
-                ORDER BY d.id DESC LIMIT 1
-            """)
-            dia = cursor.fetchone()
-            
-            if not dia:
-                raise HTTPException(status_code=404, detail="No hay día activo")
-            
-            # Obtener comisión de config
-            cursor.execute("SELECT comision_default FROM config WHERE id = 1")
-            config = cursor.fetchone()
-            comision_pct = config['comision_default'] if config else 0.35
-            
-            # CALCULAR VENTA
-            monto_bruto = datos.cantidad * datos.precio_venta
-            comision = monto_bruto * (comision_pct / 100)
-            monto_neto = monto_bruto - comision
-            
-            # Calcular costo de lo vendido
-            costo = datos.cantidad * dia['tasa_compra']
-            
-            # Ganancia
-            ganancia = monto_neto - costo
-            
-            # Insertar venta
-            cursor.execute("""
-                INSERT INTO ventas (
-                    dia_id, cripto_id, cantidad, precio_unitario,
-                    costo_total, monto_venta, comision, efectivo_recibido,
-                    ganancia_bruta, ganancia_neta, fecha
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-            """, (
-                dia['id'], dia['cripto_operada_id'], datos.cantidad, datos.precio_venta,
-                costo, monto_bruto, comision, monto_neto,
-                monto_bruto - costo, ganancia
-            ))
-            
-            return {
-                "success": True,
-                "message": "Venta registrada",
-                "cantidad": datos.cantidad,
-                "precio_venta": datos.precio_venta,
-                "monto_bruto": round(monto_bruto, 2),
-                "comision": round(comision, 2),
-                "monto_neto": round(monto_neto, 2),
-                "ganancia": round(ganancia, 2)
-            }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    # Comisión del snapshot de configuración en memoria: se lee de la BD una vez
+    # y configuracion.py lo reemplaza al guardar cambios, sin SELECT por venta
+    comision_pct = obtener_config_runtime().comision_defecto
+    
+    with db.get_cursor(commit=True) as cursor:
+        # Obtener día actual
+        cursor.execute(_SQL_DIA_PARA_VENTA)
+        dia = cursor.fetchone()
+        
+        if not dia:
+            raise HTTPException(status_code=404, detail="No hay día activo")
+        
+        fila = _fila_venta(dia, datos, comision_pct)
+        _, _, _, _, _, monto_bruto, comision, monto_neto, _, ganancia = fila
+        
+        # Insertar venta (los totales del día se calculan al cerrarlo)
+        cursor.execute(_SQL_INSERTAR_VENTA, fila)
+        
+        # Valores sin redondear: el frontend los formatea al mostrarlos
+        resultado = {
+            "success": True,
+            "message": "Venta registrada",
+            "cantidad": datos.cantidad,
+            "precio_venta": datos.precio_venta,
+            "monto_bruto": monto_bruto,
+            "comision": comision,
+            "monto_neto": monto_neto,
+            "ganancia": ganancia
+        }
+
+    # Los totales del día son contabilidad: la venta ya quedó registrada
+    background.add_task(_sumar_ventas_a_dia, [fila])
+    
+    # Días y ventas alimentan los resúmenes de ciclos y dashboard
+    cache.invalidar("ciclos", "dashboard")
+    return resultado
+
+@router.post("/registrar-ventas-batch")
+def registrar_ventas_batch(ventas: List[RegistrarVentaRequest], background: BackgroundTasks):
+    """Registra varias ventas del día actual en una sola transacción"""
+    if not ventas:
+        raise HTTPException(status_code=400, detail="No hay ventas para registrar")
+    
+    comision_pct = obtener_config_runtime().comision_defecto
+    
+    with db.get_cursor(commit=True) as cursor:
+        # El día se busca una vez para todo el lote
+        cursor.execute(_SQL_DIA_PARA_VENTA)
+        dia = cursor.fetchone()
+        
+        if not dia:
+            raise HTTPException(status_code=404, detail="No hay día activo")
+        
+        filas = [_fila_venta(dia, datos, comision_pct) for datos in ventas]
+        
+        # Una sentencia preparada y un solo commit para N ventas
+        cursor.executemany(_SQL_INSERTAR_VENTA, filas)
+        
+        # Totales del lote (posiciones de la fila: 5 bruto, 6 comisión, 7 neto, 9 ganancia)
+        resultado = {
+            "success": True,
+            "message": f"{len(filas)} ventas registradas",
+            "ventas_registradas": len(filas),
+            "monto_bruto": sum(f[5] for f in filas),
+            "comision": sum(f[6] for f in filas),
+            "monto_neto": sum(f[7] for f in filas),
+            "ganancia": sum(f[9] for f in filas)
+        }
+
+    # Los totales del día son contabilidad: las ventas ya quedaron registradas
+    background.add_task(_sumar_ventas_a_dia, filas)
+    
+    # Días y ventas alimentan los resúmenes de ciclos y dashboard
+    cache.invalidar("ciclos", "dashboard")
+    return resultado
 
 @router.post("/cerrar-dia")
-async def cerrar_dia():
+def cerrar_dia():
     """Cierra el día actual"""
-    try:
-        with db.get_cursor(commit=True) as cursor:
-            cursor.execute("SELECT * FROM dias WHERE estado = 'abierto' ORDER BY id DESC LIMIT 1")
-            dia = cursor.fetchone()
-            
-            if not dia:
-                raise HTTPException(status_code=404, detail="No hay día activo")
-            
-            # Calcular totales
-            cursor.execute("""
-                SELECT 
-                    COALESCE(SUM(efectivo_recibido), 0) as total_efectivo,
-                    COALESCE(SUM(comision), 0) as total_comision,
-                    COALESCE(SUM(ganancia_neta), 0) as total_ganancia
-                FROM ventas WHERE dia_id = ?
-            """, (dia['id'],))
-            totales = cursor.fetchone()
-            
-            capital_final = totales['total_efectivo']
-            
-            # Actualizar día
-            cursor.execute("""
-                UPDATE dias SET
-                    capital_final = ?,
-                    efectivo_recibido = ?,
-                    comisiones_pagadas = ?,
-                    ganancia_neta = ?,
-                    estado = 'cerrado',
-                    fecha_cierre = datetime('now')
-                WHERE id = ?
-            """, (
-                capital_final,
-                totales['total_efectivo'],
-                totales['total_comision'],
-                totales['total_ganancia'],
-                dia['id']
-            ))
-            
-            # Actualizar ciclo
-            cursor.execute("""
-                UPDATE ciclos SET
-                    dias_operados = dias_operados + 1,
-                    ganancia_total = ganancia_total + ?
-                WHERE id = ?
-            """, (totales['total_ganancia'], dia['ciclo_id']))
-            
-            return {
-                "success": True,
-                "message": "Día cerrado",
-                "capital_inicial": dia['capital_inicial'],
-                "capital_final": capital_final,
-                "ganancia": totales['total_ganancia']
-            }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=True) as cursor:
+        # Totales y cierre del día en una sola sentencia (sin fila = no hay día abierto)
+        cursor.execute(_SQL_CERRAR_DIA)
+        dia = cursor.fetchone()
+        
+        if not dia:
+            raise HTTPException(status_code=404, detail="No hay día activo")
+        
+        # RETURNING entrega los REAL de valor entero como int: float() mantiene el tipo de la respuesta
+        ganancia = float(dia['ganancia_neta'])
+        
+        # Actualizar ciclo
+        cursor.execute(_SQL_SUMAR_DIA_A_CICLO, (ganancia, dia['ciclo_id']))
+        
+        resultado = {
+            "success": True,
+            "message": "Día cerrado",
+            "capital_inicial": float(dia['capital_inicial']),
+            "capital_final": float(dia['capital_final']),
+            "ganancia": ganancia
+        }
+
+    # Días y ventas alimentan los resúmenes de ciclos y dashboard
+    cache.invalidar("ciclos", "dashboard")
+    return resultado
 
 @router.get("/historial-ventas")
-async def get_historial_ventas(dia_id: Optional[int] = None, limite: int = 50):
+def get_historial_ventas(dia_id: Optional[int] = None, limite: int = 50):
     """Obtiene el historial de ventas"""
-    try:
-        with db.get_cursor(commit=False) as cursor:
-            if dia_id:
-                cursor.execute("""
-                    SELECT v.*, c.nombre as cripto_nombre, c.simbolo as cripto_simbolo
-                    FROM ventas v
-                    JOIN criptomonedas c ON v.cripto_id = c.id
-                    WHERE v.dia_id = ?
-                    ORDER BY v.fecha DESC
-                """, (dia_id,))
-            else:
-                cursor.execute("""
-                    SELECT v.*, c.nombre as cripto_nombre, c.simbolo as cripto_simbolo
-                    FROM ventas v
-                    JOIN criptomonedas c ON v.cripto_id = c.id
-                    ORDER BY v.fecha DESC
-                    LIMIT ?
-                """, (limite,))
-            
-            ventas = cursor.fetchall()
-            
-            return [Venta(
-                id=v['id'],
-                cantidad=v['cantidad'],
-                precio_venta=v['precio_unitario'],
-                monto_bruto=v['monto_venta'],
-                comision=v['comision'],
-                monto_neto=v['efectivo_recibido'],
-                ganancia=v['ganancia_neta'],
-                fecha=v['fecha']
-            ) for v in ventas]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    with db.get_cursor(commit=False) as cursor:
+        # El límite se aplica también al filtrar por día
+        if dia_id:
+            cursor.execute(_SQL_VENTAS_DE_DIA, (dia_id, limite))
+        else:
+            cursor.execute(_SQL_ULTIMAS_VENTAS, (limite,))
+        
+        # Las columnas ya tienen los nombres del modelo: se valida toda la lista de una vez
+        return _VENTAS_ADAPTER.validate_python([dict(row) for row in cursor.fetchall()])
@@ -1,10 +1,15 @@
 """
 Configuración centralizada del sistema
 """
-from pydantic_settings import BaseSettings
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
+import os
 
-class Settings(BaseSettings):
+from dotenv import load_dotenv
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     # Información del proyecto
     PROJECT_NAME: str = "Sistema de Arbitraje P2P"
     VERSION: str = "1.0.0"
@@ -27,13 +32,26 @@ class Settings(BaseSettings):
     GANANCIA_OBJETIVO_DEFECTO: float = 2.0
     MIN_VENTAS_DIA: int = 5
     MAX_VENTAS_DIA: int = 8
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Construye la configuración una sola vez: valores por defecto,
+    sobrescritos por el archivo .env y por las variables de entorno
+    """
+    # load_dotenv no pisa variables ya definidas: el entorno tiene prioridad sobre .env
+    load_dotenv(".env")
+    
+    valores = {}
+    for campo in fields(Settings):
+        valor = os.environ.get(campo.name)
+        if valor is not None:
+            valores[campo.name] = campo.type(valor)
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    return Settings(**valores)
 
 # Instancia global
-settings = Settings()
+settings = get_settings()
 
 # Función para crear directorios
 def init_directories():
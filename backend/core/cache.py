@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+MÓDULO DE CACHE
+=============================================================================
+Cache en memoria con expiración (TTL) para resultados de lectura
+Agrupado por namespace para poder invalidar solo lo que cambió
+"""
+
+import inspect
+import threading
+from functools import wraps
+from typing import Any, Callable
+
+from cachetools import TTLCache
+
+
+# ===================================================================
+# CONFIGURACIÓN
+# ===================================================================
+
+CACHE_MAXSIZE = 256
+CACHE_TTL = 5  # segundos: acota cuánto puede durar un dato desactualizado
+
+
+# ===================================================================
+# CLASE CACHE
+# ===================================================================
+
+class CacheRespuestas:
+    """Cache TTL compartido por los endpoints de solo lectura"""
+
+    def __init__(self, maxsize: int = CACHE_MAXSIZE, ttl: float = CACHE_TTL):
+        """
+        Inicializa el cache
+
+        Args:
+            maxsize: Número máximo de entradas (evita crecer sin límite)
+            ttl: Segundos que vive cada entrada
+        """
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # TTLCache no es thread-safe y los endpoints corren en el threadpool
+        self._lock = threading.Lock()
+
+    def obtener(self, namespace: str, clave: tuple, calcular: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor cacheado o lo calcula y lo guarda
+
+        Args:
+            namespace: Grupo al que pertenece la entrada
+            clave: Identificador de la entrada dentro del grupo
+            calcular: Función que produce el valor si no está en cache
+
+        Returns:
+            El valor cacheado o recién calculado
+        """
+        clave_completa = (namespace, clave)
+
+        with self._lock:
+            if clave_completa in self._cache:
+                return self._cache[clave_completa]
+
+        # Calcular fuera del lock: en el peor caso dos hilos calculan lo mismo
+        valor = calcular()
+
+        with self._lock:
+            self._cache[clave_completa] = valor
+
+        return valor
+
+    def invalidar(self, *namespaces: str):
+        """
+        Elimina entradas del cache
+
+        Args:
+            namespaces: Grupos a invalidar (ninguno = todo el cache)
+        """
+        with self._lock:
+            if not namespaces:
+                self._cache.clear()
+                return
+
+            for clave in [c for c in self._cache if c[0] in namespaces]:
+                del self._cache[clave]
+
+    def cacheado(self, namespace: str):
+        """
+        Decorador para cachear el resultado de una función (síncrona o async)
+
+        Args:
+            namespace: Grupo bajo el que se guardan los resultados
+
+        Example:
+            @router.get("/resumen")
+            @cache.cacheado("boveda")
+            def get_resumen(): ...
+        """
+        def decorador(func):
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def wrapper_async(*args, **kwargs):
+                    # Se cachea el resultado ya esperado, nunca la corrutina
+                    clave_completa = (namespace, (func.__name__, args, tuple(sorted(kwargs.items()))))
+                    with self._lock:
+                        if clave_completa in self._cache:
+                            return self._cache[clave_completa]
+
+                    valor = await func(*args, **kwargs)
+
+                    with self._lock:
+                        self._cache[clave_completa] = valor
+                    return valor
+                return wrapper_async
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                clave = (func.__name__, args, tuple(sorted(kwargs.items())))
+                return self.obtener(namespace, clave, lambda: func(*args, **kwargs))
+            return wrapper
+        return decorador
+
+
+# ===================================================================
+# INSTANCIA GLOBAL
+# ===================================================================
+
+cache = CacheRespuestas()
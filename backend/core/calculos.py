@@ -7,7 +7,166 @@ Todas las fórmulas y cálculos del sistema
 Completamente independiente de la BD
 """
 
-from typing import Dict, List, Tuple, Optional
+import os
+import sys
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple, Optional
+
+# Ejecutado como script (python core/calculos.py) no hay paquete: backend/ al path para importar core.*
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# NumPy es opcional: el CLI funciona sin dependencias externas y cae a la suma en Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core.jit import nucleo
+
+
+# ===================================================================
+# NÚCLEOS NUMÉRICOS
+# ===================================================================
+# Funciones de módulo (no métodos) para que Numba las compile a código máquina.
+# Con firma explícita se compilan al importar y se guardan en disco (ver core.jit.nucleo).
+# Los valores por defecto (comisión 0.35) los resuelven los métodos de Calculadora:
+# los núcleos reciben siempre todos los argumentos y basta una firma por función.
+# Nada se redondea aquí: los valores conservan toda su precisión en los cálculos encadenados
+# y se redondean solo al mostrarlos (f"{x:.2f}" en el CLI, toFixed(2) en el frontend)
+
+class ResultadoVenta(NamedTuple):
+    """Valores de una venta, en el orden en que los devuelve _venta"""
+    cantidad: float
+    costo_unitario: float
+    precio_venta: float
+    costo_total: float
+    monto_venta: float
+    comision_pct: float
+    comision: float
+    efectivo_recibido: float
+    ganancia_bruta: float
+    ganancia_neta: float
+
+
+CAMPOS_VENTA = ResultadoVenta._fields
+
+# Valores calculados (sin los datos de entrada) que devuelve calcular_ventas_batch
+CAMPOS_VENTA_BATCH = CAMPOS_VENTA[3:5] + CAMPOS_VENTA[6:]
+
+
+@nucleo('f8(f8, f8, f8)')
+def _precio_sugerido(costo_promedio, ganancia_objetivo_pct, comision_pct):
+    if costo_promedio <= 0:
+        return 0.0
+    
+    # Fórmula: precio_venta = costo / (1 - (comision + ganancia)/100)
+    factor = (comision_pct + ganancia_objetivo_pct) / 100
+    
+    if factor >= 1:
+        return 0.0  # Imposible con estos parámetros
+    
+    return costo_promedio / (1 - factor)
+
+
+@nucleo('f8(f8, f8, f8)')
+def _ganancia_neta_factor(costo_promedio, precio_venta, factor_efectivo):
+    if costo_promedio <= 0 or precio_venta <= 0:
+        return 0.0
+    
+    # Efectivo recibido después de comisión (factor_efectivo = 1 - comisión)
+    efectivo_recibido = precio_venta * factor_efectivo
+    ganancia_neta = efectivo_recibido - costo_promedio
+    
+    return (ganancia_neta / costo_promedio) * 100
+
+
+@nucleo('f8(f8, f8, f8)')
+def _ganancia_neta_pct(costo_promedio, precio_venta, comision_pct):
+    return _ganancia_neta_factor(costo_promedio, precio_venta, 1 - comision_pct / 100)
+
+
+@nucleo('UniTuple(f8, 10)(f8, f8, f8, f8)')
+def _venta(cantidad, costo_unitario, precio_venta, comision_pct):
+    # Valores base
+    costo_total = cantidad * costo_unitario
+    monto_venta = cantidad * precio_venta
+    
+    # Comisión y efectivo recibido
+    comision = monto_venta * (comision_pct / 100)
+    efectivo_recibido = monto_venta - comision
+    
+    # Ganancias
+    ganancia_bruta = monto_venta - costo_total
+    ganancia_neta = efectivo_recibido - costo_total
+    
+    return (cantidad, costo_unitario, precio_venta,
+            costo_total, monto_venta, comision_pct,
+            comision, efectivo_recibido,
+            ganancia_bruta, ganancia_neta)
+
+
+@nucleo('f8(f8, f8, f8, f8)')
+def _promedio_ponderado(cantidad_anterior, precio_anterior, cantidad_nueva, precio_nuevo):
+    cantidad_total = cantidad_anterior + cantidad_nueva
+    if cantidad_total == 0:
+        return 0.0
+    
+    costo_total = cantidad_anterior * precio_anterior + cantidad_nueva * precio_nuevo
+    
+    return costo_total / cantidad_total
+
+
+@nucleo('f8(f8, f8)')
+def _roi(ganancia, inversion):
+    if inversion <= 0:
+        return 0.0
+    
+    return (ganancia / inversion) * 100
+
+
+# ===================================================================
+# CACHE DE FUNCIONES PURAS
+# ===================================================================
+# Precio sugerido y validación de precio se piden una y otra vez con los mismos
+# argumentos (costo y comisión fijos durante el día). Los floats se cuantizan a enteros
+# con 8 decimales, la precisión de las cantidades de cripto: así 0.1 + 0.2 y 0.3
+# comparten entrada y precios de monedas muy baratas no se confunden entre sí
+
+ESCALA_CACHE = 10 ** 8
+TAMAÑO_CACHE = 4096
+
+
+def _cuantizar(valor: float) -> int:
+    """Convierte un float en la clave entera estable que usa el cache"""
+    return int(round(valor * ESCALA_CACHE))
+
+
+@lru_cache(maxsize=TAMAÑO_CACHE)
+def _precio_sugerido_cacheado(costo_promedio: int, ganancia_objetivo_pct: int,
+                              comision_pct: int) -> float:
+    return _precio_sugerido(costo_promedio / ESCALA_CACHE,
+                            ganancia_objetivo_pct / ESCALA_CACHE,
+                            comision_pct / ESCALA_CACHE)
+
+
+@lru_cache(maxsize=TAMAÑO_CACHE)
+def _validar_precio_rentable_cacheado(costo: int, precio_venta: int, comision_pct: int,
+                                      ganancia_minima_pct: int) -> Tuple[bool, str]:
+    if costo <= 0 or precio_venta <= 0:
+        return False, "Valores inválidos"
+    
+    ganancia = _ganancia_neta_pct(costo / ESCALA_CACHE, precio_venta / ESCALA_CACHE,
+                                  comision_pct / ESCALA_CACHE)
+    ganancia_minima = ganancia_minima_pct / ESCALA_CACHE
+    
+    if ganancia < 0:
+        return False, f"Pérdida de {abs(ganancia):.2f}%"
+    
+    if ganancia < ganancia_minima:
+        return False, f"Ganancia muy baja: {ganancia:.2f}% (mínimo: {ganancia_minima}%)"
+    
+    return True, f"Rentable: {ganancia:.2f}%"
 
 
 class Calculadora:
@@ -32,18 +191,9 @@ class Calculadora:
         Returns:
             float: Precio sugerido de venta
         """
-        if costo_promedio <= 0:
-            return 0
-        
-        # Fórmula: precio_venta = costo / (1 - (comision + ganancia)/100)
-        factor = (comision_pct + ganancia_objetivo_pct) / 100
-        
-        if factor >= 1:
-            return 0  # Imposible con estos parámetros
-        
-        precio_sugerido = costo_promedio / (1 - factor)
-        
-        return round(precio_sugerido, 4)
+        return _precio_sugerido_cacheado(_cuantizar(costo_promedio),
+                                         _cuantizar(ganancia_objetivo_pct),
+                                         _cuantizar(comision_pct))
     
     @staticmethod
     def calcular_ganancia_neta_estimada(costo_promedio: float,
@@ -60,20 +210,7 @@ class Calculadora:
         Returns:
             float: Ganancia neta en %
         """
-        if costo_promedio <= 0 or precio_venta <= 0:
-            return 0
-        
-        # Efectivo recibido después de comisión
-        comision_decimal = comision_pct / 100
-        efectivo_recibido = precio_venta * (1 - comision_decimal)
-        
-        # Ganancia neta
-        ganancia_neta = efectivo_recibido - costo_promedio
-        
-        # Porcentaje
-        ganancia_neta_pct = (ganancia_neta / costo_promedio) * 100
-        
-        return round(ganancia_neta_pct, 2)
+        return _ganancia_neta_pct(costo_promedio, precio_venta, comision_pct)
     
     # ===================================================================
     # CÁLCULOS DE VENTAS
@@ -83,7 +220,7 @@ class Calculadora:
     def calcular_venta(cantidad: float,
                       costo_unitario: float,
                       precio_venta: float,
-                      comision_pct: float = 0.35) -> Optional[Dict]:
+                      comision_pct: float = 0.35) -> Optional[ResultadoVenta]:
         """
         Calcula todos los valores de una venta
         
@@ -94,37 +231,53 @@ class Calculadora:
             comision_pct: Comisión de la plataforma
         
         Returns:
-            dict: Todos los valores calculados
+            ResultadoVenta: Todos los valores calculados (._asdict() para serializarlo)
         """
         if cantidad <= 0 or costo_unitario <= 0 or precio_venta <= 0:
             return None
         
-        # Valores base
-        costo_total = cantidad * costo_unitario
-        monto_venta = cantidad * precio_venta
+        return ResultadoVenta._make(_venta(cantidad, costo_unitario, precio_venta, comision_pct))
+    
+    @staticmethod
+    def calcular_ventas_batch(cantidades: Sequence[float],
+                              costos_unitarios: Sequence[float],
+                              precios_venta: Sequence[float],
+                              comision_pct: float = 0.35) -> Dict[str, Sequence[float]]:
+        """
+        Calcula los valores de muchas ventas de una vez (importaciones, recálculo de reportes)
         
-        # Comisión
-        comision_decimal = comision_pct / 100
-        comision = monto_venta * comision_decimal
+        No valida cada fila: se espera que vengan de ventas ya registradas o validadas
         
-        # Efectivo recibido
-        efectivo_recibido = monto_venta - comision
+        Args:
+            cantidades: Cantidad vendida en cada venta
+            costos_unitarios: Costo por unidad de cada venta
+            precios_venta: Precio de venta por unidad de cada venta
+            comision_pct: Comisión de la plataforma (la misma para todo el lote)
         
-        # Ganancias
-        ganancia_bruta = monto_venta - costo_total
-        ganancia_neta = efectivo_recibido - costo_total
+        Returns:
+            dict: Un array por valor calculado (mismos nombres que en ResultadoVenta)
+        """
+        if np is None:
+            filas = [_venta(c, cu, pv, comision_pct)
+                     for c, cu, pv in zip(cantidades, costos_unitarios, precios_venta)]
+            columnas = list(zip(*filas)) or [()] * len(CAMPOS_VENTA)
+            venta = dict(zip(CAMPOS_VENTA, columnas))
+            return {campo: list(venta[campo]) for campo in CAMPOS_VENTA_BATCH}
+        
+        # Una operación por columna sobre todo el lote en lugar de una llamada por venta
+        cantidad = np.asarray(cantidades, dtype=np.float64)
+        costo_total = cantidad * np.asarray(costos_unitarios, dtype=np.float64)
+        monto_venta = cantidad * np.asarray(precios_venta, dtype=np.float64)
+        comision = monto_venta * (comision_pct / 100)
+        efectivo_recibido = monto_venta - comision
         
         return {
-            'cantidad': cantidad,
-            'costo_unitario': costo_unitario,
-            'precio_venta': precio_venta,
-            'costo_total': round(costo_total, 2),
-            'monto_venta': round(monto_venta, 2),
-            'comision_pct': comision_pct,
-            'comision': round(comision, 2),
-            'efectivo_recibido': round(efectivo_recibido, 2),
-            'ganancia_bruta': round(ganancia_bruta, 2),
-            'ganancia_neta': round(ganancia_neta, 2)
+            'costo_total': costo_total,
+            'monto_venta': monto_venta,
+            'comision': comision,
+            'efectivo_recibido': efectivo_recibido,
+            'ganancia_bruta': monto_venta - costo_total,
+            'ganancia_neta': efectivo_recibido - costo_total
         }
     
     # ===================================================================
@@ -132,21 +285,41 @@ class Calculadora:
     # ===================================================================
     
     @staticmethod
-    def calcular_capital_total(criptos: List[Tuple[str, float, float]]) -> float:
+    def calcular_capital_total(cantidades: Sequence[float], precios: Sequence[float]) -> float:
         """
         Calcula el capital total en USD
         
+        Args:
+            cantidades: Cantidad de cada cripto
+            precios: Precio unitario de cada cripto (mismo orden que cantidades)
+        
+        Returns:
+            float: Capital total en USD
+        """
+        if np is not None:
+            # Un solo producto escalar sobre dos arrays contiguos en lugar de un bucle por cripto
+            total = float(np.dot(np.asarray(cantidades, dtype=np.float64),
+                                 np.asarray(precios, dtype=np.float64)))
+        else:
+            total = sum(cantidad * precio for cantidad, precio in zip(cantidades, precios))
+        
+        return total
+    
+    @staticmethod
+    def calcular_capital_total_criptos(criptos: List[Tuple[str, float, float]]) -> float:
+        """
+        Calcula el capital total en USD a partir de tuplas por cripto
+        
         Args:
             criptos: Lista de tuplas (nombre, cantidad, precio_unitario)
         
         Returns:
             float: Capital total en USD
         """
-        total = 0
-        for nombre, cantidad, precio in criptos:
-            total += cantidad * precio
+        cantidades = [cantidad for _, cantidad, _ in criptos]
+        precios = [precio for _, _, precio in criptos]
         
-        return round(total, 2)
+        return Calculadora.calcular_capital_total(cantidades, precios)
     
     @staticmethod
     def calcular_promedio_ponderado(cantidad_anterior: float,
@@ -165,16 +338,7 @@ class Calculadora:
         Returns:
             float: Nuevo precio promedio ponderado
         """
-        if cantidad_anterior + cantidad_nueva == 0:
-            return 0
-        
-        costo_anterior = cantidad_anterior * precio_anterior
-        costo_nuevo = cantidad_nueva * precio_nuevo
-        cantidad_total = cantidad_anterior + cantidad_nueva
-        
-        promedio = (costo_anterior + costo_nuevo) / cantidad_total
-        
-        return round(promedio, 4)
+        return _promedio_ponderado(cantidad_anterior, precio_anterior, cantidad_nueva, precio_nuevo)
     
     # ===================================================================
     # CÁLCULOS DE ROI
@@ -192,12 +356,7 @@ class Calculadora:
         Returns:
             float: ROI en porcentaje
         """
-        if inversion <= 0:
-            return 0
-        
-        roi = (ganancia / inversion) * 100
-        
-        return round(roi, 2)
+        return _roi(ganancia, inversion)
     
     @staticmethod
     def calcular_roi_diario_promedio(roi_total: float, dias: int) -> float:
@@ -214,7 +373,7 @@ class Calculadora:
         if dias <= 0:
             return 0
         
-        return round(roi_total / dias, 2)
+        return roi_total / dias
     
     # ===================================================================
     # VALIDACIONES
@@ -237,20 +396,43 @@ class Calculadora:
         Returns:
             tuple: (es_rentable, mensaje)
         """
-        if costo <= 0 or precio_venta <= 0:
-            return False, "Valores inválidos"
-        
-        ganancia = Calculadora.calcular_ganancia_neta_estimada(
-            costo, precio_venta, comision_pct
-        )
+        return _validar_precio_rentable_cacheado(_cuantizar(costo), _cuantizar(precio_venta),
+                                                 _cuantizar(comision_pct),
+                                                 _cuantizar(ganancia_minima_pct))
+
+
+class CalculadoraVenta:
+    """
+    Cálculos de venta con una comisión fija (la del día)
+    
+    La fracción que llega como efectivo (1 - comisión) se calcula una sola vez al crearla,
+    no en cada precio evaluado. Pensada para bucles que prueban muchos precios
+    """
+    
+    __slots__ = ('comision_pct', '_factor_efectivo')
+    
+    def __init__(self, comision_pct: float = 0.35):
+        """
+        Inicializa la calculadora
         
-        if ganancia < 0:
-            return False, f"Pérdida de {abs(ganancia):.2f}%"
+        Args:
+            comision_pct: Comisión de la plataforma en %
+        """
+        self.comision_pct = comision_pct
+        self._factor_efectivo = 1 - comision_pct / 100
+    
+    def ganancia_neta_pct(self, costo_promedio: float, precio_venta: float) -> float:
+        """
+        Calcula ganancia neta estimada en porcentaje
         
-        if ganancia < ganancia_minima_pct:
-            return False, f"Ganancia muy baja: {ganancia:.2f}% (mínimo: {ganancia_minima_pct}%)"
+        Args:
+            costo_promedio: Costo promedio de compra
+            precio_venta: Precio de venta publicado
         
-        return True, f"Rentable: {ganancia:.2f}%"
+        Returns:
+            float: Ganancia neta en % (igual que Calculadora.calcular_ganancia_neta_estimada)
+        """
+        return _ganancia_neta_factor(costo_promedio, precio_venta, self._factor_efectivo)
 
 
 # ===================================================================
@@ -284,28 +466,38 @@ if __name__ == "__main__":
     ganancia = calc.calcular_ganancia_neta_estimada(costo, precio_venta)
     print(f"   Costo: ${costo}")
     print(f"   Precio venta: ${precio_venta}")
-    print(f"   Ganancia neta: {ganancia}%")
+    print(f"   Ganancia neta: {ganancia:.2f}%")
     
     # Test 3: Cálculo de venta
     print("\n[Test 3] Cálculo completo de venta:")
     venta = calc.calcular_venta(100, 1.0, 1.0235)
     if venta:
-        print(f"   Cantidad: {venta['cantidad']}")
-        print(f"   Costo total: ${venta['costo_total']:.2f}")
-        print(f"   Monto venta: ${venta['monto_venta']:.2f}")
-        print(f"   Comisión: ${venta['comision']:.2f}")
-        print(f"   Efectivo recibido: ${venta['efectivo_recibido']:.2f}")
-        print(f"   Ganancia neta: ${venta['ganancia_neta']:.2f}")
-    
-    # Test 4: ROI
-    print("\n[Test 4] Cálculo de ROI:")
+        print(f"   Cantidad: {venta.cantidad}")
+        print(f"   Costo total: ${venta.costo_total:.2f}")
+        print(f"   Monto venta: ${venta.monto_venta:.2f}")
+        print(f"   Comisión: ${venta.comision:.2f}")
+        print(f"   Efectivo recibido: ${venta.efectivo_recibido:.2f}")
+        print(f"   Ganancia neta: ${venta.ganancia_neta:.2f}")
+    
+    # Test 4: Lote de ventas
+    print("\n[Test 4] Lote de ventas:")
+    lote = calc.calcular_ventas_batch([100, 50], [1.0, 1.0], [1.0235, 1.03])
+    print(f"   Ganancia neta: {[f'{g:.2f}' for g in lote['ganancia_neta']]}")
+    
+    # Test 5: Capital total
+    print("\n[Test 5] Capital total:")
+    capital = calc.calcular_capital_total([100, 0.01], [1.0, 50000])
+    print(f"   Capital: ${capital:.2f} ({'NumPy' if np is not None else 'Python'})")
+    
+    # Test 6: ROI
+    print("\n[Test 6] Cálculo de ROI:")
     roi = calc.calcular_roi(200, 1000)
     print(f"   Ganancia: $200")
     print(f"   Inversión: $1000")
-    print(f"   ROI: {roi}%")
+    print(f"   ROI: {roi:.2f}%")
     
-    # Test 5: Validación
-    print("\n[Test 5] Validar precio rentable:")
+    # Test 7: Validación
+    print("\n[Test 7] Validar precio rentable:")
     rentable, mensaje = calc.validar_precio_rentable(1.0, 1.0235)
     print(f"   {'✅' if rentable else '❌'} {mensaje}")
     
@@ -6,10 +6,17 @@ GESTOR DE BASE DE DATOS v3.0
 Gestor centralizado y seguro de conexiones a SQLite
 """
 
+import atexit
+import queue
 import sqlite3
+import threading
+import warnings
+from collections import namedtuple
 from contextlib import contextmanager
+from functools import lru_cache
+from datetime import date
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 
 # ===================================================================
@@ -18,6 +25,199 @@ from typing import Optional, List, Dict, Any
 
 DB_FILE = 'data/arbitraje.db'
 
+# Conexiones abiertas que se mantienen vivas para reutilizarse entre llamadas
+POOL_SIZE = 8
+
+# Filas que execute_query_iter pide a SQLite por cada fetchmany
+FILAS_POR_LOTE = 256
+
+# Sentencias preparadas que cada conexión guarda para reutilizar (LRU por texto SQL)
+# Holgado frente a las ~50 constantes _SQL_* de la API y Queries más las consultas de
+# los módulos del CLI: ninguna sentencia frecuente llega a desalojarse y volver a prepararse
+CACHED_STATEMENTS = 512
+
+# Ajustes de rendimiento aplicados a cada conexión nueva
+MMAP_SIZE = 256 * 1024 * 1024  # bytes
+# Por debajo de este tamaño la BD cabe entera en la cache de páginas y mmap no aporta
+MMAP_MIN_ARCHIVO = 4 * 1024 * 1024  # bytes
+
+# Archivos auxiliares del modo WAL junto a la BD: un backup o una restauración
+# que copie solo el .db pierde (o mezcla) lo que aún no pasó del -wal al archivo principal
+SUFIJOS_WAL = ("-wal", "-shm")
+CACHE_SIZE_KIB = -65536  # negativo = tamaño en KiB, no en páginas (64 MiB)
+
+# Migraciones de esquema para bases ya creadas con inicializar_bd.py
+# Se aplican en orden y una sola vez: PRAGMA user_version guarda cuántas van aplicadas.
+# Solo se agregan al final, nunca se reordenan ni se editan las ya publicadas.
+# Cada una es una sentencia o una tupla de sentencias que se ejecutan en orden.
+
+# Día abierto que no es el más reciente de su ciclo (ver idx_dias_abierto_por_ciclo)
+_DIA_ABIERTO_DUPLICADO = """
+    dias.estado = 'abierto' AND dias.id < (
+        SELECT MAX(d2.id) FROM dias d2
+        WHERE d2.ciclo_id = dias.ciclo_id AND d2.estado = 'abierto'
+    )
+"""
+
+MIGRACIONES = [
+    ("idx_ciclos_estado", "CREATE INDEX IF NOT EXISTS idx_ciclos_estado ON ciclos(estado)"),
+    # Cubre mejor/peor día y promedios por ciclo sin leer la tabla dias
+    ("idx_dias_ciclo_estado", "CREATE INDEX IF NOT EXISTS idx_dias_ciclo_estado ON dias(ciclo_id, estado, ganancia_neta)"),
+    ("idx_ventas_dia_fecha", "CREATE INDEX IF NOT EXISTS idx_ventas_dia_fecha ON ventas(dia_id, fecha)"),
+    # Contador de ventas por ciclo mantenido por triggers (evita COUNT + JOIN en cada lectura)
+    ("ciclos_ventas_totales", "ALTER TABLE ciclos ADD COLUMN ventas_totales INTEGER NOT NULL DEFAULT 0"),
+    ("ciclos_ventas_totales_inicial", """
+        UPDATE ciclos SET ventas_totales = (
+            SELECT COUNT(*) FROM ventas v JOIN dias d ON v.dia_id = d.id
+            WHERE d.ciclo_id = ciclos.id
+        )
+    """),
+    ("trg_ventas_ai", """
+        CREATE TRIGGER IF NOT EXISTS trg_ventas_ai AFTER INSERT ON ventas
+        BEGIN
+            UPDATE ciclos SET ventas_totales = ventas_totales + 1
+            WHERE id = (SELECT ciclo_id FROM dias WHERE id = NEW.dia_id);
+        END
+    """),
+    ("trg_ventas_ad", """
+        CREATE TRIGGER IF NOT EXISTS trg_ventas_ad AFTER DELETE ON ventas
+        BEGIN
+            UPDATE ciclos SET ventas_totales = ventas_totales - 1
+            WHERE id = (SELECT ciclo_id FROM dias WHERE id = OLD.dia_id);
+        END
+    """),
+    ("trg_ventas_au_dia", """
+        CREATE TRIGGER IF NOT EXISTS trg_ventas_au_dia AFTER UPDATE OF dia_id ON ventas
+        BEGIN
+            UPDATE ciclos SET ventas_totales = ventas_totales - 1
+            WHERE id = (SELECT ciclo_id FROM dias WHERE id = OLD.dia_id);
+            UPDATE ciclos SET ventas_totales = ventas_totales + 1
+            WHERE id = (SELECT ciclo_id FROM dias WHERE id = NEW.dia_id);
+        END
+    """),
+    # Últimas ventas sin filtrar por día: ORDER BY fecha DESC LIMIT recorre el índice al revés
+    ("idx_ventas_fecha", "CREATE INDEX IF NOT EXISTS idx_ventas_fecha ON ventas(fecha)"),
+    # Datos de compra del día que usa la API (los días creados desde el CLI los dejan en NULL)
+    ("dias_tasa_compra", "ALTER TABLE dias ADD COLUMN tasa_compra REAL"),
+    ("dias_comision_pct", "ALTER TABLE dias ADD COLUMN comision_pct REAL"),
+    ("dias_ganancia_objetivo_pct", "ALTER TABLE dias ADD COLUMN ganancia_objetivo_pct REAL"),
+    # Derivados que calcula SQLite al leerlos (ALTER TABLE solo admite columnas generadas VIRTUAL)
+    ("dias_cantidad_cripto", """
+        ALTER TABLE dias ADD COLUMN cantidad_cripto REAL
+        GENERATED ALWAYS AS (capital_inicial / tasa_compra) VIRTUAL
+    """),
+    # Precio que recupera exactamente el capital: capital / (1 - comisión) / cantidad
+    ("dias_precio_equilibrio", """
+        ALTER TABLE dias ADD COLUMN precio_equilibrio REAL
+        GENERATED ALWAYS AS (tasa_compra / (1 - comision_pct / 100)) VIRTUAL
+    """),
+    # Índices parciales del estado "vivo": solo contienen el día abierto y el ciclo activo
+    ("idx_dias_abierto", "CREATE INDEX IF NOT EXISTS idx_dias_abierto ON dias(id) WHERE estado = 'abierto'"),
+    ("idx_ciclos_activo", "CREATE INDEX IF NOT EXISTS idx_ciclos_activo ON ciclos(id) WHERE estado = 'activo'"),
+    # Siguiente numero_dia del ciclo (MAX) sin recorrer sus días
+    ("idx_dias_ciclo_numero", "CREATE INDEX IF NOT EXISTS idx_dias_ciclo_numero ON dias(ciclo_id, numero_dia)"),
+    # Contador de ventas por día, mantenido por triggers como ciclos.ventas_totales
+    ("dias_ventas_count", "ALTER TABLE dias ADD COLUMN ventas_count INTEGER NOT NULL DEFAULT 0"),
+    ("dias_ventas_count_inicial", """
+        UPDATE dias SET ventas_count = (SELECT COUNT(*) FROM ventas WHERE dia_id = dias.id)
+    """),
+    ("trg_ventas_ai_dias", """
+        CREATE TRIGGER IF NOT EXISTS trg_ventas_ai_dias AFTER INSERT ON ventas
+        BEGIN
+            UPDATE dias SET ventas_count = ventas_count + 1 WHERE id = NEW.dia_id;
+        END
+    """),
+    ("trg_ventas_ad_dias", """
+        CREATE TRIGGER IF NOT EXISTS trg_ventas_ad_dias AFTER DELETE ON ventas
+        BEGIN
+            UPDATE dias SET ventas_count = ventas_count - 1 WHERE id = OLD.dia_id;
+        END
+    """),
+    ("trg_ventas_au_dia_dias", """
+        CREATE TRIGGER IF NOT EXISTS trg_ventas_au_dia_dias AFTER UPDATE OF dia_id ON ventas
+        BEGIN
+            UPDATE dias SET ventas_count = ventas_count - 1 WHERE id = OLD.dia_id;
+            UPDATE dias SET ventas_count = ventas_count + 1 WHERE id = NEW.dia_id;
+        END
+    """),
+    # Día abierto del ciclo activo con su cripto. d.* se expande al crear la vista:
+    # si más adelante se agregan columnas a dias, una migración nueva debe recrearla
+    ("v_dia_actual", """
+        CREATE VIEW IF NOT EXISTS v_dia_actual AS
+        SELECT d.*, c.nombre AS cripto_nombre, c.simbolo AS cripto_simbolo
+        FROM dias d
+        JOIN criptomonedas c ON d.cripto_operada_id = c.id
+        JOIN ciclos cy ON d.ciclo_id = cy.id
+        WHERE d.estado = 'abierto' AND cy.estado = 'activo'
+    """),
+    # Un solo día abierto por ciclo (lo que ya verifican la API y el CLI antes de abrir uno):
+    # con el ciclo activo fijado, v_dia_actual tiene como mucho una fila y no hace falta ordenar.
+    # Una BD vieja puede tener varios abiertos en un ciclo y el índice no se crearía: antes se
+    # cierran todos menos el más reciente (el que toma cerrar-dia), con sus totales desde ventas
+    # y sumados al ciclo como en un cierre normal
+    ("idx_dias_abierto_por_ciclo", (f"""
+        UPDATE dias SET
+            capital_final = t.efectivo,
+            efectivo_recibido = t.efectivo,
+            comisiones_pagadas = t.comision,
+            ganancia_bruta = t.ganancia_bruta,
+            ganancia_neta = t.ganancia
+        FROM (
+            SELECT d.id,
+                   COALESCE(SUM(v.efectivo_recibido), 0) as efectivo,
+                   COALESCE(SUM(v.comision), 0) as comision,
+                   COALESCE(SUM(v.ganancia_bruta), 0) as ganancia_bruta,
+                   COALESCE(SUM(v.ganancia_neta), 0) as ganancia
+            FROM dias d LEFT JOIN ventas v ON v.dia_id = d.id
+            WHERE d.estado = 'abierto'
+            GROUP BY d.id
+        ) t
+        WHERE dias.id = t.id AND {_DIA_ABIERTO_DUPLICADO}
+    """, f"""
+        UPDATE ciclos SET
+            dias_operados = dias_operados + t.dias,
+            ganancia_total = ganancia_total + t.ganancia
+        FROM (
+            SELECT ciclo_id, COUNT(*) as dias, SUM(ganancia_neta) as ganancia
+            FROM dias WHERE {_DIA_ABIERTO_DUPLICADO}
+            GROUP BY ciclo_id
+        ) t
+        WHERE ciclos.id = t.ciclo_id
+    """, f"""
+        UPDATE dias SET estado = 'cerrado', fecha_cierre = datetime('now')
+        WHERE {_DIA_ABIERTO_DUPLICADO}
+    """, """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_dias_abierto_por_ciclo
+        ON dias(ciclo_id) WHERE estado = 'abierto'
+    """)),
+    # Último día cerrado del ciclo: igualdad en ciclo_id y estado, numero_dia ya ordenado (sin sort)
+    ("idx_dias_ciclo_estado_num", "CREATE INDEX IF NOT EXISTS idx_dias_ciclo_estado_num ON dias(ciclo_id, estado, numero_dia)"),
+    # Criptos con saldo del ciclo: el índice parcial no guarda las posiciones ya vaciadas
+    ("idx_boveda_ciclo_cant", "CREATE INDEX IF NOT EXISTS idx_boveda_ciclo_cant ON boveda_ciclo(ciclo_id, cantidad) WHERE cantidad > 0"),
+    # Sumas de efectivo por ciclo y por día
+    ("idx_efectivo_ciclo", "CREATE INDEX IF NOT EXISTS idx_efectivo_ciclo ON efectivo_banco(ciclo_id)"),
+    ("idx_efectivo_dia", "CREATE INDEX IF NOT EXISTS idx_efectivo_dia ON efectivo_banco(dia_id)"),
+]
+
+
+# ===================================================================
+# CONVERSORES
+# ===================================================================
+
+def _convertir_fecha(valor: bytes) -> date:
+    """Convierte 'YYYY-MM-DD[ HH:MM:SS...]' en date leyendo solo la parte de fecha"""
+    return date.fromisoformat(valor[:10].decode())
+
+# Solo se aplica a columnas con alias explícito: SELECT fecha AS "fecha [fecha]"
+sqlite3.register_converter("fecha", _convertir_fecha)
+
+
+@lru_cache(maxsize=CACHED_STATEMENTS)
+def _clase_fila(columnas: Tuple[str, ...]):
+    """Clase namedtuple para un juego de columnas (se crea una vez por consulta distinta)"""
+    # rename=True: columnas repetidas o que no son identificadores pasan a _0, _1...
+    return namedtuple('Fila', columnas, rename=True)
+
 
 # ===================================================================
 # CLASE DATABASE MANAGER
@@ -30,6 +230,26 @@ class DatabaseManager:
         """Inicializa el gestor"""
         self.db_path = Path(DB_FILE)
         self._verificar_bd_existe()
+        
+        # Pool LIFO: la conexión devuelta más reciente (caché de páginas caliente) se reutiliza primero
+        self._pool = queue.LifoQueue(maxsize=POOL_SIZE)
+        
+        # SQLite admite un solo escritor: serializar escrituras evita "database is locked"
+        self._lock_escritura = threading.RLock()
+        # Conexión con la transacción de escritura en curso de cada hilo (para los get_cursor anidados)
+        self._escritura = threading.local()
+        
+        # Modo de journal que aceptó la última conexión abierta ("wal" salvo que el FS no lo soporte)
+        self.modo_journal: Optional[str] = None
+        # mmap_size que aceptó la última conexión (0 = sin mmap: BD pequeña o SQLite
+        # compilado sin soporte, SQLITE_MAX_MMAP_SIZE=0, que recorta el PRAGMA a 0)
+        self.mmap_bytes: int = 0
+        
+        self._aplicar_migraciones()
+        
+        # El CLI no pasa por el shutdown de la API: cerrar el pool al salir del proceso
+        # hace el checkpoint del WAL en lugar de dejarlo para la próxima apertura
+        atexit.register(self.cerrar)
     
     def _verificar_bd_existe(self):
         """Verifica que la base de datos existe"""
@@ -42,13 +262,123 @@ class DatabaseManager:
                 "Ejecuta inicializar_bd.py primero"
             )
     
+    def _aplicar_migraciones(self):
+        """Aplica las migraciones pendientes en una sola transacción"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        
+        try:
+            # IMMEDIATE: si otro proceso (CLI/API) migra a la vez, espera y re-lee la versión
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            
+            for nombre, sql in MIGRACIONES[version:]:
+                for sentencia in ((sql,) if isinstance(sql, str) else sql):
+                    conn.execute(sentencia)
+            
+            if version < len(MIGRACIONES):
+                conn.execute(f"PRAGMA user_version = {len(MIGRACIONES)}")
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def _crear_conexion(self) -> sqlite3.Connection:
+        """Abre una nueva conexión configurada"""
+        # check_same_thread=False: la conexión pasa entre hilos, pero nunca se comparte a la vez
+        # PARSE_COLNAMES (y no PARSE_DECLTYPES): solo convierte las columnas que lo piden
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=CACHED_STATEMENTS,
+                               detect_types=sqlite3.PARSE_COLNAMES)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        # WAL: las lecturas no se bloquean mientras otra conexión escribe.
+        # El PRAGMA devuelve el modo resultante: SQLite lo ignora sin error si no puede aplicarlo
+        self.modo_journal = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        conn.execute("PRAGMA synchronous = NORMAL")
+        # Temporales en RAM, lecturas vía mmap y 64 MiB de cache de páginas por conexión
+        conn.execute("PRAGMA temp_store = MEMORY")
+        if self.db_path.stat().st_size >= MMAP_MIN_ARCHIVO:
+            # Devuelve el tamaño aplicado: así se sabe si la compilación de SQLite admite mmap
+            self.mmap_bytes = conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}").fetchone()[0]
+        conn.execute(f"PRAGMA cache_size = {CACHE_SIZE_KIB}")
+        return conn
+    
+    @contextmanager
+    def _obtener_conexion(self):
+        """
+        Toma una conexión del pool (o abre una nueva) y la devuelve al salir
+        
+        Yields:
+            sqlite3.Connection: Conexión de uso exclusivo mientras dure el bloque
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._crear_conexion()
+        
+        try:
+            yield conn
+        finally:
+            # Nunca devolver al pool una conexión con transacción pendiente
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
+    def precalentar(self, cantidad: int = POOL_SIZE) -> int:
+        """
+        Abre conexiones por adelantado para que las primeras peticiones no paguen la apertura
+        
+        Args:
+            cantidad: Conexiones a dejar listas en el pool (máximo POOL_SIZE)
+        
+        Returns:
+            int: Conexiones disponibles en el pool
+        """
+        while self._pool.qsize() < min(cantidad, POOL_SIZE):
+            try:
+                self._pool.put_nowait(self._crear_conexion())
+            except queue.Full:
+                break
+        return self._pool.qsize()
+    
+    def cerrar(self):
+        """Cierra todas las conexiones que esperan en el pool"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+    
+    def checkpoint(self):
+        """Pasa al archivo principal todo lo escrito en el -wal y lo deja vacío"""
+        with self._obtener_conexion() as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    
+    def archivos_bd(self) -> List[Path]:
+        """
+        Archivos que forman la base de datos: el .db y los auxiliares del WAL que existan
+        
+        Returns:
+            Lista de rutas, empezando por el archivo principal
+        """
+        auxiliares = [Path(f"{self.db_path}{sufijo}") for sufijo in SUFIJOS_WAL]
+        return [self.db_path] + [archivo for archivo in auxiliares if archivo.exists()]
+    
     @contextmanager
     def get_cursor(self, commit: bool = False):
         """
         Context manager para obtener cursor de BD
         
         Args:
-            commit: Si True, hace commit automático al salir
+            commit: Si True, hace commit automático al salir. Un get_cursor(commit=True)
+                anidado dentro de otro del mismo hilo se suma a su transacción
+                (el commit o rollback lo hace el de fuera)
         
         Yields:
             sqlite3.Cursor: Cursor de la base de datos
@@ -57,22 +387,80 @@ class DatabaseManager:
             with db.get_cursor(commit=True) as cursor:
                 cursor.execute("INSERT INTO ...")
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
+        conn_escritura = getattr(self._escritura, 'conn', None)
+        if commit and conn_escritura is not None:
+            # Otra conexión del pool esperaría en BEGIN IMMEDIATE a la transacción de este mismo hilo
+            cursor = conn_escritura.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+        
+        with self._obtener_conexion() as conn:
+            cursor = None
+            bloqueado = False
+            
+            try:
+                if commit:
+                    self._lock_escritura.acquire()
+                    bloqueado = True
+                
+                cursor = conn.cursor()
+                
+                if commit:
+                    # IMMEDIATE: la transacción toma el bloqueo de escritura al empezar. Con BEGIN
+                    # diferido, un leer-y-luego-escribir puede fallar con "database is locked" si
+                    # otro proceso (el CLI) escribe entre medias; así espera su turno (timeout)
+                    cursor.execute("BEGIN IMMEDIATE")
+                    self._escritura.conn = conn
+                yield cursor
+                if commit:
+                    conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                if cursor is not None:
+                    cursor.close()
+                if bloqueado:
+                    self._escritura.conn = None
+                    self._lock_escritura.release()
+    
+    def ejecutar_mantenimiento(self, *sentencias: str) -> None:
+        """
+        Ejecuta sentencias que SQLite no admite dentro de una transacción (VACUUM)
         
-        cursor = conn.cursor()
+        Toman el lock de escritura como get_cursor(commit=True), pero corren en
+        autocommit sobre una conexión sin transacción abierta.
         
-        try:
-            yield cursor
-            if commit:
-                conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cursor.close()
-            conn.close()
+        Args:
+            sentencias: Sentencias SQL, en orden
+        
+        Example:
+            db.ejecutar_mantenimiento("VACUUM", "ANALYZE")
+        """
+        if getattr(self._escritura, 'conn', None) is not None:
+            raise RuntimeError("ejecutar_mantenimiento no puede usarse dentro de get_cursor(commit=True)")
+        
+        with self._lock_escritura, self._obtener_conexion() as conn:
+            for sql in sentencias:
+                conn.execute(sql)
+    
+    def plan_de_consulta(self, query: str, params=()) -> List[str]:
+        """
+        Devuelve el plan que SQLite elegiría para una consulta, sin ejecutarla
+        
+        Args:
+            query: Query SQL
+            params: Parámetros de la query (sus valores no cambian el plan)
+        
+        Returns:
+            Lista con el detalle de cada paso ("SEARCH ... USING INDEX ...", "SCAN ...")
+        """
+        with self.get_cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + query, params)
+            return [row['detail'] for row in cursor.fetchall()]
     
     def execute_query(self, query: str, params: tuple = (), 
                      fetch_one: bool = False) -> Optional[List[Dict]]:
@@ -87,20 +475,129 @@ class DatabaseManager:
         Returns:
             Lista de diccionarios o un diccionario (si fetch_one=True)
         """
-        with self.get_cursor() as cursor:
-            cursor.execute(query, params)
-            
-            if fetch_one:
+        if fetch_one:
+            with self.get_cursor() as cursor:
+                cursor.execute(query, params)
                 row = cursor.fetchone()
                 return dict(row) if row else None
-            else:
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows] if rows else []
+        
+        with self.execute_query_iter(query, params) as filas:
+            return list(filas)
+    
+    @contextmanager
+    def execute_query_iter(self, query: str, params: tuple = ()):
+        """
+        Ejecuta una consulta SELECT y entrega las filas de una en una
+        
+        No arma la lista completa: para resultados grandes o consumidores que
+        cortan antes (agregados, np.fromiter, exportaciones). La conexión queda
+        tomada mientras dure el bloque with
+        
+        Args:
+            query: Query SQL
+            params: Parámetros de la query
+        
+        Yields:
+            Iterador de diccionarios, uno por fila
+        
+        Example:
+            with db.execute_query_iter("SELECT ...") as filas:
+                for fila in filas:
+                    ...
+        """
+        with self.get_cursor() as cursor:
+            cursor.execute(query, params)
+            yield self._filas_por_lotes(cursor)
+    
+    @staticmethod
+    def _filas_por_lotes(cursor):
+        """Entrega las filas como diccionarios pidiéndolas a SQLite de FILAS_POR_LOTE en FILAS_POR_LOTE"""
+        while True:
+            lote = cursor.fetchmany(FILAS_POR_LOTE)
+            if not lote:
+                return
+            for row in lote:
+                yield dict(row)
+    
+    def execute_scalar(self, query: str, params: tuple = ()) -> Any:
+        """
+        Ejecuta una consulta que devuelve un único valor (COUNT, SUM...)
+        
+        El cursor usa filas tupla (row_factory=None): no se construye un Row ni
+        un diccionario para leer un solo número
+        
+        Args:
+            query: Query SQL de una fila y una columna
+            params: Parámetros de la query
+        
+        Returns:
+            El valor de la primera columna, o None si no hay filas
+        """
+        with self.get_cursor() as cursor:
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            return row[0] if row else None
+    
+    def execute_query_tuplas(self, query: str, params: tuple = ()) -> List[Tuple]:
+        """
+        Ejecuta una consulta SELECT y retorna las filas como namedtuple
+        
+        Para listados que solo se recorren y leen: cada fila es una tupla creada en C
+        (row_factory=None) con acceso por atributo (fila.cantidad), sin el Row ni el
+        diccionario de execute_query. No admite fila['campo'] ni modificar valores
+        
+        Args:
+            query: Query SQL
+            params: Parámetros de la query
+        
+        Returns:
+            Lista de namedtuple con un campo por columna
+        """
+        with self.get_cursor() as cursor:
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            filas = cursor.fetchall()
+            clase = _clase_fila(tuple(columna[0] for columna in cursor.description))
+        
+        return [clase._make(fila) for fila in filas]
+    
+    def execute_insert(self, query: str, params: tuple = ()) -> int:
+        """
+        Ejecuta una consulta INSERT
+        
+        Args:
+            query: Query SQL
+            params: Parámetros de la query
+        
+        Returns:
+            ID del registro insertado
+        """
+        with self.get_cursor(commit=True) as cursor:
+            cursor.execute(query, params)
+            return cursor.lastrowid
+    
+    def execute_modify(self, query: str, params: tuple = ()) -> int:
+        """
+        Ejecuta una consulta UPDATE/DELETE
+        
+        Args:
+            query: Query SQL
+            params: Parámetros de la query
+        
+        Returns:
+            Número de filas afectadas
+        """
+        with self.get_cursor(commit=True) as cursor:
+            cursor.execute(query, params)
+            return cursor.rowcount
     
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """
         Ejecuta una consulta INSERT/UPDATE/DELETE
         
+        Obsoleto: usar execute_insert o execute_modify, que no inspeccionan el texto de la query
+        
         Args:
             query: Query SQL
             params: Parámetros de la query
@@ -108,15 +605,13 @@ class DatabaseManager:
         Returns:
             ID del último registro insertado (para INSERT) o número de filas afectadas
         """
-        with self.get_cursor(commit=True) as cursor:
-            cursor.execute(query, params)
-            
-            # Para INSERT, retornar lastrowid
-            if query.strip().upper().startswith('INSERT'):
-                return cursor.lastrowid
-            # Para UPDATE/DELETE, retornar rowcount
-            else:
-                return cursor.rowcount
+        warnings.warn(
+            "execute_update está obsoleto: usa execute_insert o execute_modify",
+            DeprecationWarning, stacklevel=2
+        )
+        if query.lstrip()[:6].upper() == 'INSERT':
+            return self.execute_insert(query, params)
+        return self.execute_modify(query, params)
     
     def execute_many(self, query: str, params_list: List[tuple]) -> int:
         """
@@ -132,6 +627,31 @@ class DatabaseManager:
         with self.get_cursor(commit=True) as cursor:
             cursor.executemany(query, params_list)
             return cursor.rowcount
+    
+    def execute_batch_transactional(self, operaciones: List[Tuple[str, List[tuple]]]) -> List[int]:
+        """
+        Ejecuta varios grupos de operaciones en una sola transacción
+        
+        Todas se confirman con un único commit; si alguna falla, no se aplica ninguna
+        
+        Args:
+            operaciones: Lista de tuplas (query, lista de tuplas con parámetros)
+        
+        Returns:
+            Número de filas afectadas por cada grupo, en el mismo orden
+        
+        Example:
+            db.execute_batch_transactional([
+                ("INSERT INTO ventas (...) VALUES (...)", filas_ventas),
+                ("UPDATE dias SET ... WHERE id = ?", [(total, dia_id)]),
+            ])
+        """
+        with self.get_cursor(commit=True) as cursor:
+            filas_afectadas = []
+            for query, params_list in operaciones:
+                cursor.executemany(query, params_list)
+                filas_afectadas.append(cursor.rowcount)
+            return filas_afectadas
 
 
 # ===================================================================
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+MÓDULO JIT
+=============================================================================
+Compilación a código máquina de las fórmulas numéricas con Numba
+Si Numba no está instalado, el decorador deja las funciones en Python puro
+"""
+
+try:
+    from numba import njit
+    NUMBA_DISPONIBLE = True
+except ImportError:
+    NUMBA_DISPONIBLE = False
+
+    def njit(*args, **kwargs):
+        """
+        Sustituto de numba.njit que devuelve la función sin compilar
+
+        Acepta las dos formas de uso: @njit y @njit('firma', opciones...)
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# ===================================================================
+# NÚCLEOS COMPILADOS
+# ===================================================================
+
+# Opciones comunes de los núcleos numéricos:
+# - cache: guarda el código máquina en disco (__pycache__) y no recompila en cada arranque
+# - fastmath: permite reordenar operaciones de coma flotante
+# - boundscheck=False: sin comprobación de índices en tuplas/arrays
+# - error_model='numpy': dividir por cero da inf/nan en vez de comprobar y lanzar
+#   ZeroDivisionError (los núcleos ya descartan esos casos antes de dividir)
+OPCIONES_NUCLEO = dict(cache=True, fastmath=True, boundscheck=False, error_model='numpy')
+
+
+def nucleo(*firmas: str):
+    """
+    Compila una función numérica con firmas explícitas
+
+    Con las firmas dadas Numba genera solo esas especializaciones al importar y no
+    resuelve tipos en cada llamada. Nunca cae a modo objeto (njit = nopython)
+
+    Args:
+        firmas: Una o más firmas, p. ej. 'f8(f8, f8, f8)'
+
+    Example:
+        @nucleo('f8(f8, f8)')
+        def _roi(ganancia, inversion): ...
+    """
+    return njit(list(firmas), **OPCIONES_NUCLEO)
@@ -7,8 +7,12 @@ Sistema de logs centralizado
 Compatible con todos los módulos del sistema
 """
 
+import atexit
 import os
-from datetime import datetime
+import queue
+import threading
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 
@@ -19,6 +23,13 @@ from pathlib import Path
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
 
+# El hilo escritor vuelca al disco cada tantas líneas o cada tantos segundos, lo que llegue antes
+LINEAS_POR_FLUSH = 50
+SEGUNDOS_POR_FLUSH = 1.0
+
+# Espera máxima de un log.error hasta que su línea queda en disco
+SEGUNDOS_ESPERA_ERROR = 2.0
+
 
 # ===================================================================
 # CLASE DE LOGGING
@@ -35,15 +46,103 @@ class Logger:
             archivo_base: Nombre base del archivo de log
         """
         self.archivo_base = archivo_base
-        self.fecha_actual = datetime.now().strftime('%Y-%m-%d')
-        self.archivo_log = LOGS_DIR / f"{archivo_base}_{self.fecha_actual}.log"
+        self._rotar()
+        
+        # Las llamadas solo encolan la línea: un hilo escritor mantiene el archivo abierto
+        # y escribe por lotes, sin abrir y cerrar el archivo en cada log
+        self._cola = queue.Queue()
+        self._archivo = None  # Solo lo toca el hilo escritor
+        self._cerrado = False
+        self._hilo = threading.Thread(target=self._escritor, name=f"logger-{archivo_base}",
+                                      daemon=True)
+        self._hilo.start()
+        atexit.register(self._vaciar_y_cerrar)
+    
+    def _rotar(self):
+        """Apunta al archivo de hoy y calcula cuándo empieza el de mañana"""
+        hoy = date.today()
+        self.fecha_actual = hoy.strftime('%Y-%m-%d')
+        self.archivo_log = LOGS_DIR / f"{self.archivo_base}_{self.fecha_actual}.log"
+        # Medianoche como timestamp: cada línea compara un número en lugar de formatear la fecha
+        self._rollover_ts = datetime.combine(hoy + timedelta(days=1), datetime.min.time()).timestamp()
     
     def _verificar_fecha(self):
-        """Verifica si cambió la fecha y actualiza el archivo"""
-        fecha_ahora = datetime.now().strftime('%Y-%m-%d')
-        if fecha_ahora != self.fecha_actual:
-            self.fecha_actual = fecha_ahora
-            self.archivo_log = LOGS_DIR / f"{self.archivo_base}_{self.fecha_actual}.log"
+        """Verifica si cambió la fecha y actualiza el archivo (en el hilo escritor)"""
+        if time.time() >= self._rollover_ts:
+            self._cerrar_archivo()
+            self._rotar()
+    
+    def _cerrar_archivo(self):
+        """Vuelca y cierra el archivo abierto, si lo hay"""
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+    
+    def _escritor(self):
+        """Hilo escritor: vacía la cola en el archivo del día"""
+        pendientes = 0
+        ultimo_flush = time.monotonic()
+        
+        while True:
+            try:
+                linea, escrita = self._cola.get(timeout=SEGUNDOS_POR_FLUSH)
+            except queue.Empty:
+                linea, escrita = "", None  # Cola inactiva: solo volcar lo pendiente
+            
+            if linea is None:  # Señal de cierre
+                self._cerrar_archivo()
+                return
+            
+            try:
+                if linea:
+                    self._verificar_fecha()
+                    if self._archivo is None:
+                        self._archivo = open(self.archivo_log, 'a', encoding='utf-8')
+                    self._archivo.write(linea)
+                    pendientes += 1
+                
+                if pendientes and (escrita is not None or pendientes >= LINEAS_POR_FLUSH
+                                   or time.monotonic() - ultimo_flush >= SEGUNDOS_POR_FLUSH):
+                    self._archivo.flush()
+                    pendientes = 0
+                    ultimo_flush = time.monotonic()
+            except Exception as e:
+                print(f"⚠️  Error al escribir log: {e}")
+                # Cerrar el archivo fallido (se reabre con la próxima línea) sin volver a fallar
+                try:
+                    self._cerrar_archivo()
+                except Exception:
+                    self._archivo = None
+                pendientes = 0
+            finally:
+                if escrita is not None:
+                    escrita.set()
+    
+    def vaciar(self, timeout: float = SEGUNDOS_ESPERA_ERROR) -> bool:
+        """
+        Espera a que todo lo registrado hasta ahora quede en disco
+        
+        Args:
+            timeout: Segundos máximos de espera
+        
+        Returns:
+            bool: True si el hilo escritor volcó la cola a tiempo
+        """
+        if self._cerrado:
+            return True  # Sin hilo escritor las líneas ya se escriben directamente
+        
+        # Marca sin texto: al llegar a ella el escritor vuelca lo pendiente y la avisa
+        escrita = threading.Event()
+        self._cola.put_nowait(("", escrita))
+        return escrita.wait(timeout)
+    
+    def _vaciar_y_cerrar(self):
+        """Escribe lo que quede en la cola y cierra el archivo (al salir del proceso)"""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        self._cola.put((None, None))
+        self._hilo.join(timeout=SEGUNDOS_ESPERA_ERROR)
     
     def _escribir_log(self, nivel, mensaje, categoria="general"):
         """
@@ -54,16 +153,25 @@ class Logger:
             mensaje: Mensaje a registrar
             categoria: Categoría del log
         """
-        self._verificar_fecha()
-        
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         linea = f"[{timestamp}] [{nivel}] [{categoria}] {mensaje}\n"
         
-        try:
-            with open(self.archivo_log, 'a', encoding='utf-8') as f:
-                f.write(linea)
-        except Exception as e:
-            print(f"⚠️  Error al escribir log: {e}")
+        if self._cerrado:
+            # Ya no hay hilo escritor (fin del proceso): escribir directamente
+            try:
+                with open(self.archivo_log, 'a', encoding='utf-8') as f:
+                    f.write(linea)
+            except Exception as e:
+                print(f"⚠️  Error al escribir log: {e}")
+            return
+        
+        # Un ERROR espera a quedar en disco: es lo que hay que leer si el proceso cae
+        if nivel == "ERROR":
+            escrita = threading.Event()
+            self._cola.put_nowait((linea, escrita))
+            escrita.wait(SEGUNDOS_ESPERA_ERROR)
+        else:
+            self._cola.put_nowait((linea, None))
     
     # ===================================================================
     # MÉTODOS DE LOGGING
@@ -199,6 +307,9 @@ if __name__ == "__main__":
     log.ciclo_creado(1, 15, 1000.0, "2025-01-01", "2025-01-15")
     log.venta_registrada(1, "USDT", 100.0, 1.0235, 102.35, 0.36, 1.99)
     
+    # INFO y WARNING solo se encolan: esperar a que lleguen al archivo antes de leerlo
+    log.vaciar()
+    
     print(f"\n✅ Logs escritos en: {log.archivo_log}")
     print("\nContenido:")
     print("-"*70)
@@ -7,315 +7,450 @@ Queries SQL reutilizables para evitar duplicación
 Todas las queries comunes en un solo lugar
 """
 
+import sys
+import time
+from typing import Dict, List, Optional
+
 from core.db_manager import db
 
 
-class Queries:
-    """Queries SQL centralizadas"""
-    
-    # ===================================================================
-    # CONFIGURACIÓN
-    # ===================================================================
-    
-    @staticmethod
-    def obtener_config():
-        """Obtiene la configuración completa del sistema"""
-        return db.execute_query(
-            "SELECT * FROM config WHERE id = 1",
-            fetch_one=True
-        )
-    
-    @staticmethod
-    def obtener_comision():
-        """Obtiene solo la comisión"""
-        config = Queries.obtener_config()
-        return config['comision_default'] if config else 0.35
-    
-    @staticmethod
-    def obtener_ganancia_objetivo():
-        """Obtiene solo la ganancia objetivo"""
-        config = Queries.obtener_config()
-        return config['ganancia_neta_default'] if config else 2.0
-    
-    @staticmethod
-    def obtener_limites_ventas():
-        """Obtiene límites de ventas"""
-        config = Queries.obtener_config()
-        if config:
-            return config['limite_ventas_min'], config['limite_ventas_max']
-        return 3, 5
-    
-    # ===================================================================
-    # CICLOS
-    # ===================================================================
-    
-    @staticmethod
-    def obtener_ciclo_activo():
-        """Obtiene el ciclo activo"""
-        return db.execute_query("""
-            SELECT * FROM ciclos
-            WHERE estado = 'activo'
-            ORDER BY id DESC
-            LIMIT 1
-        """, fetch_one=True)
-    
-    @staticmethod
-    def obtener_ciclo_por_id(ciclo_id: int):
-        """Obtiene un ciclo por ID"""
-        return db.execute_query(
-            "SELECT * FROM ciclos WHERE id = ?",
-            (ciclo_id,),
-            fetch_one=True
-        )
-    
-    @staticmethod
-    def contar_ciclos():
-        """Cuenta total de ciclos"""
-        resultado = db.execute_query(
-            "SELECT COUNT(*) as total FROM ciclos",
-            fetch_one=True
-        )
-        return resultado['total']
-    
-    @staticmethod
-    def listar_ciclos(limite: int = 10):
-        """Lista últimos ciclos"""
-        return db.execute_query("""
-            SELECT * FROM ciclos
-            ORDER BY id DESC
-            LIMIT ?
-        """, (limite,))
-    
-    # ===================================================================
-    # DÍAS
-    # ===================================================================
-    
-    @staticmethod
-    def obtener_dia_por_id(dia_id: int):
-        """Obtiene un día por ID"""
-        return db.execute_query(
-            "SELECT * FROM dias WHERE id = ?",
-            (dia_id,),
-            fetch_one=True
-        )
-    
-    @staticmethod
-    def obtener_dia_abierto(ciclo_id: int):
-        """Obtiene día abierto del ciclo"""
-        return db.execute_query("""
-            SELECT * FROM dias
-            WHERE ciclo_id = ? AND estado = 'abierto'
-            ORDER BY numero_dia DESC
-            LIMIT 1
-        """, (ciclo_id,), fetch_one=True)
-    
-    @staticmethod
-    def contar_dias_ciclo(ciclo_id: int):
-        """Cuenta días de un ciclo"""
-        resultado = db.execute_query("""
-            SELECT COUNT(*) as total
-            FROM dias
-            WHERE ciclo_id = ?
-        """, (ciclo_id,), fetch_one=True)
-        return resultado['total']
-    
-    @staticmethod
-    def obtener_ultimo_dia_cerrado(ciclo_id: int):
-        """Obtiene último día cerrado"""
-        return db.execute_query("""
-            SELECT * FROM dias
-            WHERE ciclo_id = ? AND estado = 'cerrado'
-            ORDER BY numero_dia DESC
-            LIMIT 1
-        """, (ciclo_id,), fetch_one=True)
-    
-    # ===================================================================
-    # VENTAS
-    # ===================================================================
-    
-    @staticmethod
-    def contar_ventas_dia(dia_id: int):
-        """Cuenta ventas de un día"""
-        resultado = db.execute_query(
-            "SELECT COUNT(*) as total FROM ventas WHERE dia_id = ?",
-            (dia_id,),
-            fetch_one=True
-        )
-        return resultado['total']
-    
-    @staticmethod
-    def obtener_ventas_dia(dia_id: int):
-        """Obtiene todas las ventas de un día"""
-        return db.execute_query("""
-            SELECT v.*, c.nombre, c.simbolo
-            FROM ventas v
-            JOIN criptomonedas c ON v.cripto_id = c.id
-            WHERE v.dia_id = ?
-            ORDER BY v.fecha
-        """, (dia_id,))
-    
-    @staticmethod
-    def calcular_totales_ventas_dia(dia_id: int):
-        """Calcula totales de ventas de un día"""
-        return db.execute_query("""
-            SELECT 
-                COUNT(*) as num_ventas,
-                COALESCE(SUM(cantidad), 0) as cantidad_total,
-                COALESCE(SUM(monto_venta), 0) as monto_total,
-                COALESCE(SUM(comision), 0) as comisiones_total,
-                COALESCE(SUM(ganancia_neta), 0) as ganancia_total
-            FROM ventas
-            WHERE dia_id = ?
-        """, (dia_id,), fetch_one=True)
-    
-    # ===================================================================
-    # BÓVEDA
-    # ===================================================================
-    
-    @staticmethod
-    def obtener_capital_boveda(ciclo_id: int):
-        """Obtiene capital total en bóveda del ciclo"""
-        resultado = db.execute_query("""
-            SELECT COALESCE(SUM(cantidad * precio_promedio), 0) as capital
-            FROM boveda_ciclo
-            WHERE ciclo_id = ?
-        """, (ciclo_id,), fetch_one=True)
-        return resultado['capital']
-    
-    @staticmethod
-    def obtener_criptos_boveda(ciclo_id: int):
-        """Obtiene todas las criptos en bóveda"""
-        return db.execute_query("""
-            SELECT 
-                c.id,
-                c.nombre,
-                c.simbolo,
-                bc.cantidad,
-                bc.precio_promedio,
-                (bc.cantidad * bc.precio_promedio) as valor_usd
-            FROM boveda_ciclo bc
-            JOIN criptomonedas c ON bc.cripto_id = c.id
-            WHERE bc.ciclo_id = ? AND bc.cantidad > 0
-            ORDER BY valor_usd DESC
-        """, (ciclo_id,))
-    
-    @staticmethod
-    def obtener_cantidad_cripto(ciclo_id: int, cripto_id: int):
-        """Obtiene cantidad disponible de una cripto"""
-        resultado = db.execute_query("""
-            SELECT cantidad
-            FROM boveda_ciclo
-            WHERE ciclo_id = ? AND cripto_id = ?
-        """, (ciclo_id, cripto_id), fetch_one=True)
-        return resultado['cantidad'] if resultado else 0
-    
-    @staticmethod
-    def obtener_precio_promedio_cripto(ciclo_id: int, cripto_id: int):
-        """Obtiene precio promedio de una cripto"""
-        resultado = db.execute_query("""
-            SELECT precio_promedio
-            FROM boveda_ciclo
-            WHERE ciclo_id = ? AND cripto_id = ?
-        """, (ciclo_id, cripto_id), fetch_one=True)
-        return resultado['precio_promedio'] if resultado else 0
-    
-    # ===================================================================
-    # CRIPTOMONEDAS
-    # ===================================================================
-    
-    @staticmethod
-    def listar_criptomonedas():
-        """Lista todas las criptomonedas"""
-        return db.execute_query("""
-            SELECT * FROM criptomonedas
-            ORDER BY tipo, nombre
-        """)
-    
-    @staticmethod
-    def obtener_cripto_por_id(cripto_id: int):
-        """Obtiene una criptomoneda por ID"""
-        return db.execute_query(
-            "SELECT * FROM criptomonedas WHERE id = ?",
-            (cripto_id,),
-            fetch_one=True
-        )
-    
-    @staticmethod
-    def obtener_cripto_por_simbolo(simbolo: str):
-        """Obtiene una criptomoneda por símbolo"""
-        return db.execute_query(
-            "SELECT * FROM criptomonedas WHERE simbolo = ?",
-            (simbolo.upper(),),
-            fetch_one=True
-        )
-    
-    # ===================================================================
-    # ESTADÍSTICAS
-    # ===================================================================
-    
-    @staticmethod
-    def obtener_estadisticas_generales():
-        """Obtiene estadísticas generales del sistema"""
-        with db.get_cursor(commit=False) as cursor:
-            stats = {}
-            
-            # Ciclos
-            cursor.execute("SELECT COUNT(*) as total FROM ciclos")
-            stats['total_ciclos'] = cursor.fetchone()['total']
-            
-            cursor.execute("SELECT COUNT(*) as total FROM ciclos WHERE estado='activo'")
-            stats['ciclos_activos'] = cursor.fetchone()['total']
-            
-            # Días
-            cursor.execute("SELECT COUNT(*) as total FROM dias WHERE estado='cerrado'")
-            stats['dias_operados'] = cursor.fetchone()['total']
-            
-            # Ventas
-            cursor.execute("SELECT COUNT(*) as total FROM ventas")
-            stats['total_ventas'] = cursor.fetchone()['total']
-            
-            cursor.execute("SELECT COALESCE(SUM(ganancia_neta), 0) as total FROM ventas")
-            stats['ganancia_total'] = cursor.fetchone()['total']
-            
-            # Compras
-            cursor.execute("SELECT COUNT(*) as total FROM compras")
-            stats['total_compras'] = cursor.fetchone()['total']
-            
-            cursor.execute("SELECT COALESCE(SUM(monto_usd), 0) as total FROM compras")
-            stats['capital_invertido'] = cursor.fetchone()['total']
-            
-            return stats
-    
-    # ===================================================================
-    # EFECTIVO
-    # ===================================================================
-    
-    @staticmethod
-    def obtener_efectivo_total(ciclo_id: int):
-        """Obtiene efectivo total acumulado en el ciclo"""
-        resultado = db.execute_query("""
-            SELECT COALESCE(SUM(monto), 0) as total
-            FROM efectivo_banco
-            WHERE ciclo_id = ?
-        """, (ciclo_id,), fetch_one=True)
-        return resultado['total']
-    
-    @staticmethod
-    def obtener_efectivo_dia(dia_id: int):
-        """Obtiene efectivo del día"""
-        resultado = db.execute_query("""
-            SELECT COALESCE(SUM(monto), 0) as total
-            FROM efectivo_banco
-            WHERE dia_id = ?
-        """, (dia_id,), fetch_one=True)
-        return resultado['total']
+# ===================================================================
+# SENTENCIAS SQL
+# ===================================================================
+# Definidas una vez al importar: cada método pasa siempre el mismo objeto str, y la
+# conexión (cached_statements) reutiliza la sentencia ya preparada para ese texto
+
+# CONFIGURACIÓN
+_SQL_CONFIG = "SELECT * FROM config WHERE id = 1"
+
+# CICLOS
+_SQL_CICLO_ACTIVO = """
+    SELECT * FROM ciclos
+    WHERE estado = 'activo'
+    ORDER BY id DESC
+    LIMIT 1
+"""
+
+_SQL_CICLO_POR_ID = "SELECT * FROM ciclos WHERE id = ?"
+
+_SQL_CONTAR_CICLOS = "SELECT COUNT(*) FROM ciclos"
+
+_SQL_LISTAR_CICLOS = """
+    SELECT * FROM ciclos
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
+# DÍAS
+_SQL_DIA_POR_ID = "SELECT * FROM dias WHERE id = ?"
+
+_SQL_DIA_ABIERTO = """
+    SELECT * FROM dias
+    WHERE ciclo_id = ? AND estado = 'abierto'
+    ORDER BY numero_dia DESC
+    LIMIT 1
+"""
+
+_SQL_CONTAR_DIAS_CICLO = """
+    SELECT COUNT(*)
+    FROM dias
+    WHERE ciclo_id = ?
+"""
+
+_SQL_ULTIMO_DIA_CERRADO = """
+    SELECT * FROM dias
+    WHERE ciclo_id = ? AND estado = 'cerrado'
+    ORDER BY numero_dia DESC
+    LIMIT 1
+"""
+
+# Día abierto, último día cerrado y total de días del ciclo en una sola consulta:
+# la fila de conteo siempre existe y se le unen (LEFT JOIN) hasta dos filas de dias
+_SQL_RESUMEN_DIAS_CICLO = """
+    SELECT t.total_dias, d.*
+    FROM (SELECT COUNT(*) AS total_dias FROM dias WHERE ciclo_id = :ciclo_id) t
+    LEFT JOIN dias d ON d.id IN (
+        (SELECT id FROM dias
+         WHERE ciclo_id = :ciclo_id AND estado = 'abierto'
+         ORDER BY numero_dia DESC LIMIT 1),
+        (SELECT id FROM dias
+         WHERE ciclo_id = :ciclo_id AND estado = 'cerrado'
+         ORDER BY numero_dia DESC LIMIT 1)
+    )
+"""
+
+# VENTAS
+# dias.ventas_count lo mantienen los triggers de ventas: lectura por clave, sin contar ventas
+_SQL_CONTAR_VENTAS_DIA = "SELECT ventas_count FROM dias WHERE id = ?"
+
+_SQL_VENTAS_DIA = """
+    SELECT v.*, c.nombre, c.simbolo
+    FROM ventas v
+    JOIN criptomonedas c ON v.cripto_id = c.id
+    WHERE v.dia_id = ?
+    ORDER BY v.fecha
+"""
+
+_SQL_TOTALES_VENTAS_DIA = """
+    SELECT 
+        COUNT(*) as num_ventas,
+        COALESCE(SUM(cantidad), 0) as cantidad_total,
+        COALESCE(SUM(monto_venta), 0) as monto_total,
+        COALESCE(SUM(comision), 0) as comisiones_total,
+        COALESCE(SUM(ganancia_neta), 0) as ganancia_total
+    FROM ventas
+    WHERE dia_id = ?
+"""
+
+# BÓVEDA
+# Las sumas de un solo valor no usan COALESCE: SUM sin filas da NULL y el método lo pasa a 0
+_SQL_CAPITAL_BOVEDA = """
+    SELECT SUM(cantidad * precio_promedio)
+    FROM boveda_ciclo
+    WHERE ciclo_id = ?
+"""
+
+_SQL_CRIPTOS_BOVEDA = """
+    SELECT 
+        c.id,
+        c.nombre,
+        c.simbolo,
+        bc.cantidad,
+        bc.precio_promedio,
+        (bc.cantidad * bc.precio_promedio) as valor_usd
+    FROM boveda_ciclo bc
+    JOIN criptomonedas c ON bc.cripto_id = c.id
+    WHERE bc.ciclo_id = ? AND bc.cantidad > 0
+    ORDER BY valor_usd DESC
+"""
+
+_SQL_POSICION_CRIPTO = """
+    SELECT cantidad, precio_promedio
+    FROM boveda_ciclo
+    WHERE ciclo_id = ? AND cripto_id = ?
+"""
+
+# CRIPTOMONEDAS
+_SQL_CRIPTOMONEDAS = """
+    SELECT * FROM criptomonedas
+    ORDER BY tipo, nombre
+"""
+
+_SQL_CRIPTO_POR_ID = "SELECT * FROM criptomonedas WHERE id = ?"
+
+# ESTADÍSTICAS
+# Una sola consulta con subconsultas escalares en lugar de siete ida y vuelta
+_SQL_ESTADISTICAS_GENERALES = """
+    SELECT
+        (SELECT COUNT(*) FROM ciclos) as total_ciclos,
+        (SELECT COUNT(*) FROM ciclos WHERE estado = 'activo') as ciclos_activos,
+        (SELECT COUNT(*) FROM dias WHERE estado = 'cerrado') as dias_operados,
+        (SELECT COUNT(*) FROM ventas) as total_ventas,
+        (SELECT COALESCE(SUM(ganancia_neta), 0) FROM ventas) as ganancia_total,
+        (SELECT COUNT(*) FROM compras) as total_compras,
+        (SELECT COALESCE(SUM(monto_usd), 0) FROM compras) as capital_invertido
+"""
+
+# EFECTIVO
+_SQL_EFECTIVO_CICLO = """
+    SELECT SUM(monto)
+    FROM efectivo_banco
+    WHERE ciclo_id = ?
+"""
+
+_SQL_EFECTIVO_DIA = """
+    SELECT SUM(monto)
+    FROM efectivo_banco
+    WHERE dia_id = ?
+"""
+
+
+# ===================================================================
+# CACHE DE DATOS QUE CASI NO CAMBIAN
+# ===================================================================
+# La fila de config y la lista de criptomonedas se leen en casi cada operación y solo
+# cambian desde configuración: se guardan en memoria hasta que quien las modifica
+# llama a invalidar_config() / invalidar_criptomonedas().
+# config la escribe también la API desde otro proceso: además se relee pasado CONFIG_TTL
+
+# Segundos que se confía en la fila de config cacheada (el mismo margen que CACHE_TTL en la
+# API; sin importar core.cache, que trae cachetools, para que el CLI siga sin dependencias)
+CONFIG_TTL = 5
+
+_config_actual: Optional[Dict] = None
+_config_expira: float = 0.0
+_criptomonedas: Optional[List[Dict]] = None
+_criptos_por_simbolo: Optional[Dict[str, Dict]] = None
+
+
+# ===================================================================
+# CONFIGURACIÓN
+# ===================================================================
+
+def obtener_config():
+    """Obtiene la configuración completa del sistema (se relee de la BD pasado CONFIG_TTL)"""
+    global _config_actual, _config_expira
+    if _config_actual is None or time.monotonic() >= _config_expira:
+        _config_actual = db.execute_query(_SQL_CONFIG, fetch_one=True)
+        _config_expira = time.monotonic() + CONFIG_TTL
+    # Copia: quien la reciba puede modificarla sin tocar la cacheada
+    return dict(_config_actual) if _config_actual else None
+
+
+def invalidar_config():
+    """Descarta la configuración cacheada (llamar tras cualquier escritura en config)"""
+    global _config_actual
+    _config_actual = None
+
+
+def obtener_comision():
+    """Obtiene solo la comisión"""
+    config = obtener_config()
+    return config['comision_default'] if config else 0.35
+
+
+def obtener_ganancia_objetivo():
+    """Obtiene solo la ganancia objetivo"""
+    config = obtener_config()
+    return config['ganancia_neta_default'] if config else 2.0
+
+
+def obtener_limites_ventas():
+    """Obtiene límites de ventas"""
+    config = obtener_config()
+    if config:
+        return config['limite_ventas_min'], config['limite_ventas_max']
+    return 3, 5
+
+
+# ===================================================================
+# CICLOS
+# ===================================================================
+
+def obtener_ciclo_activo():
+    """Obtiene el ciclo activo"""
+    return db.execute_query(_SQL_CICLO_ACTIVO, fetch_one=True)
+
+
+def obtener_ciclo_por_id(ciclo_id: int):
+    """Obtiene un ciclo por ID"""
+    return db.execute_query(_SQL_CICLO_POR_ID, (ciclo_id,), fetch_one=True)
+
+
+def contar_ciclos():
+    """Cuenta total de ciclos"""
+    return db.execute_scalar(_SQL_CONTAR_CICLOS)
+
+
+def listar_ciclos(limite: int = 10):
+    """Lista últimos ciclos"""
+    return db.execute_query(_SQL_LISTAR_CICLOS, (limite,))
+
+
+# ===================================================================
+# DÍAS
+# ===================================================================
+
+def obtener_dia_por_id(dia_id: int):
+    """Obtiene un día por ID"""
+    return db.execute_query(_SQL_DIA_POR_ID, (dia_id,), fetch_one=True)
+
+
+def obtener_dia_abierto(ciclo_id: int):
+    """Obtiene día abierto del ciclo"""
+    return db.execute_query(_SQL_DIA_ABIERTO, (ciclo_id,), fetch_one=True)
+
+
+def contar_dias_ciclo(ciclo_id: int):
+    """Cuenta días de un ciclo"""
+    return db.execute_scalar(_SQL_CONTAR_DIAS_CICLO, (ciclo_id,))
+
+
+def obtener_ultimo_dia_cerrado(ciclo_id: int):
+    """Obtiene último día cerrado"""
+    return db.execute_query(_SQL_ULTIMO_DIA_CERRADO, (ciclo_id,), fetch_one=True)
+
+
+def obtener_resumen_dias_ciclo(ciclo_id: int):
+    """
+    Obtiene día abierto, último día cerrado y total de días de un ciclo con una consulta
+    
+    Returns:
+        dict: {'dia_abierto': fila o None, 'ultimo_dia_cerrado': fila o None,
+               'total_dias': int}. Las filas son las mismas que devuelven
+               obtener_dia_abierto y obtener_ultimo_dia_cerrado
+    """
+    filas = db.execute_query(_SQL_RESUMEN_DIAS_CICLO, {'ciclo_id': ciclo_id})
+    
+    resumen = {'dia_abierto': None, 'ultimo_dia_cerrado': None,
+               'total_dias': filas[0]['total_dias']}
+    
+    for fila in filas:
+        del fila['total_dias']
+        if fila['id'] is None:
+            continue  # Ciclo sin días abiertos ni cerrados: solo la fila de conteo
+        clave = 'dia_abierto' if fila['estado'] == 'abierto' else 'ultimo_dia_cerrado'
+        resumen[clave] = fila
+    
+    return resumen
+
+
+# ===================================================================
+# VENTAS
+# ===================================================================
+
+def contar_ventas_dia(dia_id: int):
+    """Cuenta ventas de un día (con la fila del día ya leída basta dia['ventas_count'])"""
+    return db.execute_scalar(_SQL_CONTAR_VENTAS_DIA, (dia_id,)) or 0
+
+
+def obtener_ventas_dia(dia_id: int):
+    """Obtiene todas las ventas de un día (namedtuple: venta.cantidad, venta.simbolo...)"""
+    return db.execute_query_tuplas(_SQL_VENTAS_DIA, (dia_id,))
+
+
+def obtener_ventas_dia_iter(dia_id: int):
+    """
+    Ventas de un día entregadas de a poco, para exportaciones grandes
+    
+    Returns:
+        Context manager de db.execute_query_iter (diccionarios, mismas columnas
+        que obtener_ventas_dia)
+    
+    Example:
+        with queries.obtener_ventas_dia_iter(dia_id) as ventas:
+            for venta in ventas:
+                ...
+    """
+    return db.execute_query_iter(_SQL_VENTAS_DIA, (dia_id,))
+
+
+def calcular_totales_ventas_dia(dia_id: int):
+    """Calcula totales de ventas de un día"""
+    return db.execute_query(_SQL_TOTALES_VENTAS_DIA, (dia_id,), fetch_one=True)
+
+
+# ===================================================================
+# BÓVEDA
+# ===================================================================
+
+def obtener_capital_boveda(ciclo_id: int):
+    """Obtiene capital total en bóveda del ciclo"""
+    return db.execute_scalar(_SQL_CAPITAL_BOVEDA, (ciclo_id,)) or 0
+
+
+def obtener_criptos_boveda(ciclo_id: int):
+    """Obtiene todas las criptos en bóveda"""
+    return db.execute_query(_SQL_CRIPTOS_BOVEDA, (ciclo_id,))
+
+
+def obtener_boveda_con_capital(ciclo_id: int):
+    """
+    Obtiene las criptos en bóveda y su capital total con una sola consulta
+    
+    Returns:
+        tuple: (lista de criptos como obtener_criptos_boveda, capital total en USD)
+    """
+    criptos = obtener_criptos_boveda(ciclo_id)
+    return criptos, sum(c['valor_usd'] for c in criptos)
+
+
+def obtener_posicion_cripto(ciclo_id: int, cripto_id: int):
+    """Obtiene cantidad y precio promedio de una cripto en bóveda (None si no hay)"""
+    return db.execute_query(_SQL_POSICION_CRIPTO, (ciclo_id, cripto_id), fetch_one=True)
+
+
+def obtener_cantidad_cripto(ciclo_id: int, cripto_id: int):
+    """Obtiene cantidad disponible de una cripto (si también hace falta el precio: obtener_posicion_cripto)"""
+    posicion = obtener_posicion_cripto(ciclo_id, cripto_id)
+    return posicion['cantidad'] if posicion else 0
+
+
+def obtener_precio_promedio_cripto(ciclo_id: int, cripto_id: int):
+    """Obtiene precio promedio de una cripto (si también hace falta la cantidad: obtener_posicion_cripto)"""
+    posicion = obtener_posicion_cripto(ciclo_id, cripto_id)
+    return posicion['precio_promedio'] if posicion else 0
+
+
+# ===================================================================
+# CRIPTOMONEDAS
+# ===================================================================
+
+def listar_criptomonedas():
+    """Lista todas las criptomonedas (se lee de la BD la primera vez)"""
+    global _criptomonedas, _criptos_por_simbolo
+    if _criptomonedas is None:
+        _criptomonedas = db.execute_query(_SQL_CRIPTOMONEDAS)
+        _criptos_por_simbolo = {c['simbolo']: c for c in _criptomonedas}
+    return [dict(c) for c in _criptomonedas]
+
+
+def invalidar_criptomonedas():
+    """Descarta la lista cacheada (llamar tras agregar o modificar criptomonedas)"""
+    global _criptomonedas, _criptos_por_simbolo
+    _criptomonedas = None
+    _criptos_por_simbolo = None
+
+
+def obtener_cripto_por_id(cripto_id: int):
+    """Obtiene una criptomoneda por ID"""
+    return db.execute_query(_SQL_CRIPTO_POR_ID, (cripto_id,), fetch_one=True)
+
+
+def obtener_cripto_por_simbolo(simbolo: str):
+    """Obtiene una criptomoneda por símbolo"""
+    if _criptos_por_simbolo is None:
+        listar_criptomonedas()
+    cripto = _criptos_por_simbolo.get(simbolo.upper())
+    return dict(cripto) if cripto else None
+
+
+# ===================================================================
+# ESTADÍSTICAS
+# ===================================================================
+
+def obtener_estadisticas_generales():
+    """Obtiene estadísticas generales del sistema"""
+    with db.get_cursor() as cursor:
+        # Filas tupla: se desempaqueta la única fila y el dict se arma una sola vez
+        cursor.row_factory = None
+        cursor.execute(_SQL_ESTADISTICAS_GENERALES)
+        (total_ciclos, ciclos_activos, dias_operados, total_ventas,
+         ganancia_total, total_compras, capital_invertido) = cursor.fetchone()
+    
+    return {
+        'total_ciclos': total_ciclos,
+        'ciclos_activos': ciclos_activos,
+        'dias_operados': dias_operados,
+        'total_ventas': total_ventas,
+        'ganancia_total': ganancia_total,
+        'total_compras': total_compras,
+        'capital_invertido': capital_invertido,
+    }
+
+
+# ===================================================================
+# EFECTIVO
+# ===================================================================
+
+def obtener_efectivo_total(ciclo_id: int):
+    """Obtiene efectivo total acumulado en el ciclo"""
+    return db.execute_scalar(_SQL_EFECTIVO_CICLO, (ciclo_id,)) or 0
+
+
+def obtener_efectivo_dia(dia_id: int):
+    """Obtiene efectivo del día"""
+    return db.execute_scalar(_SQL_EFECTIVO_DIA, (dia_id,)) or 0
 
 
 # ===================================================================
 # INSTANCIA GLOBAL
 # ===================================================================
+# Las consultas son funciones del módulo (llamarlas no pasa por el descriptor de
+# staticmethod). El propio módulo hace de "instancia": queries.obtener_config() y
+# Queries.obtener_config() siguen funcionando como con la antigua clase
 
-queries = Queries()
+Queries = queries = sys.modules[__name__]
 
 
 # ===================================================================
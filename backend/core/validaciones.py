@@ -6,9 +6,29 @@ MÓDULO DE VALIDACIONES (COMPLETO)
 Validaciones centralizadas del sistema
 """
 
+import re
 from typing import Tuple, Optional
 
 
+# Margen de error entre la cantidad indicada y monto / tasa (en unidades de la cripto)
+MARGEN_CANTIDAD = 0.00001
+
+# Resultados fijos creados una sola vez: los validadores devuelven siempre la misma
+# tupla en lugar de construir tupla y texto en cada llamada (importaciones masivas)
+_OK = (True, "")
+_ERROR_CANTIDAD = (False, "La cantidad debe ser mayor a 0")
+_ERROR_MONTO = (False, "La monto debe ser mayor a 0")
+_ERROR_PRECIO = (False, "El precio debe ser mayor a 0")
+_ERROR_TASA = (False, "La tasa debe ser mayor a 0")
+_ERROR_COMISION_NEGATIVA = (False, "La comisión no puede ser negativa")
+_ERROR_COMISION_ALTA = (False, "La comisión parece muy alta (>10%)")
+
+# Números tal como se escriben en un campo (espacios alrededor, signo, "1.", ".5", 1e-8).
+# Un patrón compilado responde sin lanzar y capturar ValueError en cada entrada inválida
+_PATRON_NUMERO = re.compile(r"\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*")
+_PATRON_ENTERO = re.compile(r"\s*[+-]?\d+\s*")
+
+
 # ===================================================================
 # VALIDACIONES NUMÉRICAS
 # ===================================================================
@@ -24,10 +44,13 @@ def validar_cantidad_positiva(cantidad: float, nombre: str = "cantidad") -> Tupl
     Returns:
         tuple: (es_valido, mensaje_error)
     """
-    if cantidad <= 0:
-        return False, f"La {nombre} debe ser mayor a 0"
-    
-    return True, ""
+    if cantidad > 0:
+        return _OK
+    if nombre == "cantidad":
+        return _ERROR_CANTIDAD
+    if nombre == "monto":
+        return _ERROR_MONTO
+    return False, f"La {nombre} debe ser mayor a 0"
 
 
 def validar_precio_positivo(precio: float) -> Tuple[bool, str]:
@@ -41,9 +64,9 @@ def validar_precio_positivo(precio: float) -> Tuple[bool, str]:
         tuple: (es_valido, mensaje_error)
     """
     if precio <= 0:
-        return False, "El precio debe ser mayor a 0"
+        return _ERROR_PRECIO
     
-    return True, ""
+    return _OK
 
 
 def validar_porcentaje(porcentaje: float, min_val: float = 0, max_val: float = 100) -> Tuple[bool, str]:
@@ -95,7 +118,7 @@ def validar_venta(cantidad: float, cantidad_disponible: float,
     if not valido:
         return False, msg
     
-    return True, ""
+    return _OK
 
 
 def validar_compra(cantidad: float, monto_usd: float, tasa: float) -> Tuple[bool, str]:
@@ -121,16 +144,15 @@ def validar_compra(cantidad: float, monto_usd: float, tasa: float) -> Tuple[bool
         return False, msg
     
     # Validar tasa
-    valido, msg = validar_precio_positivo(tasa)
-    if not valido:
-        return False, "La tasa debe ser mayor a 0"
+    if tasa <= 0:
+        return _ERROR_TASA
     
-    # Validar coherencia
-    cantidad_esperada = monto_usd / tasa
-    if abs(cantidad - cantidad_esperada) > 0.00001:  # Margen de error
+    # Validar coherencia: |cantidad - monto/tasa| > margen, multiplicado por tasa (> 0)
+    # para no dividir. El piso evita un margen nulo con tasas ínfimas
+    if abs(cantidad * tasa - monto_usd) > max(MARGEN_CANTIDAD * tasa, 1e-9):
         return False, "La cantidad no coincide con el monto y la tasa"
     
-    return True, ""
+    return _OK
 
 
 # ===================================================================
@@ -148,12 +170,12 @@ def validar_comision(comision: float) -> Tuple[bool, str]:
         tuple: (es_valido, mensaje_error)
     """
     if comision < 0:
-        return False, "La comisión no puede ser negativa"
+        return _ERROR_COMISION_NEGATIVA
     
     if comision > 10:
-        return False, "La comisión parece muy alta (>10%)"
+        return _ERROR_COMISION_ALTA
     
-    return True, ""
+    return _OK
 
 
 def validar_ganancia_objetivo(ganancia: float) -> Tuple[bool, str]:
@@ -255,13 +277,9 @@ def es_numero_valido(valor_str: str) -> bool:
         valor_str: Cadena a validar
     
     Returns:
-        bool: True si es un número válido
+        bool: True si es un número válido (no acepta "inf" ni "nan")
     """
-    try:
-        float(valor_str)
-        return True
-    except ValueError:
-        return False
+    return _PATRON_NUMERO.fullmatch(valor_str) is not None
 
 
 def es_entero_valido(valor_str: str) -> bool:
@@ -274,11 +292,7 @@ def es_entero_valido(valor_str: str) -> bool:
     Returns:
         bool: True si es un entero válido
     """
-    try:
-        int(valor_str)
-        return True
-    except ValueError:
-        return False
+    return _PATRON_ENTERO.fullmatch(valor_str) is not None
 
 
 # ===================================================================
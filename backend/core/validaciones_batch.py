@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+MÓDULO DE VALIDACIONES EN LOTE
+=============================================================================
+Las mismas reglas de core.validaciones aplicadas a muchas filas de una vez
+(importación de compras/ventas históricas): un código de estado por fila
+en lugar de una llamada Python por fila
+"""
+
+import os
+import sys
+from typing import List, Sequence
+
+# Ejecutado como script (python core/validaciones_batch.py) no hay paquete: backend/ al path para importar core.*
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# NumPy es opcional: sin él se valida fila a fila con el mismo núcleo
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core.jit import NUMBA_DISPONIBLE, nucleo
+from core.validaciones import MARGEN_CANTIDAD
+
+
+# ===================================================================
+# CÓDIGOS DE ESTADO
+# ===================================================================
+
+COMPRA_OK = 0
+COMPRA_CANTIDAD_INVALIDA = 1
+COMPRA_MONTO_INVALIDO = 2
+COMPRA_TASA_INVALIDA = 3
+COMPRA_INCOHERENTE = 4
+
+# Mensaje de cada código (mismo texto que validar_compra), indexado por el código
+MENSAJES_COMPRA = (
+    "",
+    "La cantidad debe ser mayor a 0",
+    "La monto debe ser mayor a 0",
+    "La tasa debe ser mayor a 0",
+    "La cantidad no coincide con el monto y la tasa",
+)
+
+
+# ===================================================================
+# NÚCLEOS NUMÉRICOS
+# ===================================================================
+
+@nucleo('u1(f8, f8, f8)')
+def _estado_compra(cantidad, monto_usd, tasa):
+    # Mismo orden de comprobación que validar_compra: el primer error es el que se informa
+    if cantidad <= 0:
+        return COMPRA_CANTIDAD_INVALIDA
+    if monto_usd <= 0:
+        return COMPRA_MONTO_INVALIDO
+    if tasa <= 0:
+        return COMPRA_TASA_INVALIDA
+    if abs(cantidad * tasa - monto_usd) > max(MARGEN_CANTIDAD * tasa, 1e-9):
+        return COMPRA_INCOHERENTE
+    return COMPRA_OK
+
+
+@nucleo('u1[::1](f8[::1], f8[::1], f8[::1])')
+def _estados_compras(cantidades, montos, tasas):
+    estados = np.empty(cantidades.shape[0], dtype=np.uint8)
+    for i in range(cantidades.shape[0]):
+        estados[i] = _estado_compra(cantidades[i], montos[i], tasas[i])
+    return estados
+
+
+def _estados_compras_numpy(cantidades, montos, tasas):
+    """Versión vectorizada de _estados_compras para cuando Numba no está instalado"""
+    estados = np.zeros(cantidades.shape[0], dtype=np.uint8)
+
+    # Del último error al primero: cada asignación pisa a las de menor prioridad
+    margen = np.maximum(MARGEN_CANTIDAD * tasas, 1e-9)
+    estados[np.abs(cantidades * tasas - montos) > margen] = COMPRA_INCOHERENTE
+    estados[tasas <= 0] = COMPRA_TASA_INVALIDA
+    estados[montos <= 0] = COMPRA_MONTO_INVALIDO
+    estados[cantidades <= 0] = COMPRA_CANTIDAD_INVALIDA
+
+    return estados
+
+
+# ===================================================================
+# FUNCIONES PÚBLICAS
+# ===================================================================
+
+def validar_compras_array(cantidades: Sequence[float], montos_usd: Sequence[float],
+                          tasas: Sequence[float]):
+    """
+    Valida un lote de compras con las reglas de validar_compra
+
+    Args:
+        cantidades: Cantidad comprada en cada fila
+        montos_usd: Monto en USD de cada fila
+        tasas: Tasa de cambio de cada fila
+
+    Returns:
+        Array uint8 (lista si no hay NumPy) con un código COMPRA_* por fila;
+        MENSAJES_COMPRA[codigo] da el texto del error
+
+    Example:
+        estados = validar_compras_array(cantidades, montos, tasas)
+        errores = np.flatnonzero(estados)
+    """
+    if np is None:
+        return [_estado_compra(c, m, t) for c, m, t in zip(cantidades, montos_usd, tasas)]
+
+    cantidades = np.ascontiguousarray(cantidades, dtype=np.float64)
+    montos_usd = np.ascontiguousarray(montos_usd, dtype=np.float64)
+    tasas = np.ascontiguousarray(tasas, dtype=np.float64)
+
+    if NUMBA_DISPONIBLE:
+        return _estados_compras(cantidades, montos_usd, tasas)
+    return _estados_compras_numpy(cantidades, montos_usd, tasas)
+
+
+def mensajes_compras(estados: Sequence[int]) -> List[str]:
+    """
+    Convierte los códigos de validar_compras_array en mensajes
+
+    Args:
+        estados: Códigos devueltos por validar_compras_array
+
+    Returns:
+        Lista de mensajes ("" para las filas válidas)
+    """
+    return [MENSAJES_COMPRA[estado] for estado in estados]
+
+
+# ===================================================================
+# TESTING
+# ===================================================================
+
+if __name__ == "__main__":
+    from core.validaciones import validar_compra
+
+    print("="*70)
+    print("TEST DE VALIDACIONES EN LOTE")
+    print("="*70)
+
+    filas = [
+        (100, 100, 1),            # OK
+        (0.01, 500, 50000),       # OK
+        (0, 100, 1),              # Cantidad
+        (100, -5, 1),             # Monto
+        (100, 100, 0),            # Tasa
+        (0.0101, 500, 50000),     # Incoherente
+    ]
+    cantidades, montos, tasas = zip(*filas)
+
+    print("\n[Test 1] Mismo resultado que validar_compra:")
+    estados = validar_compras_array(cantidades, montos, tasas)
+    for fila, mensaje in zip(filas, mensajes_compras(estados)):
+        esperado = validar_compra(*fila)[1]
+        print(f"   {fila}: {'✅' if mensaje == esperado else '❌'} {mensaje or 'OK'}")
+
+    print("\n" + "="*70)
+    print("✅ TESTS COMPLETADOS")
+    print("="*70)
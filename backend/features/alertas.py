@@ -7,6 +7,7 @@ Sistema de alertas y notificaciones automáticas
 Detecta situaciones importantes y notifica al usuario
 """
 
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from core.db_manager import db
@@ -70,6 +71,18 @@ def inicializar_tabla_alertas():
 inicializar_tabla_alertas()
 
 
+# ===================================================================
+# CACHE DE CONFIGURACIÓN DE ALERTAS
+# ===================================================================
+# Cada verificador consulta su fila de config_alertas y verificar_todas los ejecuta
+# todos seguidos: la tabla (una fila por tipo) se lee entera una vez y queda en memoria
+# hasta que configurar_alerta la modifica
+
+_config_alertas: Optional[Dict[str, Dict]] = None
+# La API verifica desde el threadpool: un solo hilo recarga la tabla a la vez
+_lock_config_alertas = threading.Lock()
+
+
 # ===================================================================
 # CLASE DE GESTIÓN DE ALERTAS
 # ===================================================================
@@ -107,7 +120,7 @@ class SistemaAlertas:
         Returns:
             int: ID de la alerta creada
         """
-        alerta_id = db.execute_update("""
+        alerta_id = db.execute_insert("""
             INSERT INTO alertas (
                 tipo, nivel, titulo, mensaje,
                 referencia_tipo, referencia_id
@@ -118,28 +131,65 @@ class SistemaAlertas:
         
         return alerta_id
     
+    # ===================================================================
+    # CONFIGURACIÓN CACHEADA
+    # ===================================================================
+    
+    @staticmethod
+    def obtener_config_alerta(tipo_alerta: str) -> Optional[Dict]:
+        """
+        Configuración de un tipo de alerta, solo si está activa
+        
+        Args:
+            tipo_alerta: Tipo de alerta (dia_abierto_largo, capital_bajo...)
+        
+        Returns:
+            dict: Fila de config_alertas, o None si no existe o está desactivada
+        """
+        global _config_alertas
+        
+        config_alertas = _config_alertas
+        if config_alertas is None:
+            with _lock_config_alertas:
+                if _config_alertas is None:
+                    filas = db.execute_query("SELECT tipo_alerta, activa, umbral FROM config_alertas")
+                    _config_alertas = {fila['tipo_alerta']: fila for fila in filas}
+                config_alertas = _config_alertas
+        
+        config = config_alertas.get(tipo_alerta)
+        return config if config and config['activa'] else None
+    
+    @staticmethod
+    def invalidar_config_alertas():
+        """Descarta la configuración cacheada (llamar tras cualquier escritura en config_alertas)"""
+        global _config_alertas
+        with _lock_config_alertas:
+            _config_alertas = None
+    
     # ===================================================================
     # VERIFICADORES DE ALERTAS
     # ===================================================================
     
     @staticmethod
-    def verificar_dia_abierto_largo(ciclo_id: int):
-        """Verifica si hay un día abierto por mucho tiempo"""
+    def verificar_dia_abierto_largo(ciclo_id: int, resumen: Optional[Dict] = None):
+        """
+        Verifica si hay un día abierto por mucho tiempo
+        
+        Args:
+            ciclo_id: ID del ciclo
+            resumen: Resultado de queries.obtener_resumen_dias_ciclo si ya se leyó
+        """
         
-        config = db.execute_query("""
-            SELECT umbral FROM config_alertas
-            WHERE tipo_alerta = 'dia_abierto_largo' AND activa = 1
-        """, fetch_one=True)
+        config = SistemaAlertas.obtener_config_alerta('dia_abierto_largo')
         
         if not config:
             return
         
         horas_limite = config['umbral']
         
-        dia_abierto = db.execute_query("""
-            SELECT * FROM dias
-            WHERE ciclo_id = ? AND estado = 'abierto'
-        """, (ciclo_id,), fetch_one=True)
+        if resumen is None:
+            resumen = queries.obtener_resumen_dias_ciclo(ciclo_id)
+        dia_abierto = resumen['dia_abierto']
         
         if not dia_abierto:
             return
@@ -170,10 +220,7 @@ class SistemaAlertas:
     def verificar_limite_ventas(dia_id: int):
         """Verifica si se está acercando o pasando el límite de ventas"""
         
-        config = db.execute_query("""
-            SELECT activa FROM config_alertas
-            WHERE tipo_alerta = 'limite_ventas' AND activa = 1
-        """, fetch_one=True)
+        config = SistemaAlertas.obtener_config_alerta('limite_ventas')
         
         if not config:
             return
@@ -227,10 +274,7 @@ class SistemaAlertas:
     def verificar_capital_bajo(ciclo_id: int):
         """Verifica si el capital está bajo"""
         
-        config = db.execute_query("""
-            SELECT umbral FROM config_alertas
-            WHERE tipo_alerta = 'capital_bajo' AND activa = 1
-        """, fetch_one=True)
+        config = SistemaAlertas.obtener_config_alerta('capital_bajo')
         
         if not config:
             return
@@ -260,10 +304,7 @@ class SistemaAlertas:
     def verificar_ganancia_negativa(dia_id: int):
         """Verifica si hubo ganancia negativa (pérdida)"""
         
-        config = db.execute_query("""
-            SELECT activa FROM config_alertas
-            WHERE tipo_alerta = 'ganancia_negativa' AND activa = 1
-        """, fetch_one=True)
+        config = SistemaAlertas.obtener_config_alerta('ganancia_negativa')
         
         if not config:
             return
@@ -285,13 +326,16 @@ class SistemaAlertas:
             )
     
     @staticmethod
-    def verificar_ciclo_por_terminar(ciclo_id: int):
-        """Verifica si el ciclo está por terminar"""
+    def verificar_ciclo_por_terminar(ciclo_id: int, resumen: Optional[Dict] = None):
+        """
+        Verifica si el ciclo está por terminar
+        
+        Args:
+            ciclo_id: ID del ciclo
+            resumen: Resultado de queries.obtener_resumen_dias_ciclo si ya se leyó
+        """
         
-        config = db.execute_query("""
-            SELECT umbral FROM config_alertas
-            WHERE tipo_alerta = 'ciclo_por_terminar' AND activa = 1
-        """, fetch_one=True)
+        config = SistemaAlertas.obtener_config_alerta('ciclo_por_terminar')
         
         if not config:
             return
@@ -303,12 +347,9 @@ class SistemaAlertas:
             return
         
         # Calcular días restantes
-        with db.get_cursor(commit=False) as cursor:
-            cursor.execute("""
-                SELECT COUNT(*) as dias_operados
-                FROM dias WHERE ciclo_id = ?
-            """, (ciclo_id,))
-            dias_operados = cursor.fetchone()['dias_operados']
+        if resumen is None:
+            resumen = queries.obtener_resumen_dias_ciclo(ciclo_id)
+        dias_operados = resumen['total_dias']
         
         dias_restantes = ciclo['dias_planificados'] - dias_operados
         
@@ -331,32 +372,32 @@ class SistemaAlertas:
                 )
     
     @staticmethod
-    def verificar_sin_operar(ciclo_id: int):
-        """Verifica si lleva días sin operar"""
+    def verificar_sin_operar(ciclo_id: int, resumen: Optional[Dict] = None):
+        """
+        Verifica si lleva días sin operar
         
-        config = db.execute_query("""
-            SELECT umbral FROM config_alertas
-            WHERE tipo_alerta = 'sin_operar' AND activa = 1
-        """, fetch_one=True)
+        Args:
+            ciclo_id: ID del ciclo
+            resumen: Resultado de queries.obtener_resumen_dias_ciclo si ya se leyó
+        """
+        
+        config = SistemaAlertas.obtener_config_alerta('sin_operar')
         
         if not config:
             return
         
         dias_limite = config['umbral']
         
-        ultimo_dia = db.execute_query("""
-            SELECT * FROM dias
-            WHERE ciclo_id = ?
-            ORDER BY numero_dia DESC
-            LIMIT 1
-        """, (ciclo_id,), fetch_one=True)
+        if resumen is None:
+            resumen = queries.obtener_resumen_dias_ciclo(ciclo_id)
         
+        if resumen['dia_abierto']:
+            return  # Hay un día abierto
+        
+        ultimo_dia = resumen['ultimo_dia_cerrado']
         if not ultimo_dia:
             return
         
-        if ultimo_dia['estado'] == 'abierto':
-            return  # Hay un día abierto
-        
         fecha_ultimo = datetime.strptime(ultimo_dia['fecha_cierre'], '%Y-%m-%d %H:%M:%S')
         dias_sin_operar = (datetime.now() - fecha_ultimo).days
         
@@ -383,10 +424,7 @@ class SistemaAlertas:
     def verificar_objetivo_alcanzado(ciclo_id: int, objetivo_usd: float):
         """Verifica si se alcanzó un objetivo de ganancia"""
         
-        config = db.execute_query("""
-            SELECT activa FROM config_alertas
-            WHERE tipo_alerta = 'objetivo_alcanzado' AND activa = 1
-        """, fetch_one=True)
+        config = SistemaAlertas.obtener_config_alerta('objetivo_alcanzado')
         
         if not config:
             return
@@ -422,10 +460,7 @@ class SistemaAlertas:
     def verificar_rendimiento_bajo(dia_id: int):
         """Verifica si el rendimiento del día fue bajo"""
         
-        config = db.execute_query("""
-            SELECT umbral FROM config_alertas
-            WHERE tipo_alerta = 'rendimiento_bajo' AND activa = 1
-        """, fetch_one=True)
+        config = SistemaAlertas.obtener_config_alerta('rendimiento_bajo')
         
         if not config:
             return
@@ -471,20 +506,23 @@ class SistemaAlertas:
                 return
             ciclo_id = ciclo['id']
         
+        # Días del ciclo leídos una vez para todas las verificaciones que los usan
+        resumen = queries.obtener_resumen_dias_ciclo(ciclo_id)
+        
         # Verificar día abierto largo
-        SistemaAlertas.verificar_dia_abierto_largo(ciclo_id)
+        SistemaAlertas.verificar_dia_abierto_largo(ciclo_id, resumen)
         
         # Verificar capital bajo
         SistemaAlertas.verificar_capital_bajo(ciclo_id)
         
         # Verificar ciclo por terminar
-        SistemaAlertas.verificar_ciclo_por_terminar(ciclo_id)
+        SistemaAlertas.verificar_ciclo_por_terminar(ciclo_id, resumen)
         
         # Verificar sin operar
-        SistemaAlertas.verificar_sin_operar(ciclo_id)
+        SistemaAlertas.verificar_sin_operar(ciclo_id, resumen)
         
         # Verificar límite de ventas en día abierto
-        dia_abierto = queries.obtener_dia_abierto(ciclo_id)
+        dia_abierto = resumen['dia_abierto']
         if dia_abierto:
             SistemaAlertas.verificar_limite_ventas(dia_abierto['id'])
     
@@ -532,7 +570,7 @@ class SistemaAlertas:
     @staticmethod
     def marcar_leida(alerta_id: int):
         """Marca una alerta como leída"""
-        db.execute_update("""
+        db.execute_modify("""
             UPDATE alertas
             SET leida = 1, fecha_lectura = datetime('now')
             WHERE id = ?
@@ -541,7 +579,7 @@ class SistemaAlertas:
     @staticmethod
     def marcar_todas_leidas():
         """Marca todas las alertas como leídas"""
-        db.execute_update("""
+        db.execute_modify("""
             UPDATE alertas
             SET leida = 1, fecha_lectura = datetime('now')
             WHERE leida = 0
@@ -551,7 +589,7 @@ class SistemaAlertas:
     @staticmethod
     def eliminar_alertas_antiguas(dias: int = 30):
         """Elimina alertas antiguas"""
-        db.execute_update("""
+        db.execute_modify("""
             DELETE FROM alertas
             WHERE datetime(fecha_creacion) < datetime('now', '-' || ? || ' days')
         """, (dias,))
@@ -564,11 +602,12 @@ class SistemaAlertas:
     @staticmethod
     def configurar_alerta(tipo_alerta: str, activa: bool, umbral: Optional[float] = None):
         """Configura una alerta específica"""
-        db.execute_update("""
+        db.execute_modify("""
             UPDATE config_alertas
             SET activa = ?, umbral = ?
             WHERE tipo_alerta = ?
         """, (1 if activa else 0, umbral, tipo_alerta))
+        SistemaAlertas.invalidar_config_alertas()
         
         log.info(f"Alerta '{tipo_alerta}' configurada: activa={activa}, umbral={umbral}", categoria='alertas')
     
@@ -98,7 +98,7 @@ class GestorNotas:
         # Convertir etiquetas a texto
         etiquetas_str = ','.join(etiquetas) if etiquetas else ''
         
-        nota_id = db.execute_update("""
+        nota_id = db.execute_insert("""
             INSERT INTO notas (
                 tipo, referencia_id, titulo, contenido, 
                 prioridad, etiquetas, autor
@@ -260,7 +260,7 @@ class GestorNotas:
         valores.append(nota_id)
         
         query = f"UPDATE notas SET {', '.join(campos)} WHERE id = ?"
-        db.execute_update(query, tuple(valores))
+        db.execute_modify(query, tuple(valores))
         
         log.info(f"Nota #{nota_id} actualizada", categoria='general')
         return True
@@ -268,7 +268,7 @@ class GestorNotas:
     @staticmethod
     def eliminar_nota(nota_id: int):
         """Elimina una nota"""
-        db.execute_update("DELETE FROM notas WHERE id = ?", (nota_id,))
+        db.execute_modify("DELETE FROM notas WHERE id = ?", (nota_id,))
         log.info(f"Nota #{nota_id} eliminada", categoria='general')
         return True
     
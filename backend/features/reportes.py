@@ -9,6 +9,7 @@ Exporta datos a CSV, TXT y genera resúmenes ejecutivos
 
 import csv
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
 from typing import List, Dict, Optional
 from core.db_manager import db
@@ -134,9 +135,9 @@ class GeneradorReportes:
                         if ventas:
                             f.write("\n  VENTAS:\n")
                             for i, venta in enumerate(ventas, 1):
-                                f.write(f"    [{i}] {venta['cantidad']:.8f} {venta['simbolo']} ")
-                                f.write(f"@ ${venta['precio_unitario']:.4f} = ")
-                                f.write(f"${venta['efectivo_recibido']:.2f}\n")
+                                f.write(f"    [{i}] {venta.cantidad:.8f} {venta.simbolo} ")
+                                f.write(f"@ ${venta.precio_unitario:.4f} = ")
+                                f.write(f"${venta.efectivo_recibido:.2f}\n")
                     
                     f.write("\n")
             
@@ -199,7 +200,7 @@ class GeneradorReportes:
             
             # Datos
             for dia in dias:
-                num_ventas = queries.contar_ventas_dia(dia['id'])
+                num_ventas = dia['ventas_count']
                 
                 writer.writerow([
                     dia['numero_dia'],
@@ -230,7 +231,8 @@ class GeneradorReportes:
         Returns:
             Path: Ruta del archivo generado
         """
-        ventas = db.execute_query("""
+        # Se escribe a medida que se lee: el ciclo completo nunca está entero en memoria
+        with db.execute_query_iter("""
             SELECT 
                 d.numero_dia,
                 d.fecha,
@@ -249,40 +251,41 @@ class GeneradorReportes:
             JOIN criptomonedas c ON v.cripto_id = c.id
             WHERE d.ciclo_id = ?
             ORDER BY d.numero_dia, v.fecha
-        """, (ciclo_id,))
-        
-        if not ventas:
-            print(f"❌ No hay ventas en el ciclo #{ciclo_id}")
-            return None
-        
-        archivo = REPORTES_DIR / f"ciclo_{ciclo_id}_ventas_{self.timestamp}.csv"
-        
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
+        """, (ciclo_id,)) as ventas:
+            primera = next(ventas, None)
             
-            # Encabezados
-            writer.writerow([
-                'Día', 'Fecha', 'Cripto', 'Símbolo', 'Cantidad', 'Precio Unitario',
-                'Costo Total', 'Monto Venta', 'Comisión', 'Efectivo Recibido',
-                'Ganancia Bruta', 'Ganancia Neta'
-            ])
+            if primera is None:
+                print(f"❌ No hay ventas en el ciclo #{ciclo_id}")
+                return None
             
-            # Datos
-            for venta in ventas:
+            archivo = REPORTES_DIR / f"ciclo_{ciclo_id}_ventas_{self.timestamp}.csv"
+            
+            with open(archivo, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                
+                # Encabezados
                 writer.writerow([
-                    venta['numero_dia'],
-                    venta['fecha'],
-                    venta['cripto'],
-                    venta['simbolo'],
-                    f"{venta['cantidad']:.8f}",
-                    f"{venta['precio_unitario']:.4f}",
-                    f"{venta['costo_total']:.2f}",
-                    f"{venta['monto_venta']:.2f}",
-                    f"{venta['comision']:.2f}",
-                    f"{venta['efectivo_recibido']:.2f}",
-                    f"{venta['ganancia_bruta']:.2f}",
-                    f"{venta['ganancia_neta']:.2f}"
+                    'Día', 'Fecha', 'Cripto', 'Símbolo', 'Cantidad', 'Precio Unitario',
+                    'Costo Total', 'Monto Venta', 'Comisión', 'Efectivo Recibido',
+                    'Ganancia Bruta', 'Ganancia Neta'
                 ])
+                
+                # Datos
+                for venta in chain((primera,), ventas):
+                    writer.writerow([
+                        venta['numero_dia'],
+                        venta['fecha'],
+                        venta['cripto'],
+                        venta['simbolo'],
+                        f"{venta['cantidad']:.8f}",
+                        f"{venta['precio_unitario']:.4f}",
+                        f"{venta['costo_total']:.2f}",
+                        f"{venta['monto_venta']:.2f}",
+                        f"{venta['comision']:.2f}",
+                        f"{venta['efectivo_recibido']:.2f}",
+                        f"{venta['ganancia_bruta']:.2f}",
+                        f"{venta['ganancia_neta']:.2f}"
+                    ])
         
         print(f"✅ Reporte de ventas generado: {archivo.name}")
         return archivo
@@ -282,9 +282,21 @@ def crear_indices(conn):
     print("\n📊 Creando índices...")
     
     indices = [
+        ("idx_ciclos_estado", "CREATE INDEX IF NOT EXISTS idx_ciclos_estado ON ciclos(estado)"),
         ("idx_dias_ciclo", "CREATE INDEX IF NOT EXISTS idx_dias_ciclo ON dias(ciclo_id)"),
+        ("idx_dias_ciclo_estado", "CREATE INDEX IF NOT EXISTS idx_dias_ciclo_estado ON dias(ciclo_id, estado, ganancia_neta)"),
         ("idx_ventas_dia", "CREATE INDEX IF NOT EXISTS idx_ventas_dia ON ventas(dia_id)"),
+        ("idx_ventas_dia_fecha", "CREATE INDEX IF NOT EXISTS idx_ventas_dia_fecha ON ventas(dia_id, fecha)"),
+        ("idx_ventas_fecha", "CREATE INDEX IF NOT EXISTS idx_ventas_fecha ON ventas(fecha)"),
+        ("idx_dias_abierto", "CREATE INDEX IF NOT EXISTS idx_dias_abierto ON dias(id) WHERE estado = 'abierto'"),
+        ("idx_ciclos_activo", "CREATE INDEX IF NOT EXISTS idx_ciclos_activo ON ciclos(id) WHERE estado = 'activo'"),
+        ("idx_dias_ciclo_numero", "CREATE INDEX IF NOT EXISTS idx_dias_ciclo_numero ON dias(ciclo_id, numero_dia)"),
+        ("idx_dias_abierto_por_ciclo", "CREATE UNIQUE INDEX IF NOT EXISTS idx_dias_abierto_por_ciclo ON dias(ciclo_id) WHERE estado = 'abierto'"),
+        ("idx_dias_ciclo_estado_num", "CREATE INDEX IF NOT EXISTS idx_dias_ciclo_estado_num ON dias(ciclo_id, estado, numero_dia)"),
         ("idx_boveda_ciclo", "CREATE INDEX IF NOT EXISTS idx_boveda_ciclo ON boveda_ciclo(ciclo_id)"),
+        ("idx_boveda_ciclo_cant", "CREATE INDEX IF NOT EXISTS idx_boveda_ciclo_cant ON boveda_ciclo(ciclo_id, cantidad) WHERE cantidad > 0"),
+        ("idx_efectivo_ciclo", "CREATE INDEX IF NOT EXISTS idx_efectivo_ciclo ON efectivo_banco(ciclo_id)"),
+        ("idx_efectivo_dia", "CREATE INDEX IF NOT EXISTS idx_efectivo_dia ON efectivo_banco(dia_id)"),
         ("idx_compras_ciclo", "CREATE INDEX IF NOT EXISTS idx_compras_ciclo ON compras(ciclo_id)"),
         ("idx_notas_tipo", "CREATE INDEX IF NOT EXISTS idx_notas_tipo ON notas(tipo)"),
         ("idx_notas_referencia", "CREATE INDEX IF NOT EXISTS idx_notas_referencia ON notas(tipo, referencia_id)"),
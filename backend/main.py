@@ -4,7 +4,7 @@ Servidor principal FastAPI
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import uvicorn
 from datetime import datetime
 import sys
@@ -15,6 +15,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Importar configuración
 from config import settings, init_directories
+from core.db_manager import db
+from verificar_planes import verificar_planes
 
 # Importar routers
 from api.routes import auth, dashboard, operaciones, boveda, ciclos, configuracion
@@ -25,7 +27,9 @@ app = FastAPI(
     description="API REST para gestión de arbitraje P2P en criptomonedas",
     version=settings.VERSION,
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    # orjson serializa las respuestas (floats, date y datetime) mucho más rápido que json
+    default_response_class=ORJSONResponse
 )
 
 # Configurar CORS
@@ -49,6 +53,22 @@ async def startup_event():
     init_directories()
     print("✅ Directorios inicializados")
     
+    # Conexiones SQLite abiertas de antemano y compartidas por todas las peticiones
+    conexiones = db.precalentar()
+    print(f"✅ Pool de base de datos listo ({conexiones} conexiones, journal {db.modo_journal})")
+    if db.modo_journal != "wal":
+        print("⚠️  SQLite no aceptó journal_mode=WAL: las lecturas esperarán a las escrituras")
+    if db.mmap_bytes:
+        print(f"✅ Lecturas con mmap ({db.mmap_bytes // (1024 * 1024)} MiB)")
+    
+    # Un cambio de esquema que deje sin índice a una consulta se avisa al desplegar,
+    # no cuando la tabla crezca y la latencia suba
+    problemas = verificar_planes()
+    for problema in problemas:
+        print(f"⚠️  Plan de consulta sin índice: {problema}")
+    if not problemas:
+        print("✅ Planes de consulta verificados")
+    
     print("📡 Registrando rutas del API...")
     print("✅ Servidor listo")
 
@@ -56,6 +76,7 @@ async def startup_event():
 async def shutdown_event():
     """Limpieza al cerrar el servidor"""
     print("👋 Cerrando servidor...")
+    db.cerrar()
 
 # Endpoints principales
 @app.get("/")
@@ -96,7 +117,7 @@ app.include_router(configuracion.router, prefix="/api/config", tags=["Configurac
 # Manejador de errores global
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": True,
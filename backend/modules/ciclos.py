@@ -51,7 +51,7 @@ def crear_ciclo(dias_duracion=15):
             return None
     
     # Insertar ciclo
-    ciclo_id = db.execute_update("""
+    ciclo_id = db.execute_insert("""
         INSERT INTO ciclos (
             fecha_inicio, 
             fecha_fin_estimada, 
@@ -325,7 +325,7 @@ def cerrar_ciclo(ciclo_id):
         return False
     
     # Actualizar ciclo en BD
-    db.execute_update("""
+    db.execute_modify("""
         UPDATE ciclos SET
             estado = 'cerrado',
             fecha_cierre = datetime('now'),
@@ -366,7 +366,7 @@ def extender_ciclo(ciclo_id, dias_adicionales):
     nueva_fecha_fin = fecha_inicio + timedelta(days=nueva_duracion)
     
     # Actualizar ciclo
-    db.execute_update("""
+    db.execute_modify("""
         UPDATE ciclos SET
             dias_planificados = ?,
             fecha_fin_estimada = ?
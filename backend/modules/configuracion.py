@@ -15,6 +15,7 @@ import json
 from datetime import datetime
 from core.logger import log
 from core.db_manager import db
+from core.queries import queries
 
 
 # ===================================================================
@@ -73,6 +74,7 @@ def inicializar_tablas_config():
                 VALUES (1, 0.35, 2.0)
             """)
     
+    queries.invalidar_config()
     log.info("Tablas de configuración inicializadas", categoria='general')
 
 
@@ -97,7 +99,7 @@ def modificar_comision_manual(nueva_comision):
     
     comision_anterior = obtener_comision_actual()['comision_default']
     
-    db.execute_update("""
+    db.execute_modify("""
         UPDATE config SET
             comision_default = ?,
             modo_comision = 'manual',
@@ -105,6 +107,7 @@ def modificar_comision_manual(nueva_comision):
             actualizado = datetime('now')
         WHERE id = 1
     """, (nueva_comision,))
+    queries.invalidar_config()
     
     log.info(
         f"Comisión actualizada manualmente: {comision_anterior}% → {nueva_comision}%",
@@ -125,7 +128,7 @@ def configurar_api_comision(plataforma, api_key=None, api_secret=None):
     """, (plataforma,), fetch_one=True)
     
     if existe:
-        db.execute_update("""
+        db.execute_modify("""
             UPDATE apis_config SET
                 api_key = ?,
                 api_secret = ?,
@@ -134,7 +137,7 @@ def configurar_api_comision(plataforma, api_key=None, api_secret=None):
             WHERE id = ?
         """, (api_key, api_secret, existe['id']))
     else:
-        db.execute_update("""
+        db.execute_insert("""
             INSERT INTO apis_config (nombre, plataforma, api_key, api_secret, tipo, activa)
             VALUES (?, ?, ?, ?, 'comision', 1)
         """, (f"API Comisiones {plataforma}", plataforma, api_key, api_secret))
@@ -197,12 +200,13 @@ def actualizar_comision_automatica():
     comision_obtenida = obtener_comision_desde_api(apis[0]['plataforma'])
     
     if comision_obtenida:
-        db.execute_update("""
+        db.execute_modify("""
             UPDATE config SET
                 comision_default = ?,
                 actualizado = datetime('now')
             WHERE id = 1
         """, (comision_obtenida,))
+        queries.invalidar_config()
         
         print(f"✅ Comisión actualizada desde API: {comision_obtenida}%")
         log.info(f"Comisión actualizada automáticamente: {comision_obtenida}%", categoria='general')
@@ -236,12 +240,13 @@ def modificar_ganancia_objetivo(nueva_ganancia):
     
     ganancia_anterior = obtener_ganancia_objetivo()
     
-    db.execute_update("""
+    db.execute_modify("""
         UPDATE config SET
             ganancia_neta_default = ?,
             actualizado = datetime('now')
         WHERE id = 1
     """, (nueva_ganancia,))
+    queries.invalidar_config()
     
     log.info(
         f"Ganancia objetivo actualizada: {ganancia_anterior}% → {nueva_ganancia}%",
@@ -272,13 +277,14 @@ def modificar_limites_ventas(minimo, maximo):
         print("❌ Límites inválidos")
         return False
     
-    db.execute_update("""
+    db.execute_modify("""
         UPDATE config SET
             limite_ventas_min = ?,
             limite_ventas_max = ?,
             actualizado = datetime('now')
         WHERE id = 1
     """, (minimo, maximo))
+    queries.invalidar_config()
     
     log.info(f"Límites de ventas actualizados: {minimo}-{maximo}", categoria='general')
     print(f"✅ Límites actualizados: {minimo}-{maximo} ventas/día")
@@ -300,7 +306,7 @@ def listar_apis_configuradas():
 def agregar_api_plataforma(nombre, plataforma, api_key, api_secret, tipo='trading'):
     """Agrega una nueva API al sistema"""
     
-    db.execute_update("""
+    db.execute_insert("""
         INSERT INTO apis_config (nombre, plataforma, api_key, api_secret, tipo, activa)
         VALUES (?, ?, ?, ?, ?, 1)
     """, (nombre, plataforma, api_key, api_secret, tipo))
@@ -315,7 +321,7 @@ def activar_desactivar_api(api_id, activar=True):
     
     estado = 1 if activar else 0
     
-    db.execute_update("""
+    db.execute_modify("""
         UPDATE apis_config SET
             activa = ?,
             ultima_actualizacion = datetime('now')
@@ -331,7 +337,7 @@ def activar_desactivar_api(api_id, activar=True):
 def eliminar_api(api_id):
     """Elimina una API del sistema"""
     
-    db.execute_update("DELETE FROM apis_config WHERE id = ?", (api_id,))
+    db.execute_modify("DELETE FROM apis_config WHERE id = ?", (api_id,))
     
     log.info(f"API #{api_id} eliminada", categoria='general')
     print(f"✅ API eliminada")
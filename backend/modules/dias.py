@@ -67,14 +67,19 @@ def obtener_criptos_disponibles(ciclo_id):
 
 def calcular_capital_actual_criptos(ciclo_id):
     """Calcula el valor total de las criptos disponibles"""
-    criptos = obtener_criptos_disponibles(ciclo_id)
+    # Una columna por lista: el total se calcula en un solo producto escalar
+    cantidades, precios = [], []
     
-    criptos_info = [
-        (c['nombre'], c['cantidad'], c['precio_promedio'])
-        for c in criptos
-    ]
+    with db.execute_query_iter("""
+        SELECT cantidad, precio_promedio
+        FROM boveda_ciclo
+        WHERE ciclo_id = ? AND cantidad > 0
+    """, (ciclo_id,)) as criptos:
+        for c in criptos:
+            cantidades.append(c['cantidad'])
+            precios.append(c['precio_promedio'])
     
-    return calc.calcular_capital_total(criptos_info)
+    return calc.calcular_capital_total(cantidades, precios)
 
 
 def obtener_dia(dia_id):
@@ -171,7 +176,7 @@ def iniciar_dia(ciclo_id):
     ]
     
     # Insertar día en BD
-    dia_id = db.execute_update("""
+    dia_id = db.execute_insert("""
         INSERT INTO dias (
             ciclo_id, numero_dia, capital_inicial, 
             estado, fecha
@@ -221,7 +226,7 @@ def definir_precio_venta(dia_id, cripto_id, precio_publicado):
     )
     
     # Actualizar día con la info
-    db.execute_update("""
+    db.execute_modify("""
         UPDATE dias SET
             cripto_operada_id = ?,
             precio_publicado = ?
@@ -325,12 +330,12 @@ def registrar_venta(dia_id, cripto_id, cantidad, precio_unitario):
                 cripto_id,
                 cantidad,
                 precio_unitario,
-                resultado_venta['costo_total'],
-                resultado_venta['monto_venta'],
-                resultado_venta['comision'],
-                resultado_venta['efectivo_recibido'],
-                resultado_venta['ganancia_bruta'],
-                resultado_venta['ganancia_neta']
+                resultado_venta.costo_total,
+                resultado_venta.monto_venta,
+                resultado_venta.comision,
+                resultado_venta.efectivo_recibido,
+                resultado_venta.ganancia_bruta,
+                resultado_venta.ganancia_neta
             ))
             
             # 2. Actualizar bóveda (restar cantidad vendida)
@@ -347,7 +352,7 @@ def registrar_venta(dia_id, cripto_id, cantidad, precio_unitario):
             """, (
                 ciclo_id,
                 dia_id,
-                resultado_venta['efectivo_recibido'],
+                resultado_venta.efectivo_recibido,
                 f"Venta de {cantidad:.8f} {cripto['simbolo']}"
             ))
             
@@ -362,9 +367,9 @@ def registrar_venta(dia_id, cripto_id, cantidad, precio_unitario):
             cripto=cripto['nombre'],
             cantidad_vendida=cantidad,
             precio_unitario=precio_unitario,
-            monto_total=resultado_venta['efectivo_recibido'],
-            comision_pagada=resultado_venta['comision'],
-            ganancia_neta=resultado_venta['ganancia_neta']
+            monto_total=resultado_venta.efectivo_recibido,
+            comision_pagada=resultado_venta.comision,
+            ganancia_neta=resultado_venta.ganancia_neta
         )
         
         return True
@@ -436,7 +441,7 @@ def cerrar_dia(dia_id, ciclo_id):
     """, (dia_id,), fetch_one=True)
     
     # Actualizar día
-    db.execute_update("""
+    db.execute_modify("""
         UPDATE dias SET
             capital_final = ?,
             efectivo_recibido = ?,
@@ -456,7 +461,7 @@ def cerrar_dia(dia_id, ciclo_id):
     ))
     
     # Actualizar contador de días operados en el ciclo
-    db.execute_update("""
+    db.execute_modify("""
         UPDATE ciclos
         SET dias_operados = dias_operados + 1,
             ganancia_total = ganancia_total + ?
@@ -17,7 +17,7 @@ import shutil
 from datetime import datetime, timedelta
 from pathlib import Path
 from core.logger import log
-from core.db_manager import db
+from core.db_manager import db, SUFIJOS_WAL
 
 
 # ===================================================================
@@ -42,8 +42,12 @@ def crear_backup():
     backup_file = BACKUP_DIR / f"arbitraje_backup_{timestamp}.db"
     
     try:
-        # Copiar archivo de base de datos directamente
-        shutil.copy2('arbitraje.db', backup_file)
+        # En modo WAL lo último confirmado puede estar solo en el -wal: pasarlo al .db
+        # antes de copiar, y copiar igualmente los auxiliares que queden
+        db.checkpoint()
+        for archivo in db.archivos_bd():
+            sufijo = archivo.name[len(db.db_path.name):]
+            shutil.copy2(archivo, f"{backup_file}{sufijo}")
         
         # Calcular tamaño del backup
         tamaño_mb = backup_file.stat().st_size / (1024 * 1024)
@@ -122,8 +126,18 @@ def restaurar_backup(backup_file):
         print("\nCreando backup de seguridad de la BD actual...")
         backup_seguridad = crear_backup()
         
-        # Copiar el backup sobre la BD actual
-        shutil.copy2(backup_file, 'arbitraje.db')
+        # Cerrar las conexiones y quitar el -wal/-shm actuales: si quedaran,
+        # SQLite los aplicaría sobre la BD restaurada
+        db.cerrar()
+        for archivo in db.archivos_bd()[1:]:
+            archivo.unlink()
+        
+        # Copiar el backup (y sus auxiliares, si los tiene) sobre la BD actual
+        shutil.copy2(backup_file, db.db_path)
+        for sufijo in SUFIJOS_WAL:
+            auxiliar = Path(f"{backup_file}{sufijo}")
+            if auxiliar.exists():
+                shutil.copy2(auxiliar, f"{db.db_path}{sufijo}")
         
         log.info(f"Base de datos restaurada desde {backup_file.name}", categoria='general')
         
@@ -154,6 +168,8 @@ def eliminar_backups_antiguos(dias=30):
             try:
                 print(f"   Eliminando: {backup.name} ({fecha_backup.strftime('%Y-%m-%d')})")
                 backup.unlink()
+                for sufijo in SUFIJOS_WAL:
+                    Path(f"{backup}{sufijo}").unlink(missing_ok=True)
                 backups_eliminados += 1
                 log.info(f"Backup antiguo eliminado: {backup.name}", categoria='general')
             except Exception as e:
@@ -296,17 +312,18 @@ def optimizar_bd():
     print("="*60)
     
     try:
-        with db.get_cursor(commit=True) as cursor:
-            # 1. VACUUM - Reconstruye BD y recupera espacio
-            print("\n[1/3] Ejecutando VACUUM...")
-            cursor.execute("VACUUM")
-            print("   ✅ VACUUM completado")
-            
-            # 2. ANALYZE - Actualiza estadísticas para optimizar queries
-            print("\n[2/3] Ejecutando ANALYZE...")
-            cursor.execute("ANALYZE")
-            print("   ✅ ANALYZE completado")
-            
+        # VACUUM no puede correr dentro de una transacción: va fuera de get_cursor(commit=True)
+        # 1. VACUUM - Reconstruye BD y recupera espacio
+        print("\n[1/3] Ejecutando VACUUM...")
+        db.ejecutar_mantenimiento("VACUUM")
+        print("   ✅ VACUUM completado")
+        
+        # 2. ANALYZE - Actualiza estadísticas para optimizar queries
+        print("\n[2/3] Ejecutando ANALYZE...")
+        db.ejecutar_mantenimiento("ANALYZE")
+        print("   ✅ ANALYZE completado")
+        
+        with db.get_cursor() as cursor:
             # 3. Verificar índices
             print("\n[3/3] Verificando índices...")
             cursor.execute("""
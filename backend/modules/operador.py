@@ -14,7 +14,7 @@ from datetime import datetime
 from typing import Optional, Dict, List
 from core.db_manager import db
 from core.logger import log
-from core.calculos import calc
+from core.calculos import calc, CalculadoraVenta
 from core.queries import queries
 from core.validaciones import validar_cantidad_positiva, validar_precio_positivo
 
@@ -65,7 +65,7 @@ def registrar_venta_manual(dia_id: int, cripto_id: int, cantidad: float,
         raise ValueError("Error al calcular la venta")
     
     # Insertar venta en BD
-    venta_id = db.execute_update("""
+    venta_id = db.execute_insert("""
         INSERT INTO ventas (
             dia_id, cripto_id, cantidad, precio_unitario,
             costo_total, monto_venta, comision, efectivo_recibido,
@@ -76,12 +76,12 @@ def registrar_venta_manual(dia_id: int, cripto_id: int, cantidad: float,
         cripto_id,
         cantidad,
         precio_unitario,
-        venta_calculada['costo_total'],
-        venta_calculada['monto_venta'],
-        venta_calculada['comision'],
-        venta_calculada['efectivo_recibido'],
-        venta_calculada['ganancia_bruta'],
-        venta_calculada['ganancia_neta']
+        venta_calculada.costo_total,
+        venta_calculada.monto_venta,
+        venta_calculada.comision,
+        venta_calculada.efectivo_recibido,
+        venta_calculada.ganancia_bruta,
+        venta_calculada.ganancia_neta
     ))
     
     # ⭐ CRÍTICO: ACTUALIZAR BÓVEDA
@@ -114,10 +114,10 @@ def registrar_venta_manual(dia_id: int, cripto_id: int, cantidad: float,
                 ganancia_neta = ganancia_neta + ?
             WHERE id = ?
         """, (
-            venta_calculada['efectivo_recibido'],
-            venta_calculada['comision'],
-            venta_calculada['ganancia_bruta'],
-            venta_calculada['ganancia_neta'],
+            venta_calculada.efectivo_recibido,
+            venta_calculada.comision,
+            venta_calculada.ganancia_bruta,
+            venta_calculada.ganancia_neta,
             dia_id
         ))
     
@@ -133,9 +133,9 @@ def registrar_venta_manual(dia_id: int, cripto_id: int, cantidad: float,
         cripto['simbolo'],
         cantidad,
         precio_unitario,
-        venta_calculada['monto_venta'],
-        venta_calculada['comision'],
-        venta_calculada['ganancia_neta']
+        venta_calculada.monto_venta,
+        venta_calculada.comision,
+        venta_calculada.ganancia_neta
     )
     
     return venta_id
@@ -185,7 +185,7 @@ def iniciar_dia_operacion(ciclo_id: int, capital_inicial: float) -> int:
     numero_dia = (ultimo_dia['ultimo'] or 0) + 1
     
     # Crear día
-    dia_id = db.execute_update("""
+    dia_id = db.execute_insert("""
         INSERT INTO dias (
             ciclo_id, numero_dia, capital_inicial, estado
         ) VALUES (?, ?, ?, 'abierto')
@@ -248,7 +248,7 @@ def cerrar_dia_operacion(dia_id: int) -> bool:
     capital_final = dia['capital_inicial'] + ganancia_neta_total
     
     # ⭐ ACTUALIZAR DÍA
-    db.execute_update("""
+    db.execute_modify("""
         UPDATE dias
         SET capital_final = ?,
             efectivo_recibido = ?,
@@ -366,7 +366,7 @@ def aplicar_interes_compuesto(ciclo_id: int) -> bool:
             return False
         
         # Registrar compra
-        compra_id = db.execute_update("""
+        compra_id = db.execute_insert("""
             INSERT INTO compras (
                 ciclo_id, cripto_id, cantidad, monto_usd, tasa
             ) VALUES (?, ?, ?, ?, ?)
@@ -458,6 +458,9 @@ def modulo_operador():
     print(f"    Restantes: {dias_restantes} días")
     print(f"    Inversión inicial: ${ciclo['inversion_inicial']:.2f}")
     
+    # Criptos en bóveda y su total: una consulta sirve para el capital del día y el listado
+    criptos_disponibles, capital_boveda = queries.obtener_boveda_con_capital(ciclo['id'])
+    
     # Verificar si hay día abierto
     dia_abierto = queries.obtener_dia_abierto(ciclo['id'])
     
@@ -475,8 +478,6 @@ def modulo_operador():
         
     else:
         # Iniciar nuevo día
-        capital_boveda = queries.obtener_capital_boveda(ciclo['id'])
-        
         print(f"\nIniciando nuevo dia de operacion...")
         dia_id = iniciar_dia_operacion(ciclo['id'], capital_boveda)
         capital_inicial = capital_boveda
@@ -494,8 +495,6 @@ def modulo_operador():
     print(f"Capital inicial del dia: ${capital_inicial:.2f}")
     
     # Mostrar capital disponible por cripto
-    criptos_disponibles = queries.obtener_criptos_boveda(ciclo['id'])
-    
     if not criptos_disponibles:
         print("\n❌ No hay criptos en la bóveda")
         print("   Fondea la bóveda primero en: Gestión > Bóveda")
@@ -503,11 +502,9 @@ def modulo_operador():
         return
     
     print("\nCapital actual:")
-    total_capital = 0
     for cripto in criptos_disponibles:
         print(f"  - {cripto['cantidad']:.8f} {cripto['nombre']} ({cripto['simbolo']}) = ${cripto['valor_usd']:.2f}")
-        total_capital += cripto['valor_usd']
-    print(f"  Total: ${total_capital:.2f} USD")
+    print(f"  Total: ${capital_boveda:.2f} USD")
     
     # Seleccionar cripto para operar
     print("\n¿Con cual cripto deseas operar hoy?")
@@ -544,6 +541,9 @@ def modulo_operador():
     print(f"Costo promedio actual: ${costo_promedio:.4f}")
     print(f"Precio sugerido: ${precio_sugerido:.4f}")
     
+    # La comisión no cambia mientras se prueban precios
+    calculadora = CalculadoraVenta(comision)
+    
     while True:
         try:
             precio_str = input("\n¿Que precio vas a publicar en tu anuncio?: ")
@@ -554,9 +554,7 @@ def modulo_operador():
                 continue
             
             # Calcular ganancia neta estimada
-            ganancia_neta_estimada = calc.calcular_ganancia_neta_estimada(
-                costo_promedio, precio_publicado, comision
-            )
+            ganancia_neta_estimada = calculadora.ganancia_neta_pct(costo_promedio, precio_publicado)
             
             print(f"\nGanancia neta estimada: {ganancia_neta_estimada:.2f}%")
             
@@ -573,7 +571,7 @@ def modulo_operador():
             print("❌ Precio inválido")
     
     # Actualizar día con precio y cripto
-    db.execute_update("""
+    db.execute_modify("""
         UPDATE dias
         SET cripto_operada_id = ?,
             precio_publicado = ?
@@ -790,8 +788,8 @@ def ver_dia_abierto():
     print(f"\nVentas registradas: {num_ventas}")
     
     if ventas:
-        efectivo_acumulado = sum(v['efectivo_recibido'] for v in ventas)
-        ganancia_acumulada = sum(v['ganancia_neta'] for v in ventas)
+        efectivo_acumulado = sum(v.efectivo_recibido for v in ventas)
+        ganancia_acumulada = sum(v.ganancia_neta for v in ventas)
         
         print(f"Efectivo recibido: ${efectivo_acumulado:.2f}")
         print(f"Ganancia acumulada: ${ganancia_acumulada:.2f}")
@@ -860,7 +858,7 @@ def ver_historial_dias():
             print(f"   Capital final: ${dia['capital_final']:.2f}")
             print(f"   Ganancia neta: ${dia['ganancia_neta']:.2f}")
             
-            num_ventas = queries.contar_ventas_dia(dia['id'])
+            num_ventas = dia['ventas_count']
             print(f"   Ventas: {num_ventas}")
     
     input("\nPresiona Enter...")
@@ -887,22 +885,17 @@ def ver_ventas_dia():
         total_ganancia = 0
         
         for i, venta in enumerate(ventas, 1):
-            cripto = db.execute_query(
-                "SELECT simbolo FROM criptomonedas WHERE id = ?",
-                (venta['cripto_id'],),
-                fetch_one=True
-            )
-            
+            # El símbolo ya viene en la fila (JOIN de obtener_ventas_dia)
             print(f"\nVenta #{i}")
-            print(f"  Cantidad: {venta['cantidad']:.8f} {cripto['simbolo']}")
-            print(f"  Precio: ${venta['precio_unitario']:.4f}")
-            print(f"  Total: ${venta['monto_venta']:.2f}")
-            print(f"  Comisión: ${venta['comision']:.2f}")
-            print(f"  Efectivo recibido: ${venta['efectivo_recibido']:.2f}")
-            print(f"  Ganancia neta: ${venta['ganancia_neta']:.2f}")
+            print(f"  Cantidad: {venta.cantidad:.8f} {venta.simbolo}")
+            print(f"  Precio: ${venta.precio_unitario:.4f}")
+            print(f"  Total: ${venta.monto_venta:.2f}")
+            print(f"  Comisión: ${venta.comision:.2f}")
+            print(f"  Efectivo recibido: ${venta.efectivo_recibido:.2f}")
+            print(f"  Ganancia neta: ${venta.ganancia_neta:.2f}")
             
-            total_efectivo += venta['efectivo_recibido']
-            total_ganancia += venta['ganancia_neta']
+            total_efectivo += venta.efectivo_recibido
+            total_ganancia += venta.ganancia_neta
         
         print("\n" + "-"*60)
         print(f"TOTALES:")
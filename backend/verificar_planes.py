@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+VERIFICACIÓN DE PLANES DE CONSULTA
+=============================================================================
+Comprueba con EXPLAIN QUERY PLAN que las sentencias SQL de la API y de
+core.queries usan índices y no recorren tablas completas (SCAN). Un cambio de
+esquema o de consulta que pierda un índice se detecta aquí antes de notarse
+en la latencia. La API lo ejecuta también al arrancar.
+"""
+
+import re
+import sys
+from typing import Dict, List, Set
+
+from core.db_manager import db
+from api.routes import boveda, ciclos, configuracion, dashboard, operaciones
+from core import queries
+
+
+# ===================================================================
+# CONFIGURACIÓN
+# ===================================================================
+
+# Módulos cuyas constantes _SQL_* se verifican (rutas de la API y Queries, compartido con el CLI)
+MODULOS = [boveda, ciclos, configuracion, dashboard, operaciones, queries]
+
+# Recorridos completos aceptados a propósito: consulta -> tablas
+# ciclos es pequeña (un ciclo por mes) y numerar los ciclos con ROW_NUMBER() requiere leerlos todos
+ESCANEOS_PERMITIDOS: Dict[str, Set[str]] = {
+    "ciclos._SQL_CICLO_ACTIVO": {"ciclos"},
+    "ciclos._SQL_HISTORIAL": {"ciclos"},
+    "ciclos._SQL_CICLO_POR_ID": {"ciclos"},
+    # Listado completo del CLI: ciclos y el catálogo de criptomonedas son tablas pequeñas
+    "queries._SQL_LISTAR_CICLOS": {"ciclos"},
+    "queries._SQL_CRIPTOMONEDAS": {"criptomonedas"},
+    # Totales históricos de todo el sistema: por definición suman todas las filas
+    "queries._SQL_ESTADISTICAS_GENERALES": {"ventas", "compras"},
+}
+
+# Búsquedas del registro "más reciente" (ORDER BY ... DESC LIMIT 1): el índice debe dar
+# ya el orden. Un "USE TEMP B-TREE FOR ORDER BY" indica que se perdió y que SQLite ordena
+CONSULTAS_SIN_ORDENAR: Set[str] = {
+    "queries._SQL_CICLO_ACTIVO",
+    "queries._SQL_DIA_ABIERTO",
+    "queries._SQL_ULTIMO_DIA_CERRADO",
+    "ciclos._SQL_CICLO_ACTIVO_DATOS",
+}
+
+# FROM/JOIN tabla [AS] alias: permite saber qué tabla hay detrás de "SCAN c"
+_PATRON_TABLAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+
+_PALABRAS_RESERVADAS = {"where", "join", "left", "inner", "on", "group", "order", "limit", "set", "returning"}
+
+
+# ===================================================================
+# FUNCIONES DE VERIFICACIÓN
+# ===================================================================
+
+def _tablas_del_esquema() -> Set[str]:
+    """Nombres de las tablas reales de la base de datos"""
+    with db.get_cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        return {row['name'] for row in cursor.fetchall()}
+
+
+def _tablas_por_alias(sql: str, tablas: Set[str]) -> Dict[str, str]:
+    """Relaciona cada nombre que puede aparecer en el plan con su tabla real"""
+    alias = {}
+    for tabla, nombre in _PATRON_TABLAS.findall(sql):
+        if tabla not in tablas:
+            continue  # CTE o subconsulta, no una tabla
+        alias[tabla] = tabla
+        if nombre and nombre.lower() not in _PALABRAS_RESERVADAS:
+            alias[nombre] = tabla
+    return alias
+
+
+def _plan(sql: str) -> List[str]:
+    """Plan de la sentencia con todos sus parámetros en NULL"""
+    # Los valores de los parámetros no cambian el plan: basta con NULL
+    if re.search(r":\w+", sql):
+        params = {nombre: None for nombre in re.findall(r":(\w+)", sql)}
+    else:
+        params = (None,) * sql.count("?")
+
+    return db.plan_de_consulta(sql, params)
+
+
+def escaneos_completos(sql: str, tablas: Set[str]) -> List[str]:
+    """
+    Tablas que la consulta recorre completas según su plan
+
+    Args:
+        sql: Sentencia a analizar
+        tablas: Tablas reales del esquema
+
+    Returns:
+        Lista de tablas recorridas con SCAN (vacía si todo usa índices)
+    """
+    alias = _tablas_por_alias(sql, tablas)
+    escaneos = []
+
+    for detalle in _plan(sql):
+        coincidencia = re.match(r"SCAN (\w+)", detalle)
+        # "SCAN x USING [COVERING] INDEX" recorre un índice, no la tabla
+        if coincidencia and "USING" not in detalle and coincidencia.group(1) in alias:
+            escaneos.append(alias[coincidencia.group(1)])
+
+    return escaneos
+
+
+def verificar_planes() -> List[str]:
+    """
+    Revisa el plan de todas las sentencias SQL de la API y de Queries
+
+    Returns:
+        Lista de problemas encontrados (vacía si todas usan índices)
+    """
+    tablas = _tablas_del_esquema()
+    problemas = []
+
+    for modulo in MODULOS:
+        nombre_modulo = modulo.__name__.rsplit(".", 1)[-1]
+        for nombre, sql in vars(modulo).items():
+            if not nombre.startswith("_SQL_") or not isinstance(sql, str):
+                continue
+
+            consulta = f"{nombre_modulo}.{nombre}"
+            permitidos = ESCANEOS_PERMITIDOS.get(consulta, set())
+
+            for tabla in escaneos_completos(sql, tablas):
+                if tabla not in permitidos:
+                    problemas.append(f"{consulta}: SCAN {tabla}")
+
+            if consulta in CONSULTAS_SIN_ORDENAR and any(
+                    "TEMP B-TREE FOR ORDER BY" in detalle for detalle in _plan(sql)):
+                problemas.append(f"{consulta}: ORDER BY sin índice")
+
+    return problemas
+
+
+# ===================================================================
+# EJECUCIÓN DIRECTA
+# ===================================================================
+
+if __name__ == "__main__":
+    print("="*60)
+    print("TEST DE PLANES DE CONSULTA")
+    print("="*60)
+
+    problemas = verificar_planes()
+
+    if problemas:
+        for problema in problemas:
+            print(f"   ❌ {problema}")
+        print(f"\n{len(problemas)} consulta(s) sin el índice esperado")
+        sys.exit(1)
+
+    print("   ✅ Todas las consultas usan índices")
+    print("\n" + "="*60)
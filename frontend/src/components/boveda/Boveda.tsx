@@ -23,7 +23,8 @@ export default function Boveda() {
   // Formularios
   const [simbolo, setSimbolo] = useState('USDT');
   const [cantidad, setCantidad] = useState('');
-  const [precioUsd, setPrecioUsd] = useState('1.0');
+  const [montoUsd, setMontoUsd] = useState('');
+  const [precioUnitario, setPrecioUnitario] = useState('1.0');
   const [razon, setRazon] = useState('');
 
   const fetchData = async () => {
@@ -53,11 +54,11 @@ export default function Boveda() {
   const handleAgregar = async (e: React.FormEvent) => {
     e.preventDefault();
     
-    const cant = parseFloat(cantidad);
-    const precio = parseFloat(precioUsd);
+    const monto = parseFloat(montoUsd);
+    const precio = parseFloat(precioUnitario);
     
-    if (isNaN(cant) || cant <= 0) {
-      mostrarMensaje('error', 'Cantidad inválida');
+    if (isNaN(monto) || monto <= 0) {
+      mostrarMensaje('error', 'Monto inválido');
       return;
     }
     
@@ -69,14 +70,14 @@ export default function Boveda() {
     try {
       const response = await agregarCapital({ 
         simbolo: simbolo.toUpperCase(), 
-        cantidad: cant, 
-        precio_usd: precio 
+        monto_usd: monto, 
+        precio_unitario: precio 
       });
       
       mostrarMensaje('success', response.data.message || 'Capital agregado exitosamente');
       setSimbolo('USDT');
-      setCantidad('');
-      setPrecioUsd('1.0');
+      setMontoUsd('');
+      setPrecioUnitario('1.0');
       setVista('resumen');
       fetchData();
     } catch (error: any) {
@@ -242,31 +243,31 @@ export default function Boveda() {
             </div>
 
             <div>
-              <label className="block text-sm font-medium mb-2">Cantidad de Cripto</label>
+              <label className="block text-sm font-medium mb-2">Monto en USD</label>
               <input
                 type="number"
-                step="0.00000001"
-                value={cantidad}
-                onChange={(e) => setCantidad(e.target.value)}
+                step="0.01"
+                value={montoUsd}
+                onChange={(e) => setMontoUsd(e.target.value)}
                 className="w-full px-4 py-2 border rounded"
-                placeholder="1000"
+                placeholder="100.00"
                 required
               />
-              <p className="text-xs text-gray-500 mt-1">Cuánto cripto compraste</p>
+              <p className="text-xs text-gray-500 mt-1">Cuánto dinero invertiste</p>
             </div>
 
             <div>
-              <label className="block text-sm font-medium mb-2">Precio Promedio (USD por cripto)</label>
+              <label className="block text-sm font-medium mb-2">Precio por unidad (USD)</label>
               <input
                 type="number"
                 step="0.00000001"
-                value={precioUsd}
-                onChange={(e) => setPrecioUsd(e.target.value)}
+                value={precioUnitario}
+                onChange={(e) => setPrecioUnitario(e.target.value)}
                 className="w-full px-4 py-2 border rounded"
-                placeholder="1.0"
+                placeholder="1.050 o 120000"
                 required
               />
-              <p className="text-xs text-gray-500 mt-1">A qué precio lo compraste (Ej: 1.050)</p>
+              <p className="text-xs text-gray-500 mt-1">Precio del cripto al momento de compra</p>
             </div>
 
             <button
@@ -163,8 +163,8 @@ export default function Operaciones() {
       
       mostrarMensaje('success', 
         `✅ Venta registrada\n\n` +
-        `Monto neto: $${response.data.monto_neto}\n` +
-        `Ganancia: $${response.data.ganancia}`
+        `Monto neto: $${response.data.monto_neto.toFixed(2)}\n` +
+        `Ganancia: $${response.data.ganancia.toFixed(2)}`
       );
       
       setPrecioVenta('');
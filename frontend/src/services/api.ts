@@ -16,6 +16,7 @@ export const getDashboardMetricas = () => api.get('/dashboard/metricas');
 // ===== BÓVEDA =====
 export const getBovedaResumen = () => api.get('/boveda/resumen');
 export const getBovedaInventario = () => api.get('/boveda/inventario');
+export const getBovedaCripto = (simbolo: string) => api.get(`/boveda/cripto/${simbolo}`);
 export const agregarCapital = (data: { 
   simbolo: string; 
   monto_usd: number; 
@@ -35,6 +36,8 @@ export const iniciarDia = (data: {
 
 export const registrarVenta = (data: { cantidad: number; precio_venta: number }) =>
   api.post('/operaciones/registrar-venta', data);
+export const registrarVentasBatch = (ventas: { cantidad: number; precio_venta: number }[]) =>
+  api.post('/operaciones/registrar-ventas-batch', ventas);
 
 export const getDiaActual = () => api.get('/operaciones/dia-actual');
 export const cerrarDia = () => api.post('/operaciones/cerrar-dia');